@@ -0,0 +1,62 @@
+import os
+import time
+from datetime import timedelta
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from ml4trade.data_strategies import PricesPlDataStrategy, ImgwSolarDataStrategy, \
+    HouseholdEnergyConsumptionDataStrategy
+from ml4trade.domain.constants import START_TIME, SCHEDULING_TIME, ACTION_REPLACEMENT_TIME
+from ml4trade.domain.units import Currency, MWh, MW
+from ml4trade.simulation_env import SimulationEnv
+
+_mock_data_dir = os.path.join(os.path.dirname(__file__), '..', 'test', 'mock_data')
+
+
+def make_env(days: int = 14, data_repeats: int = 1, **kwargs) -> SimulationEnv:
+    # the same setup as the tests, on the bundled mock data;
+    # the data is repeated `data_repeats` times for episodes longer than its ~20 days
+    weather_df = pd.read_csv(os.path.join(_mock_data_dir, 's_t_02-03_2022.csv'), header=None, encoding='cp1250')
+    prices_df = pd.read_csv(os.path.join(_mock_data_dir, 'prices_pl.csv'), header=0)
+    weather_df = pd.concat([weather_df] * data_repeats, ignore_index=True)
+    prices_df = pd.concat([prices_df] * data_repeats, ignore_index=True)
+    data_strategies = {
+        'production': ImgwSolarDataStrategy(weather_df, window_size=24, max_solar_power=MW(0.001),
+                                            solar_efficiency=0.2),
+        'market': PricesPlDataStrategy(prices_df),
+        'consumption': HouseholdEnergyConsumptionDataStrategy(),
+    }
+    return SimulationEnv(
+        data_strategies,
+        start_datetime=START_TIME,
+        end_datetime=START_TIME + timedelta(days=days),
+        scheduling_time=SCHEDULING_TIME,
+        action_replacement_time=ACTION_REPLACEMENT_TIME,
+        prosumer_init_balance=Currency(0),
+        battery_capacity=MWh(0.1),
+        battery_init_charge=MWh(0.05),
+        battery_efficiency=0.9,
+        **kwargs,
+    )
+
+
+def random_actions(rng: np.random.Generator, n: int = None) -> np.ndarray:
+    # small buy and large sell amounts with random thresholds so that both transactions happen;
+    # one action or `n` of them for a vectorized env; the tests step their environments with them too
+    actions = rng.uniform(0, 1, 96 if n is None else (n, 96)).astype(np.float32)
+    actions[..., :48] *= 0.001
+    actions[..., 48:] *= 500
+    return actions
+
+
+def calls_per_sec(fn: Callable[[], object], calls: int = 1000, repeats: int = 3) -> float:
+    # best of `repeats` runs of `calls` calls
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return calls / best
@@ -0,0 +1,39 @@
+"""Steps per second of SimulationEnv for each history level and engine, resets included.
+
+    python -m benchmarks.history_levels
+"""
+import time
+
+import numpy as np
+
+from benchmarks.common import make_env, random_actions
+
+
+def run(history_level: str, engine: str = 'tick', days: int = 14, episodes: int = 20, repeats: int = 3) -> dict:
+    env = make_env(days=days, engine=engine, history_level=history_level)
+    rng = np.random.default_rng(0)
+    actions = [random_actions(rng) for _ in range(days)]
+
+    best = float('inf')
+    steps = 0
+    for _ in range(repeats):
+        steps = 0
+        start = time.perf_counter()
+        for episode in range(episodes):
+            env.reset(seed=episode)
+            truncated = False
+            while not truncated:
+                truncated = env.step(actions[steps % days])[3]
+                steps += 1
+        best = min(best, time.perf_counter() - start)
+    return {
+        'history_level': history_level,
+        'engine': engine,
+        'steps_per_sec': steps / best,
+    }
+
+
+if __name__ == '__main__':
+    for engine in ('tick', 'day'):
+        for level in ('full', 'daily', 'off'):
+            print(run(level, engine))
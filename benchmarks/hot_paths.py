@@ -0,0 +1,39 @@
+"""Calls per second of the parts of a SimulationEnv step, once the first actions are set.
+
+    python -m benchmarks.hot_paths
+"""
+import numpy as np
+
+from benchmarks.common import make_env, random_actions, calls_per_sec
+
+
+def run(engine: str = 'tick', calls: int = 2000, repeats: int = 3) -> dict:
+    env = make_env(engine=engine)
+    env.reset(seed=0)
+    rng = np.random.default_rng(0)
+    for _ in range(3):
+        env.step(random_actions(rng))
+
+    tick = env._clock.cur_tick
+    hours_to_scheduling = 24 - env._clock.scheduling_time.hour
+    market, production, consumption = env._market, env._production_system, env._consumption_system
+    paths = {
+        'dry_simulation': lambda: env._dry_simulation(hours_to_scheduling),
+        'observation': env._observation,
+        # rewrites the current row, which isn't accumulated again
+        'history_tick_update': lambda: env.history.tick_update(env._prosumer, market, production, consumption),
+        'market_process': lambda: market.ds.process(tick, market.stream),
+        'production_process': lambda: production.ds.process(tick, production.stream),
+        'consumption_process': lambda: consumption.ds.process(tick, consumption.stream),
+        'market_observation': lambda: market.ds.observation(tick),
+        'production_observation': lambda: production.ds.observation(tick),
+    }
+    return {
+        'engine': engine,
+        **{f'{name}_per_sec': calls_per_sec(fn, calls, repeats) for name, fn in paths.items()},
+    }
+
+
+if __name__ == '__main__':
+    for engine in ('tick', 'day'):
+        print(run(engine))
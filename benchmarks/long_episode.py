@@ -0,0 +1,82 @@
+"""Peak memory of a year long episode and the time to save, load and render its history.
+
+The mock data is repeated to cover the year, see make_env.
+
+    python -m benchmarks.long_episode
+"""
+import os
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+
+from benchmarks.common import make_env, random_actions
+from ml4trade.history import History
+from ml4trade.rendering.charts import render_all, render_profits_comparison
+
+
+def _run_episode(env):
+    rng = np.random.default_rng(0)
+    env.reset(seed=0)
+    truncated = False
+    while not truncated:
+        truncated = env.step(random_actions(rng))[3]
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run(history_level: str = 'full', engine: str = 'day', days: int = 365) -> dict:
+    # roughly 20 days of mock data
+    data_repeats = days // 20 + 2
+    tracemalloc.start()
+    env = make_env(days=days, data_repeats=data_repeats, engine=engine, history_level=history_level)
+    _run_episode(env)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    result = {
+        'history_level': history_level,
+        'engine': engine,
+        'peak_mb_per_env_year': peak / 2 ** 20 * 365 / days,
+        'episode_sec': _timed(lambda: _run_episode(env)),
+    }
+    if history_level != 'full':
+        return result
+
+    history = env.history
+    with tempfile.TemporaryDirectory() as tmp:
+        binary_path = os.path.join(tmp, 'env_history')
+        json_path = os.path.join(tmp, 'env_history.json')
+        png_path = os.path.join(tmp, 'render.png')
+        result['save_binary_sec'] = _timed(lambda: history.save_binary(binary_path))
+        # loading maps the files, the columns are read by to_dataframe
+        result['load_binary_sec'] = _timed(lambda: History.load(binary_path).to_dataframe().sum())
+        result['save_json_sec'] = _timed(lambda: history.save(json_path))
+        result['load_json_sec'] = _timed(lambda: History.load(json_path))
+
+        backend = matplotlib.get_backend()
+        matplotlib.use('Agg')
+        try:
+            with warnings.catch_warnings():
+                # plt.show() of a non-interactive backend
+                warnings.simplefilter('ignore', UserWarning)
+                result['render_all_sec'] = _timed(lambda: render_all(history.to_dataframe(), save_path=png_path))
+                result['render_profits_comparison_sec'] = _timed(lambda: render_profits_comparison(
+                    [history.to_dataframe() for _ in range(3)], save_path=png_path,
+                ))
+        finally:
+            plt.close('all')
+            matplotlib.use(backend)
+    return result
+
+
+if __name__ == '__main__':
+    for level in ('full', 'daily', 'off'):
+        print(run(level))
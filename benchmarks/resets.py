@@ -0,0 +1,39 @@
+"""Resets per second of IntervalWrapper over SimulationEnv for 1, 7 and 30 day intervals.
+
+    python -m benchmarks.resets
+"""
+import time
+from datetime import timedelta
+
+from benchmarks.common import make_env
+from ml4trade.misc import IntervalWrapper
+
+
+def run(interval_days: int, engine: str = 'tick', warm_reset: bool = False,
+        resets: int = 500, repeats: int = 5) -> dict:
+    # 60 days of data leave 48 days for training intervals
+    env = IntervalWrapper(
+        make_env(days=60, data_repeats=3, engine=engine, warm_reset=warm_reset),
+        timedelta(days=interval_days),
+    )
+    env.reset(seed=0)
+
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(resets):
+            env.reset()
+        best = min(best, time.perf_counter() - start)
+    return {
+        'interval_days': interval_days,
+        'engine': engine,
+        'warm_reset': warm_reset,
+        'resets_per_sec': resets / best,
+    }
+
+
+if __name__ == '__main__':
+    for engine in ('tick', 'day'):
+        for interval_days in (1, 7, 30):
+            for warm_reset in (False, True):
+                print(run(interval_days, engine, warm_reset))
@@ -0,0 +1,99 @@
+"""Runs every benchmark and writes the results as JSON, e.g. to compare two commits.
+
+    python -m benchmarks.suite --out before.json
+    python -m benchmarks.suite --out after.json
+    python -m benchmarks.suite --compare before.json after.json
+
+Each benchmark maps to a list of result dicts; string and bool values name the configuration
+and numeric values are the measurements, `--compare` prints their ratios (after / before).
+"""
+import argparse
+import datetime
+import json
+import platform
+import subprocess
+from typing import Dict, List
+
+import numpy as np
+
+from benchmarks import history_levels, hot_paths, long_episode, resets, units
+
+
+def _benchmarks() -> Dict[str, list]:
+    return {
+        'steps': [
+            lambda engine=engine, level=level: history_levels.run(level, engine)
+            for engine in ('tick', 'day') for level in ('full', 'daily', 'off')
+        ],
+        'resets': [
+            lambda engine=engine, days=days, warm=warm: resets.run(days, engine, warm)
+            for engine in ('tick', 'day') for days in (1, 7, 30) for warm in (False, True)
+        ],
+        'hot_paths': [lambda: hot_paths.run('tick')],
+        'long_episode': [lambda level=level: long_episode.run(level) for level in ('full', 'daily', 'off')],
+        'units': [lambda debug=debug: units.run(debug=debug) for debug in (False, True)],
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def run(only: List[str] = ()) -> dict:
+    results = {}
+    for name, benchmarks in _benchmarks().items():
+        if only and name not in only:
+            continue
+        results[name] = [benchmark() for benchmark in benchmarks]
+        for result in results[name]:
+            print(name, result)
+    return {
+        'commit': _git_commit(),
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'results': results,
+    }
+
+
+def _is_measurement(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _config(result: dict) -> tuple:
+    return tuple((k, v) for k, v in result.items() if not _is_measurement(v))
+
+
+def compare(before: dict, after: dict) -> List[str]:
+    lines = [f'{before["commit"] or "before"} -> {after["commit"] or "after"}']
+    for name, after_results in after['results'].items():
+        before_results = {_config(r): r for r in before['results'].get(name, [])}
+        for result in after_results:
+            config = _config(result)
+            old = before_results.get(config)
+            if old is None:
+                continue
+            label = ' '.join(f'{k}={v}' for k, v in config)
+            for k, v in result.items():
+                if _is_measurement(v) and _is_measurement(old.get(k)) and old[k]:
+                    lines.append(f'{name} {label} {k}: {old[k]:.4g} -> {v:.4g} ({v / old[k]:.2f}x)')
+    return lines
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--out', default='benchmarks.json', help='where to write the results')
+    parser.add_argument('--only', nargs='*', default=[], help=f'benchmarks to run of {list(_benchmarks())}')
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'), help='compares two result files')
+    args = parser.parse_args()
+    if args.compare:
+        with open(args.compare[0]) as f1, open(args.compare[1]) as f2:
+            print('\n'.join(compare(json.load(f1), json.load(f2))))
+    else:
+        with open(args.out, 'w') as f:
+            json.dump(run(args.only), f, indent=2)
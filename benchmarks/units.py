@@ -0,0 +1,51 @@
+"""Unit objects allocated per simulated day by the tick engine, with unit checks off and on.
+
+    python -m benchmarks.units
+"""
+import sys
+import time
+
+import numpy as np
+
+from ml4trade.domain import units
+from benchmarks.common import make_env, random_actions
+
+
+def run(days: int = 12, debug: bool = False) -> dict:
+    units.set_debug_units(debug)
+    env = make_env(days=days)
+    env.reset(seed=0)
+    rng = np.random.default_rng(0)
+    actions = [random_actions(rng) for _ in range(days)]
+
+    start = time.perf_counter()
+    for action in actions[:days // 2]:
+        env.step(action)
+    elapsed = time.perf_counter() - start
+
+    created = 0
+    init = units._Unit.__init__
+
+    def counting_init(self, value):
+        nonlocal created
+        created += 1
+        init(self, value)
+
+    units._Unit.__init__ = counting_init
+    try:
+        for action in actions[days // 2:]:
+            env.step(action)
+    finally:
+        units._Unit.__init__ = init
+        units.set_debug_units(False)
+    return {
+        'mode': 'debug' if debug else 'fast',
+        'unit_objects_per_day': created / (days - days // 2),
+        'bytes_per_unit_object': sys.getsizeof(units.MWh(0.0)),
+        'ms_per_day': elapsed / (days // 2) * 1000,
+    }
+
+
+if __name__ == '__main__':
+    for debug in (False, True):
+        print(run(debug=debug))
@@ -14,12 +14,4 @@ do
     wget -rkN -np -nd -R "index.html*" -P ".data/weather/$year" "$weather_link/$year/"
 done
 
-unzip_output_dir=".data/weather_unzipped_flattened"
-mkdir -p "$unzip_output_dir"
-
-# unzip downloaded weather data
-find . -name "*.zip" |
-while read filename
-do
-  unzip -n -d "$unzip_output_dir" "$filename"
-done
+# the zip archives are read directly by ml4trade.datasets.read_weather
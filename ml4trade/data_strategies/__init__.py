@@ -1,4 +1,4 @@
-from ml4trade.data_strategies.base import DataStrategy, update_last_processed
+from ml4trade.data_strategies.base import DataStrategy
 from ml4trade.data_strategies.market import PricesPlDataStrategy
 from ml4trade.data_strategies.production import ImgwDataStrategy, ImgwWindDataStrategy, ImgwSolarDataStrategy, imgw_col_ids
 from ml4trade.data_strategies.consumption import HouseholdEnergyConsumptionDataStrategy
@@ -1,55 +1,139 @@
-from typing import List, Callable, TypeVar
+import warnings
+from typing import List, Optional, Union, Tuple, Dict
 from typing_extensions import Literal
-from functools import wraps
 
+import numpy as np
 import pandas as pd
 from gymnasium.utils import seeding
+from numpy.lib.stride_tricks import sliding_window_view
+from numpy.typing import DTypeLike
 
 from ml4trade.domain.constants import SCHEDULING_TIME
+from ml4trade.domain.randomness import RandomStream
+from ml4trade.shared_array import SharedArray, pickled_array, unpickled_array
 
-C = TypeVar('C', bound=Callable)
 
-
-# decorator for saving result returned by fn()
-def update_last_processed(fn: C) -> C:
-    @wraps(fn)
-    def inner(*args, **kwargs):
-        res = fn(*args, **kwargs)
-        self = args[0]
-        self.last_processed = res
-        return res
-    return inner
+def _warn_deprecated(what: str):
+    warnings.warn(f'{what} is deprecated, pass a stream made by random_stream() to process() instead',
+                  DeprecationWarning, stacklevel=3)
 
 
 class DataStrategy:
+    # the column returned by get_column() is kept as a contiguous array of `dtype`,
+    # the dataframe is not kept; observations are read-only views of `_windows`;
+    # `_derived_attrs` are computed from the column and are not pickled
+    # unless share() moved them to `_shared_derived` too
+    _derived_attrs: Tuple[str, ...] = ()
+
     def __init__(self, df: pd.DataFrame = None, window_size: int = 1,
                  window_direction: Literal['forward', 'backward'] = 'forward',
-                 scheduling_hour: int = SCHEDULING_TIME.hour):
-        self.df = df
-        self.col = self.get_column(df)
+                 scheduling_hour: int = SCHEDULING_TIME.hour, dtype: DTypeLike = np.float64):
+        self.dtype = np.dtype(dtype)
+        self.data_length = None if df is None else len(df)
         self.window_size = window_size
         self.window_direction = window_direction
         self.scheduling_hour = scheduling_hour
-        self.last_processed = None
         self._rng = None
+        self._stream = None
+        self._shared = None
+        self._shared_derived: Dict[str, SharedArray] = {}
+        col = self.get_column(df)
+        # copied, a view would keep the dataframe's whole block alive
+        self._set_col(None if col is None else np.array(col, dtype=self.dtype))
+
+    def _set_col(self, col: Optional[np.ndarray]):
+        self.col = col
+        self._windows = None if col is None else sliding_window_view(col, self.window_size)
+
+    def share(self):
+        # moves the column to a memory-mapped file, pickled copies of the strategy
+        # (e.g. sent to SubprocVecEnv workers) map it instead of copying the column;
+        # strategies with derived arrays move those with share_array() as well
+        if self.col is not None and self._shared is None:
+            self._shared = SharedArray.create(self.col)
+            self._set_col(self._shared.array)
+
+    def close(self):
+        # removes the files created by share(), copies already unpickled keep working
+        if self._shared is not None:
+            self._shared.close()
+            self._shared = None
+        for shared in self._shared_derived.values():
+            shared.close()
+        self._shared_derived = {}
 
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        for attr in self._derived_attrs:
+            value = pickled_array(self._shared_derived, attr, state[attr])
+            state[attr] = value if isinstance(value, SharedArray) else None
+        # a view, pickled it would be window_size times larger than the column
+        state['_windows'] = None
+        if self._shared is not None:
+            state['col'] = None
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        for attr in self._derived_attrs:
+            setattr(self, attr, unpickled_array(state[attr]))
+        self._set_col(self._shared.array if self._shared is not None else self.col)
+
+    # deprecated: `rng`, `stream` and set_seed() are the generator and stream of the strategy itself,
+    # which process() falls back to without a stream and which all users of the strategy advance;
+    # pass a stream of your own made by random_stream() instead
     @property
     def rng(self):
+        _warn_deprecated('DataStrategy.rng')
+        return self._own_rng()
+
+    @property
+    def stream(self) -> Optional[RandomStream]:
+        _warn_deprecated('DataStrategy.stream')
+        if self._stream is None:
+            self._stream = self.random_stream(self._own_rng())
+        return self._stream
+
+    def set_seed(self, seed: int):
+        _warn_deprecated('DataStrategy.set_seed()')
+        self._rng, seed = seeding.np_random(seed)
+        self._stream = None
+
+    def _own_rng(self) -> np.random.Generator:
         if self._rng is None:
             self._rng, seed = seeding.np_random()
         return self._rng
 
-    def set_seed(self, seed: int):
-        self._rng, seed = seeding.np_random(seed)
+    def random_stream(self, rng: np.random.Generator) -> Optional[RandomStream]:
+        # stream of the random values used by process() and process_batch() drawn from `rng`,
+        # None if the strategy doesn't draw any
+        return None
 
-    def get_column(self, df: pd.DataFrame) -> List[float]:
+    def get_column(self, df: pd.DataFrame) -> Optional[np.ndarray]:
         pass
 
-    def process(self, idx: int) -> float:
+    def process(self, idx: int, stream: Optional[RandomStream] = None) -> float:
+        # random strategies read from `stream`, environments pass streams of their own
+        # so that a strategy can be shared by many of them; without one the deprecated
+        # stream of the strategy is used
         raise NotImplementedError
 
-    def observation(self, idx: int) -> List[float]:
+    def process_batch(self, idx: np.ndarray, stream: Optional[RandomStream] = None) -> np.ndarray:
+        # same values as calling process() for each element of idx in order
+        if stream is None:
+            return np.array([self.process(i) for i in idx], dtype=np.float64)
+        return np.array([self.process(i, stream) for i in idx], dtype=np.float64)
+
+    def observation(self, idx: int) -> Union[List[float], np.ndarray]:
+        raise NotImplementedError
+
+    def window_start(self, idx: int) -> int:
+        # index of the first value of the column observed at `idx`, for strategies observing windows of it
         raise NotImplementedError
 
+    def observation_into(self, out: np.ndarray, idx: int):
+        # writes observation(idx) into `out`, an array of observation_size() elements
+        out[:] = self.observation(idx)
+
     def observation_size(self) -> int:
         return self.window_size
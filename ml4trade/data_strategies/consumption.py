@@ -1,6 +1,13 @@
-from typing import List
+from typing import List, Optional
 
-from ml4trade.data_strategies import DataStrategy, update_last_processed
+import numpy as np
+
+from ml4trade.data_strategies import DataStrategy
+from ml4trade.domain.randomness import RandomStream
+
+
+def _draw_noise(rng: np.random.Generator, n: int) -> np.ndarray:
+    return rng.normal(0, 0.03, size=n)
 
 
 class HouseholdEnergyConsumptionDataStrategy(DataStrategy):
@@ -21,13 +28,26 @@ class HouseholdEnergyConsumptionDataStrategy(DataStrategy):
 
         extra_data = window_size // len(self.energy_consumption_MWh)
         self.energy_consumption_MWh += self.energy_consumption_MWh * extra_data
+        self._energy_consumption = np.array(self.energy_consumption_MWh)
 
-    @update_last_processed
-    def process(self, idx: int) -> float:
+    def process(self, idx: int, stream: Optional[RandomStream] = None) -> float:
         consumed_energy = self.energy_consumption_MWh[idx % 24]
-        return consumed_energy * abs(1 + self.rng.normal(0, 0.03))
+        stream = stream if stream is not None else self.stream
+        return consumed_energy * abs(1 + stream.next())
+
+    def process_batch(self, idx: np.ndarray, stream: Optional[RandomStream] = None) -> np.ndarray:
+        consumed_energy = self._energy_consumption[np.asarray(idx) % 24]
+        stream = stream if stream is not None else self.stream
+        return consumed_energy * np.abs(1 + stream.take(len(consumed_energy)))
+
+    def random_stream(self, rng: np.random.Generator) -> RandomStream:
+        return RandomStream(rng, _draw_noise)
 
     def observation(self, idx: int) -> List[float]:
         start_idx = idx % 24 - self.scheduling_hour
         end_idx = start_idx + self.window_size
         return self.energy_consumption_MWh[start_idx:end_idx]
+
+    def observation_into(self, out: np.ndarray, idx: int):
+        start_idx = idx % 24 - self.scheduling_hour
+        out[:] = self._energy_consumption[start_idx:start_idx + self.window_size]
@@ -1,25 +1,35 @@
-from typing import List
+from typing import Optional
 
+import numpy as np
 import pandas as pd
+from numpy.typing import DTypeLike
 
-from ml4trade.data_strategies import DataStrategy, update_last_processed
+from ml4trade.data_strategies import DataStrategy
+from ml4trade.domain.randomness import RandomStream
 
 
 class PricesPlDataStrategy(DataStrategy):
     col_name = 'Fixing I Price [PLN/MWh]'
     col_idx = 1
 
-    def __init__(self, df: pd.DataFrame, window_size: int = 24, scheduling_hour: int = 10):
-        super().__init__(df, window_size, 'backward', scheduling_hour)
+    def __init__(self, df: pd.DataFrame, window_size: int = 24, scheduling_hour: int = 10,
+                 dtype: DTypeLike = np.float64):
+        super().__init__(df, window_size, 'backward', scheduling_hour, dtype)
 
-    def get_column(self, df: pd.DataFrame) -> List[float]:
-        return df.iloc[:, self.col_idx].tolist()
+    def get_column(self, df: pd.DataFrame) -> np.ndarray:
+        return df.iloc[:, self.col_idx].to_numpy()
 
-    @update_last_processed
-    def process(self, idx: int) -> float:
-        return self.col[idx]
+    def process(self, idx: int, stream: Optional[RandomStream] = None) -> float:
+        return self.col[idx].item()
 
-    def observation(self, idx: int) -> List[float]:
-        start_idx = idx - self.scheduling_hour
-        end_idx = start_idx + self.window_size
-        return self.col[start_idx:end_idx]
+    def process_batch(self, idx: np.ndarray, stream: Optional[RandomStream] = None) -> np.ndarray:
+        return self.col[idx].astype(np.float64)
+
+    def window_start(self, idx: int) -> int:
+        return idx - self.scheduling_hour
+
+    def observation(self, idx: int) -> np.ndarray:
+        return self._windows[idx - self.scheduling_hour]
+
+    def observation_into(self, out: np.ndarray, idx: int):
+        out[:] = self._windows[idx - self.scheduling_hour]
@@ -1,10 +1,14 @@
-from typing import List
+from typing import Optional
 
+import numpy as np
 import pandas as pd
+from numpy.typing import DTypeLike
 from typing_extensions import Literal
 
-from ml4trade.data_strategies import DataStrategy, update_last_processed
+from ml4trade.data_strategies import DataStrategy
+from ml4trade.domain.randomness import RandomStream
 from ml4trade.domain.units import MW
+from ml4trade.shared_array import share_array
 
 imgw_col_ids = {
     'code': 0,
@@ -18,23 +22,71 @@ imgw_col_ids = {
 }
 
 
+def _production_parameter(name: str) -> property:
+    # production series are computed once, setting a parameter drops the computed one
+    attr = f'_{name}'
+
+    def fget(self):
+        return getattr(self, attr)
+
+    def fset(self, value):
+        setattr(self, attr, value)
+        self._production = None
+
+    return property(fget, fset)
+
+
 class ImgwDataStrategy(DataStrategy):
+    _derived_attrs = ('_production', '_solar_production', '_wind_production')
 
     def __init__(self, df: pd.DataFrame, window_size: int,
                  max_solar_power: MW, solar_efficiency: float, max_wind_power: MW, max_wind_speed: float,
-                 window_direction: Literal['forward', 'backward'] = 'forward'):
-        super().__init__(df, window_size, window_direction)
+                 window_direction: Literal['forward', 'backward'] = 'forward', dtype: DTypeLike = np.float64):
+        super().__init__(df, window_size, window_direction, dtype=dtype)
         self.imgwWindDataStrategy = ImgwWindDataStrategy(df, window_size, max_wind_power, max_wind_speed,
-                                                         window_direction)
+                                                         window_direction, dtype)
         self.imgwSolarDataStrategy = ImgwSolarDataStrategy(df, window_size, max_solar_power, solar_efficiency,
-                                                           window_direction)
-
-    @update_last_processed
-    def process(self, idx: int) -> float:
-        return self.imgwSolarDataStrategy.process(idx) + self.imgwWindDataStrategy.process(idx)
-
-    def observation(self, idx: int) -> List[float]:
-        return self.imgwWindDataStrategy.observation(idx) + self.imgwSolarDataStrategy.observation(idx)
+                                                           window_direction, dtype)
+        self._production = None
+        self._solar_production = None
+        self._wind_production = None
+
+    @property
+    def production(self) -> np.ndarray:
+        # solar + wind production for every row, follows parameter changes of both strategies
+        solar = self.imgwSolarDataStrategy.production
+        wind = self.imgwWindDataStrategy.production
+        if solar is not self._solar_production or wind is not self._wind_production:
+            self._production = solar + wind
+            self._solar_production = solar
+            self._wind_production = wind
+        return self._production
+
+    def share(self):
+        self.imgwWindDataStrategy.share()
+        self.imgwSolarDataStrategy.share()
+        # the sum of the shared productions and the productions it was computed from
+        self._production = share_array(self._shared_derived, '_production', self.production)
+        self._shared_derived['_solar_production'] = self.imgwSolarDataStrategy._shared_derived['_production']
+        self._shared_derived['_wind_production'] = self.imgwWindDataStrategy._shared_derived['_production']
+
+    def close(self):
+        super().close()
+        self.imgwWindDataStrategy.close()
+        self.imgwSolarDataStrategy.close()
+
+    def process(self, idx: int, stream: Optional[RandomStream] = None) -> float:
+        return self.production[idx].item()
+
+    def process_batch(self, idx: np.ndarray, stream: Optional[RandomStream] = None) -> np.ndarray:
+        return self.production[idx]
+
+    def observation(self, idx: int) -> np.ndarray:
+        return np.concatenate((self.imgwWindDataStrategy.observation(idx), self.imgwSolarDataStrategy.observation(idx)))
+
+    def observation_into(self, out: np.ndarray, idx: int):
+        self.imgwWindDataStrategy.observation_into(out[:self.window_size], idx)
+        self.imgwSolarDataStrategy.observation_into(out[self.window_size:], idx)
 
     def observation_size(self) -> int:
         return 2 * self.window_size
@@ -47,59 +99,102 @@ def _preprocess_data(df: pd.DataFrame) -> pd.DataFrame:
 
 
 class ImgwWindDataStrategy(DataStrategy):
+    _derived_attrs = ('_production',)
 
     def __init__(self, df: pd.DataFrame, window_size: int,
                  max_wind_power: MW, max_wind_speed: float,
-                 window_direction: Literal['forward', 'backward'] = 'forward'):
-        super().__init__(df, window_size, window_direction)
+                 window_direction: Literal['forward', 'backward'] = 'forward', dtype: DTypeLike = np.float64):
+        super().__init__(df, window_size, window_direction, dtype=dtype)
+        self._production = None
         self.max_wind_power = max_wind_power
         self.max_wind_speed = max_wind_speed
 
     col_name = 'wind_speed'
     col_idx = list(imgw_col_ids.keys()).index(col_name)
 
-    def get_column(self, df: pd.DataFrame) -> List[float]:
-        return df.iloc[:, self.col_idx].tolist()
+    max_wind_power = _production_parameter('max_wind_power')
+    max_wind_speed = _production_parameter('max_wind_speed')
+
+    def get_column(self, df: pd.DataFrame) -> np.ndarray:
+        return df.iloc[:, self.col_idx].to_numpy()
+
+    def share(self):
+        super().share()
+        self._production = share_array(self._shared_derived, '_production', self.production)
+
+    @property
+    def production(self) -> np.ndarray:
+        if self._production is None:
+            # wind speed in meters per second
+            wind_speed = self.col.astype(np.float64)
+            self._production = np.where(
+                (wind_speed > self.max_wind_speed) | (wind_speed < 0),
+                0.0, wind_speed * self.max_wind_power.value / self.max_wind_speed,
+            )
+        return self._production
+
+    def process(self, idx: int, stream: Optional[RandomStream] = None) -> float:
+        return self.production[idx].item()
 
-    @update_last_processed
-    def process(self, idx: int) -> float:
-        # wind speed in meters per second
-        wind_speed = self.col[idx]
-        if wind_speed > self.max_wind_speed or wind_speed < 0:
-            return 0
-        return wind_speed * self.max_wind_power.value / self.max_wind_speed
+    def process_batch(self, idx: np.ndarray, stream: Optional[RandomStream] = None) -> np.ndarray:
+        return self.production[idx]
 
-    def observation(self, idx: int) -> List[float]:
-        start_idx = idx + 24 - self.scheduling_hour
-        end_idx = start_idx + self.window_size
-        return self.col[start_idx:end_idx]
+    def window_start(self, idx: int) -> int:
+        return idx + 24 - self.scheduling_hour
+
+    def observation(self, idx: int) -> np.ndarray:
+        return self._windows[idx + 24 - self.scheduling_hour]
+
+    def observation_into(self, out: np.ndarray, idx: int):
+        out[:] = self._windows[idx + 24 - self.scheduling_hour]
 
 
 class ImgwSolarDataStrategy(DataStrategy):
+    _derived_attrs = ('_production',)
 
     def __init__(self, df: pd.DataFrame, window_size: int,
                  max_solar_power: MW, solar_efficiency: float,
-                 window_direction: Literal['forward', 'backward'] = 'forward'):
-        super().__init__(df, window_size, window_direction)
+                 window_direction: Literal['forward', 'backward'] = 'forward', dtype: DTypeLike = np.float64):
+        super().__init__(df, window_size, window_direction, dtype=dtype)
+        self._production = None
         self.max_solar_power = max_solar_power
         self.solar_efficiency = solar_efficiency
 
     col_name = 'cloudiness'
     col_idx = list(imgw_col_ids.keys()).index(col_name)
 
-    def get_column(self, df: pd.DataFrame) -> List[float]:
-        return df.iloc[:, self.col_idx].tolist()
-
-    @update_last_processed
-    def process(self, idx: int) -> float:
-        # cloudiness in oktas
-        # https://en.wikipedia.org/wiki/Okta 
-        cloudiness = self.col[idx]
-        if cloudiness == 9:  # 9 equals lack of observation (sky obscured)
-            cloudiness = 8  # 8 equals overcast
-        return self.max_solar_power.value * (1 - cloudiness / 8) * self.solar_efficiency
-
-    def observation(self, idx: int) -> List[float]:
-        start_idx = idx + 24 - self.scheduling_hour
-        end_idx = start_idx + self.window_size
-        return self.col[start_idx:end_idx]
+    max_solar_power = _production_parameter('max_solar_power')
+    solar_efficiency = _production_parameter('solar_efficiency')
+
+    def get_column(self, df: pd.DataFrame) -> np.ndarray:
+        return df.iloc[:, self.col_idx].to_numpy()
+
+    def share(self):
+        super().share()
+        self._production = share_array(self._shared_derived, '_production', self.production)
+
+    @property
+    def production(self) -> np.ndarray:
+        if self._production is None:
+            # cloudiness in oktas
+            # https://en.wikipedia.org/wiki/Okta
+            cloudiness = self.col.astype(np.float64)
+            # 9 equals lack of observation (sky obscured), 8 equals overcast
+            cloudiness[cloudiness == 9] = 8
+            self._production = self.max_solar_power.value * (1 - cloudiness / 8) * self.solar_efficiency
+        return self._production
+
+    def process(self, idx: int, stream: Optional[RandomStream] = None) -> float:
+        return self.production[idx].item()
+
+    def process_batch(self, idx: np.ndarray, stream: Optional[RandomStream] = None) -> np.ndarray:
+        return self.production[idx]
+
+    def window_start(self, idx: int) -> int:
+        return idx + 24 - self.scheduling_hour
+
+    def observation(self, idx: int) -> np.ndarray:
+        return self._windows[idx + 24 - self.scheduling_hour]
+
+    def observation_into(self, out: np.ndarray, idx: int):
+        out[:] = self._windows[idx + 24 - self.scheduling_hour]
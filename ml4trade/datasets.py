@@ -0,0 +1,217 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, NamedTuple, Optional, Sequence, Iterator, BinaryIO
+
+import numpy as np
+import pandas as pd
+
+from ml4trade.data_strategies import imgw_col_ids
+
+# 352200375 - station_code for Warszawa Okecie
+WARSAW_OKECIE = 352200375
+PRICES_DATETIME_COL = 'index'
+
+_META = 'meta.json'
+_DIGESTS = 'digests.json'
+_PARTS = 'weather_parts'
+_CHUNK_ROWS = 100_000
+# bump when the preprocessing changes, stores built by older versions are rebuilt
+_VERSION = 1
+_DATE_DTYPES = {'year': np.int16, 'month': np.int8, 'day': np.int8, 'hour': np.int8}
+
+
+class Dataset(NamedTuple):
+    # weather has the columns of imgw_col_ids for a single station,
+    # both dataframes have one row per hour without gaps
+    weather: pd.DataFrame
+    prices: pd.DataFrame
+
+
+def read_weather(paths: Sequence[str], station_code: int = WARSAW_OKECIE, cache_dir: Optional[str] = None,
+                 max_workers: Optional[int] = None) -> pd.DataFrame:
+    # `paths` are IMGW csv files or zip archives of them, read chunk by chunk in a process pool
+    # keeping only the rows of `station_code`;
+    # with `cache_dir` the rows of every file are kept there, so only new or changed files are read
+    parts_dir = None
+    todo = list(paths)
+    if cache_dir is not None:
+        parts_dir = os.path.join(cache_dir, _PARTS)
+        os.makedirs(parts_dir, exist_ok=True)
+        digests = _file_digests(paths, cache_dir)
+        part_paths = [os.path.join(parts_dir, f'{d[:16]}_{station_code}.npz') for d in digests]
+        todo = [p for p, part in zip(paths, part_paths) if not os.path.exists(part)]
+
+    if len(todo) > 1 and max_workers != 1:
+        with ProcessPoolExecutor(max_workers) as executor:
+            rows = dict(zip(todo, executor.map(_read_station_rows, todo, [station_code] * len(todo))))
+    else:
+        rows = {p: _read_station_rows(p, station_code) for p in todo}
+
+    dfs = []
+    for i, path in enumerate(paths):
+        if parts_dir is None:
+            dfs.append(rows[path])
+        else:
+            if path in rows:
+                _save_part(rows[path], part_paths[i])
+            dfs.append(_read_part(part_paths[i]))
+    df = pd.concat(dfs, axis=0, ignore_index=True)
+    assert len(df), f'No data of station {station_code}'
+    datetimes = pd.to_datetime(df[['year', 'month', 'day', 'hour']])
+    df = _align_hourly(df.set_index(datetimes))
+    df['code'] = station_code
+    for c, dtype in _DATE_DTYPES.items():
+        df[c] = getattr(df.index, c).astype(dtype)
+    return df.reset_index(drop=True)
+
+
+def _read_station_rows(path: str, station_code: int) -> pd.DataFrame:
+    # peak memory is a chunk and the rows of the station
+    dfs = [pd.DataFrame({c: np.empty(0) for c in imgw_col_ids.keys()})]
+    for f in _open_csvs(path):
+        with f:
+            for chunk in pd.read_csv(f, header=None, encoding='cp1250', chunksize=_CHUNK_ROWS,
+                                     names=list(imgw_col_ids.keys()), usecols=list(imgw_col_ids.values())):
+                dfs.append(chunk.loc[chunk['code'] == station_code])
+    return pd.concat(dfs, axis=0, ignore_index=True).astype(np.float64)
+
+
+def _open_csvs(path: str) -> Iterator[BinaryIO]:
+    if not zipfile.is_zipfile(path):
+        yield open(path, 'rb')
+        return
+    with zipfile.ZipFile(path) as archive:
+        for name in archive.namelist():
+            if name.lower().endswith('.csv'):
+                yield archive.open(name)
+
+
+def _save_part(df: pd.DataFrame, path: str):
+    tmp_path = f'{path}.{os.getpid()}.tmp.npz'
+    np.savez(tmp_path, **{c: df[c].to_numpy(np.float64) for c in df.columns})
+    os.replace(tmp_path, path)
+
+
+def _read_part(path: str) -> pd.DataFrame:
+    with np.load(path) as part:
+        return pd.DataFrame({c: part[c] for c in imgw_col_ids.keys()})
+
+
+def read_prices_csv(path: str) -> pd.DataFrame:
+    df = pd.read_csv(path, header=0)
+    datetimes = pd.to_datetime(df[PRICES_DATETIME_COL])
+    df = _align_hourly(df.drop(columns=PRICES_DATETIME_COL).set_index(datetimes))
+    return df.rename_axis(PRICES_DATETIME_COL).reset_index()
+
+
+def _align_hourly(df: pd.DataFrame) -> pd.DataFrame:
+    # sorted rows, one per hour; the first of duplicated hours is kept,
+    # missing hours and values are filled with the next known value
+    df = df.sort_index(kind='stable')
+    df = df.loc[~df.index.duplicated()]
+    hours = pd.date_range(df.index[0], df.index[-1], freq='h')
+    return df.reindex(hours).bfill()
+
+
+def load_dataset(weather_paths: Sequence[str], prices_path: str, cache_dir: str,
+                 station_code: int = WARSAW_OKECIE) -> Dataset:
+    # preprocessed data is stored under `cache_dir` keyed by a hash of the inputs' contents,
+    # it is only built when there is no store for the current inputs
+    key = dataset_key(weather_paths, prices_path, station_code, cache_dir)
+    path = os.path.join(cache_dir, key)
+    if not os.path.isdir(path):
+        dataset = Dataset(read_weather(weather_paths, station_code, cache_dir), read_prices_csv(prices_path))
+        save_dataset(dataset, path)
+    return read_dataset(path)
+
+
+def dataset_key(weather_paths: Sequence[str], prices_path: str, station_code: int = WARSAW_OKECIE,
+                cache_dir: Optional[str] = None) -> str:
+    h = hashlib.sha256(f'{_VERSION}:{station_code}'.encode())
+    for digest in _file_digests([*sorted(weather_paths, key=os.path.basename), prices_path], cache_dir):
+        h.update(digest.encode())
+    return h.hexdigest()[:16]
+
+
+def _file_digests(paths: Sequence[str], cache_dir: Optional[str] = None) -> List[str]:
+    # digests of unchanged files (same size and modification time) are remembered in `cache_dir`
+    digests = {}
+    digests_path = None
+    if cache_dir is not None:
+        digests_path = os.path.join(cache_dir, _DIGESTS)
+        if os.path.exists(digests_path):
+            with open(digests_path, 'r') as f:
+                digests = json.load(f)
+
+    res = []
+    for path in paths:
+        stat = os.stat(path)
+        abspath = os.path.abspath(path)
+        entry = digests.get(abspath)
+        if entry is None or entry[:2] != [stat.st_size, stat.st_mtime_ns]:
+            entry = digests[abspath] = [stat.st_size, stat.st_mtime_ns, _file_digest(path)]
+        res.append(entry[2])
+
+    if digests_path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        # replaced at once, a concurrent or interrupted write never leaves a partial file
+        tmp_path = f'{digests_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(digests, f)
+        os.replace(tmp_path, digests_path)
+    return res
+
+
+def _file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def save_dataset(dataset: Dataset, path: str):
+    # a directory with one .npy file per column; written next to `path` and renamed,
+    # so concurrent readers never see a partial store
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    tmp_path = tempfile.mkdtemp(dir=parent)
+    meta = {'version': _VERSION}
+    for name, df in dataset._asdict().items():
+        meta[name] = list(df.columns)
+        for i, c in enumerate(df.columns):
+            np.save(os.path.join(tmp_path, f'{name}_{i}.npy'), df[c].to_numpy())
+    with open(os.path.join(tmp_path, _META), 'w') as f:
+        json.dump(meta, f)
+    try:
+        os.rename(tmp_path, path)
+    except OSError:
+        # built by another process in the meantime
+        shutil.rmtree(tmp_path)
+        if not os.path.isdir(path):
+            raise
+
+
+def read_dataset(path: str) -> Dataset:
+    with open(os.path.join(path, _META), 'r') as f:
+        meta = json.load(f)
+    assert meta['version'] == _VERSION, f'Unsupported dataset version {meta["version"]}'
+    dfs = {}
+    for name in Dataset._fields:
+        dfs[name] = pd.DataFrame({
+            c: np.load(os.path.join(path, f'{name}_{i}.npy')) for i, c in enumerate(meta[name])
+        })
+    return Dataset(**dfs)
+
+
+def list_files(path: str, extension: str = '.csv') -> List[str]:
+    # files with `extension` in `path` and its subdirectories, sorted
+    return sorted(
+        os.path.join(root, f)
+        for root, _, files in os.walk(path) for f in files if f.lower().endswith(extension)
+    )
@@ -27,9 +27,9 @@ class SimulationClock:
         self.tick_duration = tick_duration
         self.tick_offset = 0
 
-    def tick(self) -> None:
-        self.cur_tick += 1
-        self.cur_datetime += self.tick_duration
+    def tick(self, n: int = 1) -> None:
+        self.cur_tick += n
+        self.cur_datetime += self.tick_duration * n
 
     def scheduling_hour(self) -> int:
         return self.scheduling_time.hour
@@ -1,7 +1,10 @@
-from typing import List
+from typing import List, Optional
+
+import numpy as np
 
 from ml4trade.domain.units import MWh
 from ml4trade.domain.clock import ClockView
+from ml4trade.domain.randomness import RandomStream
 from ml4trade.data_strategies import DataStrategy
 
 
@@ -9,9 +12,20 @@ class ConsumptionSystem:
     def __init__(self, ds: DataStrategy, clock_view: ClockView):
         self.ds = ds
         self.clock_view = clock_view
+        # state of the simulation kept here, `ds` may be shared by many simulations
+        self.stream: Optional[RandomStream] = None
+        self.last_processed: Optional[float] = None
 
     def calculate_energy(self) -> MWh:
-        return MWh(self.ds.process(self.clock_view.cur_datetime().hour))
+        hour = self.clock_view.cur_datetime().hour
+        if self.stream is None:
+            self.last_processed = self.ds.process(hour)
+        else:
+            self.last_processed = self.ds.process(hour, self.stream)
+        return MWh(self.last_processed)
 
     def observation(self) -> List[float]:
         return self.ds.observation(self.clock_view.cur_datetime().hour)
+
+    def observation_into(self, out: np.ndarray):
+        self.ds.observation_into(out, self.clock_view.cur_datetime().hour)
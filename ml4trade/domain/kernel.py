@@ -0,0 +1,189 @@
+from typing import NamedTuple, Union, List
+
+import numpy as np
+
+from ml4trade.domain.market import UNSCHEDULED_MULTIPLIER
+
+
+# Array counterpart of Prosumer.consume/produce, EnergyMarket.buy/sell and Battery.charge/discharge.
+# Every tick runs two phases (consumption and production) in the order given by `consume_first`.
+# Operations are performed in the same order as in the object model, so results are bit-identical.
+
+
+def draw_consume_first(rng: np.random.Generator, n: int) -> np.ndarray:
+    # Generator.shuffle([consume, produce]) draws one 32-bit integer
+    # and keeps the original order if its lowest bit is set
+    return (rng.integers(0, 0xFFFFFFFF, size=n, dtype=np.uint32, endpoint=True) & 1).astype(bool)
+
+
+class TickRecords(NamedTuple):
+    balance: Union[np.ndarray, List[float]]
+    charge: Union[np.ndarray, List[float]]
+    unscheduled_buy: Union[np.ndarray, List[float]]
+    unscheduled_sell: Union[np.ndarray, List[float]]
+
+
+def scheduled_fills(
+        prices: np.ndarray,
+        production: np.ndarray,
+        consumption: np.ndarray,
+        buy_amounts: np.ndarray,
+        buy_thresholds: np.ndarray,
+        sell_amounts: np.ndarray,
+        sell_thresholds: np.ndarray,
+) -> (np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray):
+    # energy balance left after each phase's scheduled transaction
+    # and the corresponding cash flows
+    buy_ok = ~(prices > buy_thresholds)
+    sell_ok = ~(prices < sell_thresholds)
+    consumed = 0.0 - consumption
+    produced = 0.0 + production
+    consume_energy = np.where(buy_ok, consumed + buy_amounts, consumed)
+    produce_energy = np.where(sell_ok, produced - sell_amounts, produced)
+    return consume_energy, produce_energy, buy_ok, buy_amounts * prices, sell_ok, sell_amounts * prices
+
+
+def restore_energy_balance(
+        energy: np.ndarray,
+        price: np.ndarray,
+        balance: np.ndarray,
+        charge: np.ndarray,
+        capacity: float,
+        efficiency: float,
+) -> (np.ndarray, np.ndarray, np.ndarray, np.ndarray):
+    discharging = energy < 0
+    charging = energy > 0
+    discharged = np.minimum(-energy, charge)
+    fits = energy * efficiency <= capacity - charge
+    charged = np.where(fits, energy, (capacity - charge) / efficiency)
+    charge = np.where(
+        discharging, charge - discharged,
+        np.where(charging, np.where(fits, charge + energy * efficiency, capacity), charge),
+    )
+    energy = np.where(discharging, energy + discharged, np.where(charging, energy - charged, energy))
+
+    sold = np.where(energy > 0, energy, 0.0)
+    bought = np.where(energy < 0, -energy, 0.0)
+    balance = np.where(energy > 0, balance + sold * (price / UNSCHEDULED_MULTIPLIER), balance)
+    balance = np.where(energy < 0, balance - bought * (price * UNSCHEDULED_MULTIPLIER), balance)
+    return balance, charge, bought, sold
+
+
+def simulate_ticks(
+        balance: np.ndarray,
+        charge: np.ndarray,
+        capacity: float,
+        efficiency: float,
+        prices: np.ndarray,
+        production: np.ndarray,
+        consumption: np.ndarray,
+        consume_first: np.ndarray,
+        buy_amounts: np.ndarray,
+        buy_thresholds: np.ndarray,
+        sell_amounts: np.ndarray,
+        sell_thresholds: np.ndarray,
+) -> TickRecords:
+    # balance, charge: (n_envs,); per tick arguments broadcast to (n_envs, n_ticks)
+    n_envs, n_ticks = consume_first.shape
+    shape = (n_envs, n_ticks)
+    prices = np.broadcast_to(prices, shape)
+    (
+        consume_energy, produce_energy,
+        buy_ok, buy_costs,
+        sell_ok, sell_revenues,
+    ) = (np.broadcast_to(a, shape) for a in scheduled_fills(
+        prices, production, consumption,
+        buy_amounts, buy_thresholds, sell_amounts, sell_thresholds,
+    ))
+
+    records = TickRecords(*(np.empty(shape) for _ in TickRecords._fields))
+    for t in range(n_ticks):
+        price = prices[:, t]
+        first_consume = consume_first[:, t]
+        consumed_balance = np.where(buy_ok[:, t], balance - buy_costs[:, t], balance)
+        produced_balance = np.where(sell_ok[:, t], balance + sell_revenues[:, t], balance)
+
+        energy = np.where(first_consume, consume_energy[:, t], produce_energy[:, t])
+        balance = np.where(first_consume, consumed_balance, produced_balance)
+        balance, charge, bought, sold = restore_energy_balance(energy, price, balance, charge, capacity, efficiency)
+
+        energy = np.where(first_consume, produce_energy[:, t], consume_energy[:, t])
+        balance = np.where(
+            first_consume,
+            np.where(sell_ok[:, t], balance + sell_revenues[:, t], balance),
+            np.where(buy_ok[:, t], balance - buy_costs[:, t], balance),
+        )
+        balance, charge, bought2, sold2 = restore_energy_balance(energy, price, balance, charge, capacity, efficiency)
+
+        records.balance[:, t] = balance
+        records.charge[:, t] = charge
+        records.unscheduled_buy[:, t] = bought + bought2
+        records.unscheduled_sell[:, t] = sold + sold2
+    return records
+
+
+def simulate_day(
+        balance: float,
+        charge: float,
+        capacity: float,
+        efficiency: float,
+        prices: np.ndarray,
+        production: np.ndarray,
+        consumption: np.ndarray,
+        consume_first: np.ndarray,
+        buy_amounts: np.ndarray,
+        buy_thresholds: np.ndarray,
+        sell_amounts: np.ndarray,
+        sell_thresholds: np.ndarray,
+) -> TickRecords:
+    # single env version of simulate_ticks taking 1d per tick arrays: scheduled transactions
+    # are vectorized, the battery and wallet recurrence runs over plain floats
+    (
+        consume_energy, produce_energy,
+        buy_ok, buy_costs,
+        sell_ok, sell_revenues,
+    ) = (a.tolist() for a in scheduled_fills(
+        prices, production, consumption,
+        buy_amounts, buy_thresholds, sell_amounts, sell_thresholds,
+    ))
+    prices = prices.tolist()
+
+    records = TickRecords([], [], [], [])
+    for t, first_consume in enumerate(consume_first.tolist()):
+        price = prices[t]
+        bought = sold = 0.0
+        for consume in (first_consume, not first_consume):
+            if consume:
+                energy = consume_energy[t]
+                if buy_ok[t]:
+                    balance -= buy_costs[t]
+            else:
+                energy = produce_energy[t]
+                if sell_ok[t]:
+                    balance += sell_revenues[t]
+
+            if energy < 0:
+                discharged = min(-energy, charge)
+                charge -= discharged
+                energy += discharged
+            elif energy > 0:
+                if energy * efficiency <= capacity - charge:
+                    charge += energy * efficiency
+                    energy -= energy
+                else:
+                    charged = (capacity - charge) / efficiency
+                    charge = capacity
+                    energy -= charged
+
+            if energy > 0:
+                sold += energy
+                balance += energy * (price / UNSCHEDULED_MULTIPLIER)
+            elif energy < 0:
+                bought += -energy
+                balance -= -energy * (price * UNSCHEDULED_MULTIPLIER)
+
+        records.balance.append(balance)
+        records.charge.append(charge)
+        records.unscheduled_buy.append(bought)
+        records.unscheduled_sell.append(sold)
+    return records
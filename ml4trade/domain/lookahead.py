@@ -0,0 +1,63 @@
+from typing import NamedTuple, List, Sequence, Union, Callable
+
+import numpy as np
+
+from ml4trade.domain.kernel import TickRecords
+from ml4trade.domain.randomness import RandomStream
+
+RandomSource = Union[np.random.Generator, RandomStream]
+
+
+def rng_states(rngs: Sequence[RandomSource]) -> List[Union[dict, int]]:
+    return [rng.state if isinstance(rng, RandomStream) else rng.bit_generator.state for rng in rngs]
+
+
+def set_rng_states(rngs: Sequence[RandomSource], states: List[Union[dict, int]]):
+    for rng, state in zip(rngs, states):
+        if isinstance(rng, RandomStream):
+            rng.state = state
+        else:
+            rng.bit_generator.state = state
+
+
+class TickBatch(NamedTuple):
+    prices: np.ndarray
+    production: np.ndarray
+    consumption: np.ndarray
+    records: TickRecords
+
+
+class Projection(NamedTuple):
+    """Ticks simulated ahead of the clock with the generators rolled back afterwards.
+
+    The real simulation may take the batch over if it starts from the same tick, state,
+    schedule and generator states, after which the generators are moved to `next_rng_states`.
+    """
+    start_tick: int
+    balance: Union[float, np.ndarray]
+    charge: Union[float, np.ndarray]
+    actions: np.ndarray
+    rng_states: List[Union[dict, int]]
+    next_rng_states: List[Union[dict, int]]
+    batch: TickBatch
+
+    def matches(self, start_tick: int, balance: Union[float, np.ndarray], charge: Union[float, np.ndarray],
+                actions: np.ndarray, states: List[Union[dict, int]]) -> bool:
+        return (
+            self.start_tick == start_tick
+            and self.actions is actions
+            and np.array_equal(self.balance, balance)
+            and np.array_equal(self.charge, charge)
+            and self.rng_states == states
+        )
+
+
+def project(rngs: Sequence[RandomSource], start_tick: int,
+            balance: Union[float, np.ndarray], charge: Union[float, np.ndarray],
+            actions: np.ndarray, simulate: Callable[[], TickBatch]) -> Projection:
+    # runs `simulate()` without advancing any of the generators
+    states = rng_states(rngs)
+    batch = simulate()
+    next_states = rng_states(rngs)
+    set_rng_states(rngs, states)
+    return Projection(start_tick, balance, charge, actions, states, next_states, batch)
@@ -1,9 +1,12 @@
-from typing import List
+from typing import List, Optional
+
+import numpy as np
 
 from ml4trade.domain.units import MWh, Currency
 from ml4trade.domain.wallet import Wallet
 from ml4trade.domain.battery import EnergyBalance
 from ml4trade.domain.clock import ClockView
+from ml4trade.domain.randomness import RandomStream
 from ml4trade.data_strategies.base import DataStrategy
 
 
@@ -14,6 +17,8 @@ class EnergyMarket:
     def __init__(self, ds: DataStrategy, clock_view: ClockView):
         self.ds = ds
         self.clock_view = clock_view
+        # state of the simulation kept here, `ds` may be shared by many simulations
+        self.stream: Optional[RandomStream] = None
 
     def buy(self, amount: MWh, price_threshold: Currency,
             client_wallet: Wallet, energy_balance: EnergyBalance,
@@ -39,10 +44,15 @@ class EnergyMarket:
         return True
 
     def get_buy_price(self):
-        return Currency(self.ds.process(self.clock_view.cur_tick()))
+        return Currency(self._price())
 
     def get_sell_price(self):
-        return Currency(self.ds.process(self.clock_view.cur_tick()))
+        return Currency(self._price())
+
+    def _price(self) -> float:
+        if self.stream is None:
+            return self.ds.process(self.clock_view.cur_tick())
+        return self.ds.process(self.clock_view.cur_tick(), self.stream)
 
     def get_buy_price_unscheduled(self):
         return self.get_buy_price() * UNSCHEDULED_MULTIPLIER
@@ -52,3 +62,6 @@ class EnergyMarket:
 
     def observation(self) -> List[float]:
         return self.ds.observation(self.clock_view.cur_tick())
+
+    def observation_into(self, out: np.ndarray):
+        self.ds.observation_into(out, self.clock_view.cur_tick())
@@ -1,6 +1,9 @@
-from typing import List
+from typing import List, Optional
+
+import numpy as np
 
 from ml4trade.domain.clock import ClockView
+from ml4trade.domain.randomness import RandomStream
 from ml4trade.domain.units import MWh
 from ml4trade.data_strategies.base import DataStrategy
 
@@ -9,11 +12,21 @@ class ProductionSystem:
     def __init__(self, ds: DataStrategy, clock_view: ClockView = None):
         self.ds = ds
         self.clock_view = clock_view
+        # state of the simulation kept here, `ds` may be shared by many simulations
+        self.stream: Optional[RandomStream] = None
+        self.last_processed: Optional[float] = None
 
     def calculate_energy(self) -> MWh:
         cur_tick = self.clock_view.cur_tick()
-        return MWh(self.ds.process(cur_tick))
+        if self.stream is None:
+            self.last_processed = self.ds.process(cur_tick)
+        else:
+            self.last_processed = self.ds.process(cur_tick, self.stream)
+        return MWh(self.last_processed)
 
     def observation(self) -> List[float]:
         cur_tick = self.clock_view.cur_tick()
         return self.ds.observation(cur_tick)
+
+    def observation_into(self, out: np.ndarray):
+        self.ds.observation_into(out, self.clock_view.cur_tick())
@@ -10,6 +10,10 @@ from ml4trade.domain.wallet import Wallet
 from ml4trade.domain.units import Currency, MWh
 from ml4trade.domain.clock import ClockView
 
+_NO_ENERGY = MWh(0)
+_ANY_SELL_PRICE = Currency(float('inf'))
+_ANY_BUY_PRICE = Currency(float('0'))
+
 
 class Prosumer:
     def __init__(
@@ -44,15 +48,17 @@ class Prosumer:
         self.next_day_actions = actions
 
     def set_new_actions(self):
-        self.scheduled_buy_amounts = [MWh(a) for a in self.next_day_actions[0:24]]
-        self.scheduled_sell_amounts = [MWh(a) for a in self.next_day_actions[24:48]]
-        self.scheduled_buy_thresholds = [Currency(a) for a in self.next_day_actions[48:72]]
-        self.scheduled_sell_thresholds = [Currency(a) for a in self.next_day_actions[72:96]]
+        # python floats keep unit arithmetic in double precision regardless of action dtype
+        actions = np.asarray(self.next_day_actions, dtype=np.float64).tolist()
+        self.scheduled_buy_amounts = [MWh(a) for a in actions[0:24]]
+        self.scheduled_sell_amounts = [MWh(a) for a in actions[24:48]]
+        self.scheduled_buy_thresholds = [Currency(a) for a in actions[48:72]]
+        self.scheduled_sell_thresholds = [Currency(a) for a in actions[72:96]]
         self.next_day_actions = None
 
     def consume(self):
         self._consume_energy()
-        cur_hour = self.clock_view.cur_datetime().time().hour
+        cur_hour = self.clock_view.cur_datetime().hour
         self.buy_energy(
             self.scheduled_buy_amounts[cur_hour],
             self.scheduled_buy_thresholds[cur_hour],
@@ -61,7 +67,7 @@ class Prosumer:
 
     def produce(self):
         self._produce_energy()
-        cur_hour = self.clock_view.cur_datetime().time().hour
+        cur_hour = self.clock_view.cur_datetime().hour
         self.sell_energy(
             self.scheduled_sell_amounts[cur_hour],
             self.scheduled_sell_thresholds[cur_hour],
@@ -97,22 +103,22 @@ class Prosumer:
                 self.last_unscheduled_sell_transaction = (prev_value + amount.value, True)
 
     def _restore_energy_balance(self):
-        if self.energy_balance.value < MWh(0):
+        if self.energy_balance.value < _NO_ENERGY:
             energy_used = self.battery.discharge(abs(self.energy_balance.value))
             self.energy_balance.value += energy_used
-        elif self.energy_balance.value > MWh(0):
+        elif self.energy_balance.value > _NO_ENERGY:
             energy_used = self.battery.charge(self.energy_balance.value)
             self.energy_balance.value -= energy_used
 
-        if self.energy_balance.value > MWh(0):
+        if self.energy_balance.value > _NO_ENERGY:
             self.sell_energy(
                 self.energy_balance.value,
-                Currency(float('inf')),
+                _ANY_SELL_PRICE,
                 scheduled=False,
             )
-        elif self.energy_balance.value < MWh(0):
+        elif self.energy_balance.value < _NO_ENERGY:
             self.buy_energy(
                 abs(self.energy_balance.value),
-                Currency(float('0')),
+                _ANY_BUY_PRICE,
                 scheduled=False,
             )
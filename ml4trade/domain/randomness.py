@@ -0,0 +1,68 @@
+from typing import Callable, Union
+
+import numpy as np
+
+
+# Random values are drawn in blocks and read in order from a RandomStream. Drawing n values at once
+# gives the same values as n separate draws, so the streams of an environment reset with `seed` are:
+#
+#   consume_first      - SimulationEnv.np_random (seeding.np_random(seed)), one uint32 per tick,
+#                        its lowest bit tells if consumption is handled before production
+#                        (see kernel.draw_consume_first)
+#   consumption noise  - the consumption data strategy's rng (seeding.np_random(seed)),
+#                        one normal(0, 0.03) value per tick
+#
+# Resetting without a seed continues the streams. VectorSimulationEnv sub-env `i` uses the same
+# streams with the seed `spawn_seeds(seed, num_envs)[i]`.
+
+
+class RandomStream:
+    """Values of `draw(rng, n)` read one after another, drawn from `rng` `block_size` at a time.
+
+    `state` is the position in the stream, positions up to `block_size` values behind
+    the current one can be restored.
+    """
+
+    def __init__(self, rng: np.random.Generator, draw: Callable[[np.random.Generator, int], np.ndarray],
+                 block_size: int = 1024):
+        self.rng = rng
+        self.block_size = block_size
+        self._draw = draw
+        self._array = draw(rng, 0)
+        # the same values for fast scalar reads
+        self._values = []
+        self._offset = 0
+        self._pos = 0
+
+    @property
+    def state(self) -> int:
+        return self._offset + self._pos
+
+    @state.setter
+    def state(self, state: int):
+        pos = state - self._offset
+        assert 0 <= pos <= len(self._values), f'Position {state} is no longer held by the stream'
+        self._pos = pos
+
+    def next(self) -> Union[float, bool]:
+        if self._pos == len(self._values):
+            self._refill(1)
+        value = self._values[self._pos]
+        self._pos += 1
+        return value
+
+    def take(self, n: int) -> np.ndarray:
+        if self._pos + n > len(self._values):
+            self._refill(self._pos + n - len(self._values))
+        end = self._pos + n
+        values = self._array[self._pos:end]
+        self._pos = end
+        return values
+
+    def _refill(self, n: int):
+        keep_from = max(self._pos - self.block_size, 0)
+        block = self._draw(self.rng, max(n, self.block_size))
+        self._array = np.concatenate((self._array[keep_from:], block))
+        self._values = self._values[keep_from:] + block.tolist()
+        self._offset += keep_from
+        self._pos -= keep_from
@@ -1,26 +1,59 @@
-from dataclasses import dataclass
+import functools
+import os
+from numbers import Real
 from typing import Union
 
 
-@dataclass(frozen=True, eq=True, repr=True)
-class MWh:
-    value: float
+# Units are plain __slots__ objects holding a float. By default operations don't check
+# their operands, call set_debug_units(True) (or set ML4TRADE_DEBUG_UNITS=1) to make
+# units immutable and raise TypeError when units are mixed up.
 
-    def to_cost(self, price_per_mwh: 'Currency') -> 'Currency':
-        return Currency(self.value * price_per_mwh.value)
 
-    def __add__(self, other):
-        return MWh(self.value + other.value)
+class _Unit:
+    __slots__ = ('value',)
 
-    def __sub__(self, other):
-        return MWh(self.value - other.value)
+    def __init__(self, value: float):
+        self.value = value
+
+    def __repr__(self):
+        return f'{type(self).__name__}(value={self.value!r})'
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.value == other.value
+
+    def __hash__(self):
+        return hash((type(self), self.value))
 
     def __lt__(self, other):
         return self.value < other.value
 
+    def __le__(self, other):
+        return self.value <= other.value
+
+    def __gt__(self, other):
+        return self.value > other.value
+
     def __ge__(self, other):
         return self.value >= other.value
 
+    def __reduce__(self):
+        return type(self), (self.value,)
+
+
+class MWh(_Unit):
+    __slots__ = ()
+
+    def to_cost(self, price_per_mwh: 'Currency') -> 'Currency':
+        return Currency(self.value * price_per_mwh.value)
+
+    def __add__(self, other):
+        return MWh(self.value + other.value)
+
+    def __sub__(self, other):
+        return MWh(self.value - other.value)
+
     def __mul__(self, other: float):
         return MWh(self.value * other)
 
@@ -33,9 +66,8 @@ class MWh:
         return MWh(abs(self.value))
 
 
-@dataclass(frozen=True, order=True, eq=True, repr=True)
-class MW:
-    value: float
+class MW(_Unit):
+    __slots__ = ()
 
     def __add__(self, other: 'MW'):
         return MW(self.value + other.value)
@@ -47,9 +79,8 @@ class MW:
         return MWh(self.value)
 
 
-@dataclass(frozen=True, order=True, eq=True, repr=True)
-class Currency:
-    value: float
+class Currency(_Unit):
+    __slots__ = ()
 
     def __add__(self, other: 'Currency'):
         return Currency(self.value + other.value)
@@ -71,3 +102,75 @@ class Currency:
 
     def __round__(self, n=None):
         return Currency(round(self.value, n))
+
+
+def _check_value(method):
+    @functools.wraps(method)
+    def checked(self, value):
+        if not _is_number(value):
+            raise TypeError(f'{type(self).__name__} expects a real number, got {value!r}')
+        object.__setattr__(self, 'value', value)
+    return checked
+
+
+def _frozen(self, name, value):
+    raise AttributeError(f'cannot assign to field {name!r} of {type(self).__name__}')
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, Real) and not isinstance(value, _Unit)
+
+
+def _check_operand(*allowed):
+    # allowed operand types, `Real` stands for plain numbers
+    def decorator(method):
+        @functools.wraps(method)
+        def checked(self, other):
+            if not any(_is_number(other) if t is Real else type(other) is t for t in allowed):
+                raise TypeError(f'unsupported operand for {type(self).__name__}.{method.__name__}: {other!r}')
+            return method(self, other)
+        return checked
+    return decorator
+
+
+_CHECKED_OPERANDS = {
+    MWh: {
+        'to_cost': (Currency,), '__add__': (MWh,), '__sub__': (MWh,),
+        '__mul__': (Real,), '__truediv__': (MWh, Real),
+        '__lt__': (MWh,), '__le__': (MWh,), '__gt__': (MWh,), '__ge__': (MWh,),
+    },
+    MW: {
+        '__add__': (MW,), '__sub__': (MW,),
+        '__lt__': (MW,), '__le__': (MW,), '__gt__': (MW,), '__ge__': (MW,),
+    },
+    Currency: {
+        '__add__': (Currency,), '__radd__': (Real,), '__sub__': (Currency,),
+        '__mul__': (Real,), '__truediv__': (Real,),
+        '__lt__': (Currency,), '__le__': (Currency,), '__gt__': (Currency,), '__ge__': (Currency,),
+    },
+}
+_debug_units = False
+
+
+def set_debug_units(enabled: bool):
+    global _debug_units
+    if enabled == _debug_units:
+        return
+    _debug_units = enabled
+    for cls, operands in _CHECKED_OPERANDS.items():
+        for name, allowed in operands.items():
+            method = getattr(cls, name)
+            setattr(cls, name, _check_operand(*allowed)(method) if enabled else method.__wrapped__)
+    if enabled:
+        _Unit.__init__ = _check_value(_Unit.__init__)
+        _Unit.__setattr__ = _frozen
+    else:
+        _Unit.__init__ = _Unit.__init__.__wrapped__
+        del _Unit.__setattr__
+
+
+def debug_units_enabled() -> bool:
+    return _debug_units
+
+
+set_debug_units(os.environ.get('ML4TRADE_DEBUG_UNITS', '0') not in ('', '0'))
@@ -0,0 +1,107 @@
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Callable, List, NamedTuple, Optional, Sequence, Any
+
+import gymnasium as gym
+import pandas as pd
+from gymnasium.core import ObsType, ActType
+
+EnvFactory = Callable[[], gym.Env]
+# a callable returning the action for an observation or a model with predict(obs) -> (action, state)
+Policy = Any
+
+
+class EpisodeResult(NamedTuple):
+    seed: Optional[int]
+    start_tick: Optional[int]
+    start_datetime: datetime
+    n_steps: int
+    total_reward: float
+    final_balance: float
+    # `history_columns` of the episode's history, datetime indexed
+    history: Optional[pd.DataFrame]
+
+
+_worker_env: Optional[gym.Env] = None
+_worker_policy: Policy = None
+
+
+def evaluate(
+        env_factory: EnvFactory,
+        policy: Policy,
+        seeds: Sequence[Optional[int]] = (None,),
+        start_ticks: Sequence[Optional[int]] = (None,),
+        history_columns: Optional[Sequence[str]] = ('wallet_balance', 'potential_profit'),
+        max_workers: Optional[int] = None,
+) -> List[EpisodeResult]:
+    """Runs an episode of `policy` for every combination of `seeds` and `start_ticks`.
+
+    Episodes are spread over a process pool, every worker calls `env_factory` once and reuses
+    the environment, so the factory and the policy have to be picklable (e.g. module level functions).
+    A start tick is passed to `reset` as options={'start_tick': tick}, which makes an `IntervalWrapper`
+    run the interval starting there, see `IntervalWrapper.test_start_ticks`; None keeps the env's interval.
+    Results follow the order of the grid, seeds vary slowest. Their histories hold `history_columns`
+    (all columns with None, no history with an empty sequence), the defaults are enough for
+    `render_profits_comparison`.
+    """
+    runs = list(itertools.product(seeds, start_ticks))
+    args = [(seed, start_tick, history_columns) for seed, start_tick in runs]
+    if len(runs) > 1 and max_workers != 1:
+        with ProcessPoolExecutor(max_workers, initializer=_init_worker, initargs=(env_factory, policy)) as executor:
+            return list(executor.map(_run_worker_episode, args))
+    env = env_factory()
+    return [run_episode(env, policy, *a) for a in args]
+
+
+def _init_worker(env_factory: EnvFactory, policy: Policy):
+    global _worker_env, _worker_policy
+    _worker_env = env_factory()
+    _worker_policy = policy
+
+
+def _run_worker_episode(args: tuple) -> EpisodeResult:
+    return run_episode(_worker_env, _worker_policy, *args)
+
+
+def _act(policy: Policy, obs: ObsType) -> ActType:
+    if hasattr(policy, 'predict'):
+        return policy.predict(obs)[0]
+    return policy(obs)
+
+
+def run_episode(
+        env: gym.Env,
+        policy: Policy,
+        seed: Optional[int] = None,
+        start_tick: Optional[int] = None,
+        history_columns: Optional[Sequence[str]] = ('wallet_balance', 'potential_profit'),
+) -> EpisodeResult:
+    options = None if start_tick is None else {'start_tick': start_tick}
+    obs, _ = env.reset(seed=seed, options=options)
+    sim_env = env.unwrapped
+    start_datetime = sim_env._start_datetime
+    n_steps = 0
+    total_reward = 0.0
+    truncated = False
+    while not truncated:
+        obs, reward, _, truncated, _ = env.step(_act(policy, obs))
+        n_steps += 1
+        total_reward += reward
+
+    history = None
+    if history_columns is None or len(history_columns):
+        df = sim_env.history.to_dataframe()
+        if history_columns is not None:
+            df = df[list(history_columns)]
+        # the frame wraps the history's columns which the next episode may overwrite
+        history = df.set_axis(df.index.copy(deep=True)).copy()
+    return EpisodeResult(
+        seed, start_tick, start_datetime, n_steps, total_reward,
+        sim_env.get_wallet_balance().value, history,
+    )
+
+
+def summarize(results: Sequence[EpisodeResult]) -> pd.DataFrame:
+    # one row per episode without the histories
+    return pd.DataFrame([r._asdict() for r in results]).drop(columns='history')
@@ -1,8 +1,10 @@
 import json
+import os
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 
 import numpy as np
+import pandas as pd
 
 from ml4trade.domain.units import MWh
 from ml4trade.domain.clock import ClockView
@@ -10,33 +12,168 @@ from ml4trade.domain.consumption import ConsumptionSystem
 from ml4trade.domain.market import EnergyMarket
 from ml4trade.domain.production import ProductionSystem
 from ml4trade.domain.prosumer import Prosumer
-from ml4trade.rendering.charts import render_all
+from ml4trade.history_sink import HistorySink
+from ml4trade.rendering.charts import render_all, render_days
+
+
+_TICK_COLUMNS = [
+    'tick', 'price', 'wallet_balance', 'rel_battery',
+    'energy_produced', 'energy_consumed',
+    'unscheduled_buy_amount', 'unscheduled_sell_amount',
+]
+_ACTION_COLUMNS = [
+    'scheduled_buy_amount', 'scheduled_sell_amount',
+    'scheduled_buy_threshold', 'scheduled_sell_threshold',
+]
+_SUMMARY_COLUMNS = ['potential_profit', 'price_diff_profit']
+_FLAG_COLUMNS = ['unscheduled_buy_success', 'unscheduled_sell_success']
+_DAY_COLUMNS = [
+    'price', 'wallet_balance', 'rel_battery', 'energy_produced', 'energy_consumed',
+    'unscheduled_buy_amount', 'unscheduled_sell_amount', *_SUMMARY_COLUMNS,
+]
+_BINARY_META = 'meta.json'
+_BINARY_VERSION = 1
+
+
+class _Row(dict):
+    # dict view of a history row, assigned values are written back to the columns
+    def __init__(self, history: 'History', idx: int, data: dict):
+        super().__init__(data)
+        self._history = history
+        self._idx = idx
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._history._set_value(self._idx, key, value)
+
+    def update(self, *args, **kwargs):
+        for k, v in dict(*args, **kwargs).items():
+            self[k] = v
 
 
 class History:
-    columns = [
-        'tick', 'datetime'
-        'energy_produced', 'energy_consumed', 'rel_battery',
-        'price', 'wallet_balance',
-        'scheduled_buy_amount', 'scheduled_sell_amount',
-        'scheduled_buy_threshold', 'scheduled_sell_threshold',
-        'unscheduled_buy_amount', 'unscheduled_sell_amount',
-        'potential_profit',
-    ]
-
-    def __init__(self, clock_view: Optional[ClockView] = None, battery_cap: MWh = MWh(2), battery_efficiency: float = 0.85):
+    # one preallocated array per column, rows not yet written hold NaN (NaT for datetime);
+    # (amount, success) tuples of unscheduled transactions are split into two columns
+    columns = ['tick', 'datetime', *_TICK_COLUMNS[1:], *_ACTION_COLUMNS, *_SUMMARY_COLUMNS, *_FLAG_COLUMNS]
+
+    def __init__(self, clock_view: Optional[ClockView] = None, battery_cap: MWh = MWh(2),
+                 battery_efficiency: float = 0.85, capacity: int = 0):
         if clock_view is not None:
             self._clock_view = clock_view
             self._tick_offset = clock_view.cur_tick()
-        self._history: List[Dict] = []
         self._battery_cap = battery_cap
         self._battery_efficiency = battery_efficiency
+        self._datetime = np.empty(capacity, dtype='datetime64[ns]')
+        self._columns: Dict[str, np.ndarray] = {
+            c: np.empty(capacity) for c in (*_TICK_COLUMNS, *_ACTION_COLUMNS, *_SUMMARY_COLUMNS)
+        }
+        self._columns.update({c: np.empty(capacity, dtype=bool) for c in _FLAG_COLUMNS})
+        self._reset_cursors()
+
+    def _reset_cursors(self):
+        self._len = 0
+        # running aggregates of the day being recorded and
+        # (potential_profit, price_diff_profit) of completed days keyed by their last row
+        self._acc_next_idx = 0
+        self._acc_hours = 0
+        self._acc_price_sum = 0
+        self._acc_energy_diff = 0
+        self._acc_night_low = float('inf')
+        self._acc_day_high = float('-inf')
+        self._day_summaries: Dict[int, Tuple[float, float]] = {}
+        # rows before `_flushed` were written to the sink, `_n_dropped` of them were also
+        # released from memory and `_tick_offset` was moved so indices stay relative to memory
+        self._sink: Optional[HistorySink] = None
+        self._max_rows_in_memory: Optional[int] = None
+        self._flushed = 0
+        self._n_dropped = 0
+
+    def clear(self, capacity: int = 0):
+        # empties the history for an episode starting at the current tick of the clock,
+        # the columns are kept and only grown when fewer than `capacity` rows fit;
+        # frames returned by to_dataframe() before are overwritten by the new episode
+        # and an attached sink is closed after the remaining rows were written to it
+        self.close_sink()
+        self._tick_offset = self._clock_view.cur_tick()
+        self._reset_cursors()
+        if capacity > len(self._datetime):
+            self._grow(capacity)
 
     def __getitem__(self, item):
-        return self._history[item]
+        if isinstance(item, slice):
+            return [self._row(i) for i in range(*item.indices(self._len))]
+        if item < 0:
+            item += self._len
+        if not 0 <= item < self._len:
+            raise IndexError('history index out of range')
+        return self._row(item)
 
     def __len__(self):
-        return len(self._history)
+        return self._len
+
+    @property
+    def _history(self) -> List[Dict]:
+        return self[:]
+
+    def _row(self, idx: int) -> _Row:
+        cols = self._columns
+        data = {}
+        ticked = not np.isnan(cols['tick'][idx])
+        if ticked:
+            data['tick'] = int(cols['tick'][idx])
+        dt = self._datetime[idx]
+        if not np.isnat(dt):
+            data['datetime'] = dt.astype('datetime64[us]').item()
+        if ticked:
+            for c in _TICK_COLUMNS[1:6]:
+                data[c] = cols[c][idx].item()
+            for kind in ('buy', 'sell'):
+                success = cols[f'unscheduled_{kind}_success'][idx].item()
+                amount = cols[f'unscheduled_{kind}_amount'][idx].item()
+                data[f'unscheduled_{kind}_amount'] = (amount, True) if success else (0, False)
+        for c in (*_ACTION_COLUMNS, *_SUMMARY_COLUMNS):
+            if not np.isnan(cols[c][idx]):
+                data[c] = cols[c][idx].item()
+        return _Row(self, idx, data)
+
+    def _set_value(self, idx: int, key: str, value):
+        if key == 'datetime':
+            self._datetime[idx] = value
+        elif key in ('unscheduled_buy_amount', 'unscheduled_sell_amount'):
+            amount, success = value
+            self._columns[key][idx] = amount
+            self._columns[key.replace('amount', 'success')][idx] = success
+        else:
+            self._columns[key][idx] = value
+
+    def _add_empty_rows(self, n: int):
+        start, end = self._len, self._len + n
+        if end > len(self._datetime):
+            self._grow(end)
+        self._datetime[start:end] = np.datetime64('NaT')
+        for c, col in self._columns.items():
+            col[start:end] = False if col.dtype == bool else np.nan
+        self._len = end
+
+    def _grow(self, min_capacity: int):
+        capacity = max(min_capacity, 2 * len(self._datetime), 64)
+        datetimes = np.empty(capacity, dtype=self._datetime.dtype)
+        datetimes[:self._len] = self._datetime[:self._len]
+        self._datetime = datetimes
+        for c, col in self._columns.items():
+            grown = np.empty(capacity, dtype=col.dtype)
+            grown[:self._len] = col[:self._len]
+            self._columns[c] = grown
+
+    def to_dataframe(self) -> pd.DataFrame:
+        # wraps the filled part of the columns without copying,
+        # the frame reflects later updates of existing rows
+        n = self._len
+        return pd.DataFrame(
+            {c: np.asarray(col[:n]) for c, col in self._columns.items()},
+            index=pd.DatetimeIndex(self._datetime[:n], name='datetime', copy=False),
+            copy=False,
+        )
 
     def _cur_tick_to_idx(self) -> int:
         return self._clock_view.cur_tick() - self._tick_offset
@@ -48,27 +185,132 @@ class History:
             production_system: ProductionSystem,
             consumption_system: ConsumptionSystem,
     ):
-        new_data = {
-            'tick': self._clock_view.cur_tick(),
-            'datetime': self._clock_view.cur_datetime(),
-            'price': market.get_buy_price().value,
-            'wallet_balance': prosumer.wallet.balance.value,
-            'rel_battery': prosumer.battery.rel_current_charge,
-            'energy_produced': production_system.ds.last_processed or 0,
-            'energy_consumed': consumption_system.ds.last_processed or 0,
-            'unscheduled_buy_amount': prosumer.last_unscheduled_buy_transaction or (0, False),
-            'unscheduled_sell_amount': prosumer.last_unscheduled_sell_transaction or (0, False),
-        }
-        cur_idx = self._cur_tick_to_idx()
-        if cur_idx >= len(self._history):
-            self._history.append(new_data)
-        else:
-            self._history[cur_idx].update(new_data)
+        unscheduled_buy = prosumer.last_unscheduled_buy_transaction or (0, False)
+        unscheduled_sell = prosumer.last_unscheduled_sell_transaction or (0, False)
+        idx = self._cur_tick_to_idx()
+        if idx >= self._len:
+            self._add_empty_rows(idx + 1 - self._len)
+        cols = self._columns
+        cur_datetime = self._clock_view.cur_datetime()
+        price = market.get_buy_price().value
+        energy_produced = production_system.last_processed or 0
+        energy_consumed = consumption_system.last_processed or 0
+        self._datetime[idx] = cur_datetime
+        cols['tick'][idx] = self._clock_view.cur_tick()
+        cols['price'][idx] = price
+        cols['wallet_balance'][idx] = prosumer.wallet.balance.value
+        cols['rel_battery'][idx] = prosumer.battery.rel_current_charge
+        cols['energy_produced'][idx] = energy_produced
+        cols['energy_consumed'][idx] = energy_consumed
+        self._accumulate(idx, cur_datetime.hour, price, energy_produced - energy_consumed)
+        cols['unscheduled_buy_amount'][idx], cols['unscheduled_buy_success'][idx] = unscheduled_buy
+        cols['unscheduled_sell_amount'][idx], cols['unscheduled_sell_success'][idx] = unscheduled_sell
         prosumer.last_unscheduled_buy_transaction = None
         prosumer.last_unscheduled_sell_transaction = None
 
-    def _add_empty_rows(self, n: int):
-        self._history.extend([{} for _ in range(n)])
+    def ticks_update(
+            self,
+            ticks: List[int],
+            datetimes: List[datetime],
+            prices: List[float],
+            wallet_balances: List[float],
+            rel_batteries: List[float],
+            energy_produced: List[float],
+            energy_consumed: List[float],
+            unscheduled_buys: List[float],
+            unscheduled_sells: List[float],
+    ):
+        # same rows as tick_update() called for each of the consecutive `ticks`
+        start = ticks[0] - self._tick_offset
+        end = start + len(ticks)
+        if end > self._len:
+            self._add_empty_rows(end - self._len)
+        cols = self._columns
+        # converting python datetimes one by one is slow, the ticks are evenly spaced
+        step = datetimes[1] - datetimes[0] if len(datetimes) > 1 else timedelta(0)
+        self._datetime[start:end] = np.datetime64(datetimes[0], 'us') + np.arange(len(datetimes)) * np.timedelta64(step)
+        cols['tick'][start:end] = ticks
+        cols['price'][start:end] = prices
+        cols['wallet_balance'][start:end] = wallet_balances
+        cols['rel_battery'][start:end] = rel_batteries
+        cols['energy_produced'][start:end] = energy_produced
+        cols['energy_consumed'][start:end] = energy_consumed
+        cols['unscheduled_buy_amount'][start:end] = unscheduled_buys
+        cols['unscheduled_sell_amount'][start:end] = unscheduled_sells
+        np.not_equal(cols['unscheduled_buy_amount'][start:end], 0, out=cols['unscheduled_buy_success'][start:end])
+        np.not_equal(cols['unscheduled_sell_amount'][start:end], 0, out=cols['unscheduled_sell_success'][start:end])
+        energy_diffs = [p - c for p, c in zip(energy_produced, energy_consumed)]
+        for i, j in self._day_segments(start, datetimes):
+            self._accumulate_segment(start + i, datetimes[i].hour, prices[i:j], energy_diffs[i:j])
+
+    def _accumulate(self, idx: int, hour: int, price: float, energy_diff: float):
+        # adds a recorded tick to the aggregates of its day, values are added in row order
+        # so the summary equals the one computed over the day's rows;
+        # rewritten rows are not counted again
+        if idx < self._acc_next_idx:
+            return
+        if idx > self._acc_next_idx:
+            # rows were skipped, the day can't be summarized
+            self._acc_hours = -24
+        self._acc_next_idx = idx + 1
+        if hour == 0:
+            self._acc_hours = 0
+            self._acc_price_sum = 0
+            self._acc_energy_diff = 0
+            self._acc_night_low = float('inf')
+            self._acc_day_high = float('-inf')
+        self._acc_hours += 1
+        self._acc_price_sum += price
+        self._acc_energy_diff += energy_diff
+        if hour < 9:
+            self._acc_night_low = min(self._acc_night_low, price)
+        else:
+            self._acc_day_high = max(self._acc_day_high, price)
+
+        if hour == 23 and self._acc_hours == 24:
+            self._finish_day(idx)
+
+    def _day_segments(self, start_idx: int, datetimes: List[datetime]):
+        # (i, j) bounds of the parts of consecutive rows starting at `start_idx` which fall
+        # into the same day, rows already accumulated are left out
+        i = max(self._acc_next_idx - start_idx, 0)
+        while i < len(datetimes):
+            j = min(len(datetimes), i + 24 - datetimes[i].hour)
+            yield i, j
+            i = j
+
+    def _accumulate_segment(self, idx: int, hour: int, prices: List[float], energy_diffs: List[float]):
+        # same as _accumulate for each of the rows of a day starting at `idx`,
+        # python sums add the values in the same order
+        if idx > self._acc_next_idx:
+            self._acc_hours = -24
+        n = len(prices)
+        self._acc_next_idx = idx + n
+        if hour == 0:
+            self._acc_hours = 0
+            self._acc_price_sum = 0
+            self._acc_energy_diff = 0
+            self._acc_night_low = float('inf')
+            self._acc_day_high = float('-inf')
+        self._acc_hours += n
+        self._acc_price_sum = sum(prices, self._acc_price_sum)
+        self._acc_energy_diff = sum(energy_diffs, self._acc_energy_diff)
+        n_night = max(9 - hour, 0)
+        if n_night:
+            self._acc_night_low = min(self._acc_night_low, *prices[:n_night])
+        if n_night < n:
+            self._acc_day_high = max(self._acc_day_high, *prices[n_night:])
+
+        if hour + n == 24 and self._acc_hours == 24:
+            self._finish_day(idx + n - 1)
+
+    def _finish_day(self, idx: int):
+        avg_price = self._acc_price_sum / 24
+        potential_profit = self._acc_energy_diff * avg_price
+        price_diff_profit = max(
+            0, (self._acc_day_high * self._battery_efficiency - self._acc_night_low) * self._battery_cap.value,
+        )
+        self._day_summaries[idx] = (potential_profit, price_diff_profit)
 
     def _has_1day_of_history(self) -> bool:
         # max span of time history goes unfilled is
@@ -77,78 +319,392 @@ class History:
         # with real values
         # rows of next 24 hours are prefilled with scheduled actions
         # 10 -> 10 -> 24 -> 24 | -> 24
-        return len(self._history) >= 96 - self._clock_view.scheduling_hour()
+        return self._len + self._n_dropped >= 96 - self._clock_view.scheduling_hour()
 
     def step_update(self, action: np.ndarray):
         cur_idx = self._cur_tick_to_idx()
         next_day_start = self._clock_view.cur_datetime().replace(hour=0) + timedelta(days=1)
-        if cur_idx >= len(self._history):
+        if cur_idx >= self._len:
             self._add_empty_rows(24 - self._clock_view.scheduling_hour())
-        actions = [{
-            'datetime': next_day_start + timedelta(hours=h),
-            'scheduled_buy_amount': action[h].item(),
-            'scheduled_sell_amount': action[24 + h].item(),
-            'scheduled_buy_threshold': action[48 + h].item(),
-            'scheduled_sell_threshold': action[72 + h].item(),
-        } for h in range(24)]
-
-        self._history.extend(actions)
+        start = self._len
+        self._add_empty_rows(24)
+        action = np.asarray(action, dtype=np.float64)
+        self._datetime[start:start + 24] = np.datetime64(next_day_start, 'ns') + np.arange(24) * np.timedelta64(1, 'h')
+        for i, c in enumerate(_ACTION_COLUMNS):
+            self._columns[c][start:start + 24] = action[24 * i:24 * (i + 1)]
 
         if self._has_1day_of_history():
             potential_profit, price_diff_profit = self._last_day_summary()
-            self._history[cur_idx - self._clock_view.cur_datetime().hour - 1].update({
-                'potential_profit': potential_profit,
-                'price_diff_profit': price_diff_profit,
+            idx = cur_idx - self._clock_view.cur_datetime().hour - 1
+            self._columns['potential_profit'][idx] = potential_profit
+            self._columns['price_diff_profit'][idx] = price_diff_profit
+
+        if self._sink is not None:
+            # rows of past days won't change anymore
+            self._flush(cur_idx - self._clock_view.cur_datetime().hour)
+
+    def attach_sink(self, sink: HistorySink, max_rows_in_memory: Optional[int] = None):
+        # completed days are passed to `sink` on every step_update, once more than
+        # `max_rows_in_memory` rows are held the oldest written ones are released;
+        # len() and indexing then only cover the rows still in memory
+        self._sink = sink
+        self._max_rows_in_memory = max_rows_in_memory
+
+    def close_sink(self):
+        # writes the remaining rows and waits for the sink to finish
+        if self._sink is None:
+            return
+        self._flush(self._len)
+        self._sink.close()
+        self._sink = None
+
+    def _flush(self, end_idx: int):
+        if end_idx > self._flushed:
+            self._sink.write({
+                'datetime': self._datetime[self._flushed:end_idx],
+                **{c: col[self._flushed:end_idx] for c, col in self._columns.items()},
             })
+            self._flushed = end_idx
+        if self._max_rows_in_memory is not None and self._len > self._max_rows_in_memory:
+            self._drop_rows(min(self._flushed, self._len - self._max_rows_in_memory))
+
+    def _drop_rows(self, n: int):
+        remaining = self._len - n
+        self._datetime[:remaining] = self._datetime[n:self._len]
+        for col in self._columns.values():
+            col[:remaining] = col[n:self._len]
+        self._len = remaining
+        self._tick_offset += n
+        self._flushed -= n
+        self._n_dropped += n
+        self._acc_next_idx -= n
+        self._day_summaries = {k - n: v for k, v in self._day_summaries.items() if k >= n}
 
     def last_day_potential_profit(self) -> float:
-        idx = self._cur_tick_to_idx() - self._clock_view.cur_datetime().hour - 1
-        history_entry = None if idx < 0 else self._history[idx].get('potential_profit')
-        return history_entry or self._last_day_summary()[0]
+        return self._last_day_summary()[0]
 
     def last_day_price_diff_profit(self) -> float:
-        idx = self._cur_tick_to_idx() - self._clock_view.cur_datetime().hour - 1
-        history_entry = None if idx < 0 else self._history[idx].get('price_diff_profit')
-        return history_entry or self._last_day_summary()[1]
+        return self._last_day_summary()[1]
 
     def _last_day_summary(self) -> (float, float):
         if not self._has_1day_of_history():
             return 0, 0
 
         end_idx = self._cur_tick_to_idx() - self._clock_view.cur_datetime().hour
-        start_idx = end_idx - 24 or None
-        last_day_history = self._history[start_idx:end_idx]
+        summary = self._day_summaries.get(end_idx - 1)
+        if summary is None:
+            # the day wasn't recorded tick by tick, e.g. rows were assigned directly
+            return self._summarize_rows(end_idx - 24 or None, end_idx)
+        return summary
+
+    def _summarize_rows(self, start_idx: Optional[int], end_idx: int) -> (float, float):
+        # python sums keep the summation order of _accumulate
+        prices = self._columns['price'][start_idx:end_idx]
+        energy_produced = self._columns['energy_produced'][start_idx:end_idx]
+        energy_consumed = self._columns['energy_consumed'][start_idx:end_idx]
 
-        avg_price = sum(r['price'] for r in last_day_history) / 24
-        extra_produced = sum(r['energy_produced'] - r['energy_consumed'] for r in last_day_history)
+        avg_price = sum(prices.tolist()) / 24
+        extra_produced = sum((energy_produced - energy_consumed).tolist())
         potential_profit = extra_produced * avg_price
 
-        night_low = min(r['price'] for r in last_day_history[:9])
-        day_high = max(r['price'] for r in last_day_history[9:])
+        night_low = prices[:9].min().item()
+        day_high = prices[9:].max().item()
         price_diff_profit = max(0, (day_high * self._battery_efficiency - night_low) * self._battery_cap.value)
 
         return potential_profit, price_diff_profit
 
     def render(self, last_n_days: int = 2, n_days_offset: int = 0, save_path=None):
-        render_all(self._history, last_n_days, n_days_offset, save_path)
+        render_all(self.to_dataframe(), last_n_days, n_days_offset, save_path)
 
     def save(self, path: str = 'env_history.json'):
         with open(path, 'w') as f:
             json.dump(self._history, f, indent=2, default=str)
 
+    def save_binary(self, path: str = 'env_history'):
+        # a directory with one .npy file per column, see load()
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, 'datetime.npy'), self._datetime[:self._len])
+        for c, col in self._columns.items():
+            np.save(os.path.join(path, f'{c}.npy'), col[:self._len])
+        with open(os.path.join(path, _BINARY_META), 'w') as f:
+            json.dump({
+                'version': _BINARY_VERSION,
+                'rows': self._len,
+                'battery_cap': self._battery_cap.value,
+                'battery_efficiency': self._battery_efficiency,
+            }, f)
+
     @classmethod
     def load(cls, path: str, clock_view: Optional[ClockView] = None) -> 'History':
+        # directories written by save_binary() are memory-mapped, columns are only read
+        # from disk when touched and modifications are kept in memory;
+        # other paths are read as json written by save()
+        if os.path.isdir(path):
+            return cls._load_binary(path, clock_view)
         with open(path, 'r') as f:
             history = json.load(f)
+        return cls._from_rows(history, clock_view)
 
-        for r in history:
-            r['datetime'] = datetime.fromisoformat(r['datetime'])
+    @classmethod
+    def _load_binary(cls, path: str, clock_view: Optional[ClockView]) -> 'History':
+        with open(os.path.join(path, _BINARY_META), 'r') as f:
+            meta = json.load(f)
+        assert meta['version'] == _BINARY_VERSION, f'Unsupported history format version {meta["version"]}'
+        if meta.get('level') == 'daily':
+            return DailyHistory._load_days(path, meta, clock_view)
+        obj = cls(clock_view, MWh(meta['battery_cap']), meta['battery_efficiency'])
+        obj._len = meta['rows']
+        obj._datetime = np.load(os.path.join(path, 'datetime.npy'), mmap_mode='c')
+        for c in obj._columns:
+            obj._columns[c] = np.load(os.path.join(path, f'{c}.npy'), mmap_mode='c')
+        return obj
+
+    @classmethod
+    def _from_rows(cls, rows: List[Dict], clock_view: Optional[ClockView] = None) -> 'History':
+        df = pd.DataFrame(rows)
+        obj = cls(clock_view, capacity=len(df))
+        obj._add_empty_rows(len(df))
+        if 'datetime' in df:
+            obj._datetime[:] = pd.to_datetime(df['datetime']).to_numpy('datetime64[ns]')
+        for c in df.columns:
+            if c in ('unscheduled_buy_amount', 'unscheduled_sell_amount'):
+                pairs = df[c].dropna()
+                obj._columns[c][pairs.index] = [float(p[0]) for p in pairs]
+                obj._columns[c.replace('amount', 'success')][pairs.index] = [bool(p[1]) for p in pairs]
+            elif c in obj._columns:
+                # to_numeric also fixes past results generated by bugged code which stored strings
+                obj._columns[c][:] = pd.to_numeric(df[c]).to_numpy(np.float64, na_value=np.nan)
+        return obj
 
-            # fixes past results generated by bugged code
-            for k in r:
-                if isinstance(r[k], str):
-                    r[k] = float(r[k])
 
-        obj = cls(clock_view)
-        obj._history = history
+class DailyHistory(History):
+    # history_level='daily' of SimulationEnv: ticks are only accumulated and one row is kept per
+    # completed day with the average price, balance and battery charge at the end of the day,
+    # summed energy and unscheduled amounts and the day summary;
+    # with keep_days=False (history_level='off') only the summaries needed by the reward are kept;
+    # sinks, save_binary and render get the day rows
+    columns = ['datetime', *_DAY_COLUMNS]
+
+    def __init__(self, clock_view: Optional[ClockView] = None, battery_cap: MWh = MWh(2),
+                 battery_efficiency: float = 0.85, capacity: int = 0, keep_days: bool = True):
+        super().__init__(clock_view, battery_cap, battery_efficiency)
+        self._keep_days = keep_days
+        n_days = self._days_capacity(capacity)
+        self._day_datetime = np.empty(n_days, dtype='datetime64[ns]')
+        self._day_columns: Dict[str, np.ndarray] = {c: np.empty(n_days) for c in _DAY_COLUMNS}
+
+    def _days_capacity(self, capacity: int) -> int:
+        return capacity // 24 + 1 if self._keep_days else 0
+
+    def _reset_cursors(self):
+        super()._reset_cursors()
+        self._n_days = 0
+        self._acc_produced = 0
+        self._acc_consumed = 0
+        self._acc_unscheduled_buy = 0
+        self._acc_unscheduled_sell = 0
+
+    def clear(self, capacity: int = 0):
+        # tick rows aren't stored, only the day rows are grown
+        super().clear()
+        n_days = self._days_capacity(capacity)
+        if n_days > len(self._day_datetime):
+            self._grow_days(n_days)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self._day_row(i) for i in range(*item.indices(self._n_days))]
+        if item < 0:
+            item += self._n_days
+        if not 0 <= item < self._n_days:
+            raise IndexError('history index out of range')
+        return self._day_row(item)
+
+    def __len__(self):
+        return self._n_days
+
+    def _day_row(self, idx: int) -> Dict:
+        return {
+            'datetime': self._day_datetime[idx].astype('datetime64[us]').item(),
+            **{c: col[idx].item() for c, col in self._day_columns.items()},
+        }
+
+    def to_dataframe(self) -> pd.DataFrame:
+        n = self._n_days
+        return pd.DataFrame(
+            {c: col[:n] for c, col in self._day_columns.items()},
+            index=pd.DatetimeIndex(self._day_datetime[:n], name='datetime', copy=False),
+            copy=False,
+        )
+
+    def _add_empty_rows(self, n: int):
+        # tick rows aren't stored, they are counted for _has_1day_of_history
+        self._len += n
+
+    def tick_update(
+            self,
+            prosumer: Prosumer,
+            market: EnergyMarket,
+            production_system: ProductionSystem,
+            consumption_system: ConsumptionSystem,
+    ):
+        unscheduled_buy = prosumer.last_unscheduled_buy_transaction or (0, False)
+        unscheduled_sell = prosumer.last_unscheduled_sell_transaction or (0, False)
+        prosumer.last_unscheduled_buy_transaction = None
+        prosumer.last_unscheduled_sell_transaction = None
+        idx = self._cur_tick_to_idx()
+        self._len = max(self._len, idx + 1)
+        if idx < self._acc_next_idx:
+            return
+        cur_datetime = self._clock_view.cur_datetime()
+        energy_produced = production_system.last_processed or 0
+        energy_consumed = consumption_system.last_processed or 0
+        self._accumulate(idx, cur_datetime.hour, market.get_buy_price().value, energy_produced - energy_consumed)
+        if self._keep_days:
+            self._accumulate_day(
+                idx, cur_datetime, prosumer.wallet.balance.value, prosumer.battery.rel_current_charge,
+                [energy_produced], [energy_consumed], [unscheduled_buy[0]], [unscheduled_sell[0]],
+            )
+
+    def ticks_update(
+            self,
+            ticks: List[int],
+            datetimes: List[datetime],
+            prices: List[float],
+            wallet_balances: List[float],
+            rel_batteries: List[float],
+            energy_produced: List[float],
+            energy_consumed: List[float],
+            unscheduled_buys: List[float],
+            unscheduled_sells: List[float],
+    ):
+        start = ticks[0] - self._tick_offset
+        self._len = max(self._len, start + len(ticks))
+        energy_diffs = [p - c for p, c in zip(energy_produced, energy_consumed)]
+        for i, j in self._day_segments(start, datetimes):
+            self._accumulate_segment(start + i, datetimes[i].hour, prices[i:j], energy_diffs[i:j])
+            if self._keep_days:
+                self._accumulate_day(
+                    start + j - 1, datetimes[j - 1], wallet_balances[j - 1], rel_batteries[j - 1],
+                    energy_produced[i:j], energy_consumed[i:j], unscheduled_buys[i:j], unscheduled_sells[i:j],
+                )
+
+    def _accumulate_day(self, idx: int, cur_datetime: datetime, wallet_balance: float, rel_battery: float,
+                        energy_produced: List[float], energy_consumed: List[float],
+                        unscheduled_buys: List[float], unscheduled_sells: List[float]):
+        # adds the rows of a day ending with row `idx` to the day row,
+        # which is stored once _accumulate summarized the day
+        if cur_datetime.hour + 1 == len(energy_produced):
+            self._acc_produced = 0
+            self._acc_consumed = 0
+            self._acc_unscheduled_buy = 0
+            self._acc_unscheduled_sell = 0
+        self._acc_produced = sum(energy_produced, self._acc_produced)
+        self._acc_consumed = sum(energy_consumed, self._acc_consumed)
+        self._acc_unscheduled_buy = sum(unscheduled_buys, self._acc_unscheduled_buy)
+        self._acc_unscheduled_sell = sum(unscheduled_sells, self._acc_unscheduled_sell)
+        summary = self._day_summaries.get(idx) if cur_datetime.hour == 23 else None
+        if summary is None:
+            return
+
+        n = self._n_days
+        if n == len(self._day_datetime):
+            self._grow_days(n + 1)
+        self._day_datetime[n] = cur_datetime.replace(hour=0)
+        cols = self._day_columns
+        cols['price'][n] = self._acc_price_sum / 24
+        cols['wallet_balance'][n] = wallet_balance
+        cols['rel_battery'][n] = rel_battery
+        cols['energy_produced'][n] = self._acc_produced
+        cols['energy_consumed'][n] = self._acc_consumed
+        cols['unscheduled_buy_amount'][n] = self._acc_unscheduled_buy
+        cols['unscheduled_sell_amount'][n] = self._acc_unscheduled_sell
+        cols['potential_profit'][n], cols['price_diff_profit'][n] = summary
+        self._n_days = n + 1
+
+    def _finish_day(self, idx: int):
+        if not self._keep_days:
+            # the reward only looks at the day which has just ended
+            self._day_summaries.clear()
+        super()._finish_day(idx)
+
+    def _grow_days(self, min_capacity: int):
+        capacity = max(min_capacity, 2 * len(self._day_datetime), 8)
+        n = self._n_days
+        datetimes = np.empty(capacity, dtype=self._day_datetime.dtype)
+        datetimes[:n] = self._day_datetime[:n]
+        self._day_datetime = datetimes
+        for c, col in self._day_columns.items():
+            grown = np.empty(capacity)
+            grown[:n] = col[:n]
+            self._day_columns[c] = grown
+
+    def step_update(self, action: np.ndarray):
+        # the summaries were accumulated with the ticks, only the rows of the next day are counted
+        if self._cur_tick_to_idx() >= self._len:
+            self._len += 24 - self._clock_view.scheduling_hour()
+        self._len += 24
+        if self._sink is not None:
+            self._flush(self._len)
+
+    def _summarize_rows(self, start_idx: Optional[int], end_idx: int) -> (float, float):
+        # ticks aren't stored, a day which wasn't accumulated completely has no summary
+        return 0, 0
+
+    def _flush(self, end_idx: int):
+        # day rows are only stored once complete, so all of them are written
+        n = self._n_days
+        if n > self._flushed:
+            self._sink.write({
+                'datetime': self._day_datetime[self._flushed:n],
+                **{c: col[self._flushed:n] for c, col in self._day_columns.items()},
+            })
+            self._flushed = n
+        if self._max_rows_in_memory is not None and n > self._max_rows_in_memory:
+            self._drop_days(n - self._max_rows_in_memory)
+
+    def _drop_days(self, n: int):
+        remaining = self._n_days - n
+        self._day_datetime[:remaining] = self._day_datetime[n:self._n_days]
+        for col in self._day_columns.values():
+            col[:remaining] = col[n:self._n_days]
+        self._n_days = remaining
+        self._flushed -= n
+
+    def render(self, last_n_days: int = 2, n_days_offset: int = 0, save_path=None):
+        if not self._n_days:
+            raise ValueError('No day rows to render, history_level="off" keeps none')
+        render_days(self.to_dataframe(), last_n_days, n_days_offset, save_path)
+
+    def save_binary(self, path: str = 'env_history'):
+        # the day rows in the layout of History.save_binary, load() returns a DailyHistory
+        n = self._n_days
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, 'datetime.npy'), self._day_datetime[:n])
+        for c, col in self._day_columns.items():
+            np.save(os.path.join(path, f'{c}.npy'), col[:n])
+        with open(os.path.join(path, _BINARY_META), 'w') as f:
+            json.dump({
+                'version': _BINARY_VERSION,
+                'level': 'daily',
+                'rows': n,
+                'battery_cap': self._battery_cap.value,
+                'battery_efficiency': self._battery_efficiency,
+            }, f)
+
+    @classmethod
+    def _load_days(cls, path: str, meta: dict, clock_view: Optional[ClockView]) -> 'DailyHistory':
+        obj = cls(clock_view, MWh(meta['battery_cap']), meta['battery_efficiency'])
+        obj._n_days = meta['rows']
+        obj._day_datetime = np.load(os.path.join(path, 'datetime.npy'), mmap_mode='c')
+        for c in obj._day_columns:
+            obj._day_columns[c] = np.load(os.path.join(path, f'{c}.npy'), mmap_mode='c')
         return obj
+
+
+def convert_json_history(json_path: str, out_path: Optional[str] = None) -> str:
+    # migrates a history saved as json to the binary format next to it
+    if out_path is None:
+        out_path = os.path.splitext(json_path)[0]
+    History.load(json_path).save_binary(out_path)
+    return out_path
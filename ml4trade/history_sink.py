@@ -0,0 +1,148 @@
+import glob
+import os
+import queue
+import threading
+from typing import Dict, List, Optional, Iterator
+
+import numpy as np
+import pandas as pd
+from typing_extensions import Literal
+
+
+_FORMATS = ('npz', 'parquet')
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError('parquet chunks require pyarrow, install it or use the npz format') from e
+    return pyarrow, pyarrow.parquet
+
+
+class HistorySink:
+    """Writes History rows to compressed columnar chunk files from a background thread.
+
+    Rows passed to `write` are buffered until `chunk_rows` of them are collected and then
+    handed over to the writer thread, so callers only wait for disk when `max_pending_chunks`
+    chunks are already queued. Use `HistoryChunks` to read the chunks back.
+    """
+
+    def __init__(self, path: str, fmt: Literal['npz', 'parquet'] = 'npz',
+                 chunk_rows: int = 24 * 30, max_pending_chunks: int = 4):
+        assert fmt in _FORMATS, f'Unknown format {fmt}, use one of {_FORMATS}'
+        if fmt == 'parquet':
+            _require_pyarrow()
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.fmt = fmt
+        self.chunk_rows = chunk_rows
+        self._buffer: List[Dict[str, np.ndarray]] = []
+        self._buffered_rows = 0
+        self._n_chunks = len(HistoryChunks(path))
+        self._error: Optional[BaseException] = None
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending_chunks)
+        self._thread = threading.Thread(target=self._writer, daemon=True)
+        self._thread.start()
+
+    def write(self, columns: Dict[str, np.ndarray]):
+        # columns are copied, the caller may reuse its arrays
+        self._raise_writer_error()
+        self._buffer.append({c: np.array(v) for c, v in columns.items()})
+        self._buffered_rows += len(next(iter(columns.values())))
+        if self._buffered_rows >= self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        if not self._buffered_rows:
+            return
+        chunk = {c: np.concatenate([b[c] for b in self._buffer]) for c in self._buffer[0]}
+        self._buffer, self._buffered_rows = [], 0
+        self._queue.put((self._chunk_path(self._n_chunks), chunk))
+        self._n_chunks += 1
+
+    def close(self):
+        if self._thread.is_alive():
+            self.flush()
+            self._queue.put(None)
+            self._thread.join()
+        self._raise_writer_error()
+
+    def __enter__(self) -> 'HistorySink':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _chunk_path(self, idx: int) -> str:
+        return os.path.join(self.path, f'chunk_{idx:06d}.{self.fmt}')
+
+    def _raise_writer_error(self):
+        if self._error is not None:
+            raise RuntimeError('History sink failed to write a chunk') from self._error
+
+    def _writer(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if self._error is not None:
+                continue
+            path, chunk = item
+            try:
+                _write_chunk(path, chunk, self.fmt)
+            except BaseException as e:
+                self._error = e
+
+
+def _write_chunk(path: str, chunk: Dict[str, np.ndarray], fmt: str):
+    # written under a temporary name so readers never see partial chunks
+    tmp_path = f'{path}.tmp'
+    if fmt == 'npz':
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(f, **chunk)
+    else:
+        pa, pq = _require_pyarrow()
+        pq.write_table(pa.table(chunk), tmp_path, compression='zstd')
+    os.replace(tmp_path, path)
+
+
+class HistoryChunks:
+    """Lazy view of the chunks written by a HistorySink, a chunk is only read when accessed."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.paths = sorted(
+            p for fmt in _FORMATS for p in glob.glob(os.path.join(path, f'chunk_*.{fmt}'))
+        )
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def __getitem__(self, idx: int) -> pd.DataFrame:
+        return self.read_chunk(idx)
+
+    def __iter__(self) -> Iterator[pd.DataFrame]:
+        for i in range(len(self)):
+            yield self.read_chunk(i)
+
+    def read_chunk(self, idx: int, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        # same layout as History.to_dataframe(), `columns` limits what is decoded
+        path = self.paths[idx]
+        wanted = None if columns is None else ['datetime', *columns]
+        if path.endswith('.npz'):
+            with np.load(path) as f:
+                data = {c: f[c] for c in (wanted or f.files)}
+        else:
+            _, pq = _require_pyarrow()
+            table = pq.read_table(path, columns=wanted)
+            data = {c: table.column(c).to_numpy() for c in table.column_names}
+        datetimes = data.pop('datetime')
+        return pd.DataFrame(data, index=pd.DatetimeIndex(datetimes, name='datetime'))
+
+    def read(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        frames = [self.read_chunk(i, columns) for i in range(len(self))]
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames)
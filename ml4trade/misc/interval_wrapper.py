@@ -1,6 +1,7 @@
 from datetime import timedelta, datetime
-from typing import Tuple, Generator, Union
+from typing import Tuple, Union, List
 
+import numpy as np
 from gymnasium.core import Wrapper, ObsType
 from gymnasium.utils import seeding
 
@@ -28,10 +29,20 @@ class IntervalWrapper(Wrapper):
         self.train_data_duration = data_duration * split_ratio
         self.test_data_start = self.start_datetime + self.train_data_duration
         self.test_data_start_tick = self.start_tick + timedelta_to_hours(self.train_data_duration)
-        self._ep_interval_ticks_generator = self.__ep_interval_ticks_generator()
 
         assert self._is_interval_allowed(interval), \
             f'Max allowed interval is {self.train_data_duration.days} days'
+        self._set_start_ticks()
+
+    def _set_start_ticks(self):
+        # every episode of a shuffle cycle starts at one of `_start_ticks`,
+        # `_cycle` holds them in the order of the current cycle and `_cycle_pos` is the next one
+        self._start_ticks = np.arange(
+            self.start_tick, self.test_data_start_tick - self.interval_in_ticks + 1, self.interval_in_ticks,
+        )
+        assert len(self._start_ticks) > 0
+        self._cycle = self._start_ticks
+        self._cycle_pos = len(self._cycle)
 
     def _is_interval_allowed(self, interval: timedelta) -> bool:
         return self.train_data_duration >= interval
@@ -40,10 +51,13 @@ class IntervalWrapper(Wrapper):
         seed = kwargs.get('seed')
         if seed is not None:
             self.np_random, seed = seeding.np_random(seed)
-            self._ep_interval_ticks_generator = self.__ep_interval_ticks_generator()
+            self._cycle_pos = len(self._cycle)
 
-        if self.train_mode:
-            start_tick = next(self._ep_interval_ticks_generator)
+        # options={'start_tick': tick} runs the interval starting at `tick`, see test_start_ticks()
+        start_tick = (kwargs.get('options') or {}).get('start_tick')
+        if start_tick is None and self.train_mode:
+            start_tick = self._next_start_tick()
+        if start_tick is not None:
             start_datetime, end_datetime = self._ep_interval_from_start_tick(start_tick)
             self.env._start_datetime = start_datetime
             self.env._end_datetime = end_datetime
@@ -66,17 +80,22 @@ class IntervalWrapper(Wrapper):
             **kwargs
         )
 
-    def __ep_interval_ticks_generator(self) -> Generator[int, None, None]:
-        while True:
-            ep_intervals_start_ticks = [start for start in range(
-                self.start_tick, self.test_data_start_tick - self.interval_in_ticks + 1,
-                self.interval_in_ticks
-            )]
-            self.interval_start_ticks = ep_intervals_start_ticks
-            assert len(ep_intervals_start_ticks) > 0
-            self.np_random.shuffle(ep_intervals_start_ticks)
-            for i in ep_intervals_start_ticks:
-                yield i
+    def _next_start_tick(self) -> int:
+        if self._cycle_pos == len(self._cycle):
+            self._cycle = self._start_ticks.copy()
+            self.np_random.shuffle(self._cycle)
+            self.interval_start_ticks = self._cycle.tolist()
+            self._cycle_pos = 0
+        start_tick = int(self._cycle[self._cycle_pos])
+        self._cycle_pos += 1
+        return start_tick
+
+    def test_start_ticks(self) -> List[int]:
+        # starts of the consecutive intervals of the test data,
+        # at the same hour as the training intervals
+        end_tick = self.start_tick + timedelta_to_hours(self.end_datetime - self.start_datetime)
+        first_tick = self.start_tick + -(-(self.test_data_start_tick - self.start_tick) // 24) * 24
+        return list(range(first_tick, end_tick - self.interval_in_ticks + 1, self.interval_in_ticks))
 
     def _ep_interval_from_start_tick(self, tick: int) -> Tuple[datetime, datetime]:
         start_datetime = self.start_datetime + timedelta(hours=tick - self.start_tick)
@@ -89,4 +108,4 @@ class IntervalWrapper(Wrapper):
 
         self.interval = new_interval
         self.interval_in_ticks = timedelta_to_hours(new_interval)
-        self._ep_interval_ticks_generator = self.__ep_interval_ticks_generator()
+        self._set_start_ticks()
@@ -6,6 +6,7 @@ from gymnasium.core import Wrapper, ActionWrapper as _ActionWrapper
 import pandas as pd
 import numpy as np
 
+from ml4trade.rolling_features import RollingFeatures
 from ml4trade.simulation_env import SimulationEnv
 
 
@@ -53,9 +54,12 @@ class AvgIntervalPriceRetriever:
         self._avg_prices = np.array(list(_avg_day_prices.values()))
         self._default_avg_price = np.average(self._avg_prices[0:interval_days])
         self._start_date = datetime(*self._dates[0])
+        # rolling statistics of the average day prices, e.g. their std over the last week
+        self.features = RollingFeatures(self._avg_prices)
 
     def get_prev_interval_avg_price(self, _datetime: datetime):
         cur_idx = (_datetime - self._start_date).days
         if cur_idx - self._interval_days <= 0:
             return self._default_avg_price
+        # numpy's pairwise sum of the slice, the interval may reach past the last day of the data
         return np.average(self._avg_prices[cur_idx - self._interval_days:cur_idx])
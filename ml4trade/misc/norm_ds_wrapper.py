@@ -1,4 +1,7 @@
-from typing import List, Union
+from typing import List, Union, Optional, Tuple, Dict
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
 from ml4trade.data_strategies import (
     DataStrategy,
@@ -6,26 +9,90 @@ from ml4trade.data_strategies import (
     ImgwWindDataStrategy,
     ImgwSolarDataStrategy,
     PricesPlDataStrategy,
-    update_last_processed,
 )
+from ml4trade.domain.randomness import RandomStream
+from ml4trade.rolling_features import RollingFeatures
+from ml4trade.shared_array import SharedArray, share_array, pickled_array, unpickled_array
 
 
 class DataStrategyWrapper:
+    # `_derived_attrs` are computed from `ds` by _build(), they are rebuilt instead of pickled;
+    # after share() the `_shared_attrs` among them (arrays or objects with share()) are mapped
+    # by pickled copies instead, which only rebuild the views of them in _build_views()
+    _derived_attrs: Tuple[str, ...] = ()
+    _shared_attrs: Tuple[str, ...] = ()
+
     def __init__(self, ds: DataStrategy):
         super().__init__()
         self.ds = ds
-
-    @update_last_processed
-    def process(self, idx: int) -> float:
-        return self.ds.process(idx)
+        self._shared_derived: Dict[str, SharedArray] = {}
+        self._derived_shared = False
+        self._build()
+
+    def _build(self):
+        pass
+
+    def _build_views(self):
+        pass
+
+    def share(self):
+        # see DataStrategy.share
+        self.ds.share()
+        for attr in self._shared_attrs:
+            value = getattr(self, attr)
+            if isinstance(value, np.ndarray):
+                setattr(self, attr, share_array(self._shared_derived, attr, value))
+            else:
+                value.share()
+        self._build_views()
+        self._derived_shared = True
+
+    def close(self):
+        self.ds.close()
+        for attr in self._shared_attrs:
+            value = getattr(self, attr)
+            if not isinstance(value, np.ndarray):
+                value.close()
+        for shared in self._shared_derived.values():
+            shared.close()
+        self._shared_derived = {}
+        self._derived_shared = False
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        for attr in self._derived_attrs:
+            value = state.pop(attr, None)
+            if self._derived_shared and attr in self._shared_attrs:
+                state[attr] = pickled_array(self._shared_derived, attr, value)
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        if self._derived_shared:
+            for attr in self._shared_attrs:
+                setattr(self, attr, unpickled_array(state[attr]))
+            self._build_views()
+        else:
+            self._build()
+
+    def process(self, idx: int, stream: Optional[RandomStream] = None) -> float:
+        if stream is None:
+            return self.ds.process(idx)
+        return self.ds.process(idx, stream)
 
     def observation(self, idx: int) -> List[float]:
         return self.ds.observation(idx)
 
+    def observation_into(self, out: np.ndarray, idx: int):
+        out[:] = self.observation(idx)
+
     def observation_size(self) -> int:
         return self.ds.observation_size()
 
     def __getattr__(self, item):
+        # `ds` is not set yet while unpickling
+        if item == 'ds':
+            raise AttributeError(item)
         return getattr(self.ds, item)
 
 
@@ -36,44 +103,86 @@ class DummyWrapper(DataStrategyWrapper):
     def observation(self, idx: int) -> List[float]:
         return []
 
+    def observation_into(self, out: np.ndarray, idx: int):
+        pass
+
     def observation_size(self) -> int:
         return 0
 
 
 class MarketWrapper(DataStrategyWrapper):
+    # observations are rows of `_scaled_windows`, every window of the prices min-max scaled
+    _derived_attrs = ('features', '_scaled_windows')
+    _shared_attrs = ('features', '_scaled_windows')
+
     def __init__(self, ds: PricesPlDataStrategy):
         super().__init__(ds)
-        self.col_mean = ds.df.iloc[:, ds.col_idx].mean()
-        self.col_std = ds.df.iloc[:, ds.col_idx].std()
-
-    @staticmethod
-    def _minmax_scale(obs: list):
-        min_val = min(obs)
-        max_val = max(obs)
-        return list(map(lambda x: (x - min_val) / (max_val - min_val), obs))
 
-    def observation(self, idx: int) -> List[float]:
-        obs = self.ds.observation(idx)
-        # return list(map(lambda x: (x - self.col_mean) / self.col_std, obs))
-        return self._minmax_scale(obs)
+    def _build(self):
+        col = self.ds.col.astype(np.float64)
+        self.col_mean = np.nanmean(col)
+        self.col_std = np.nanstd(col, ddof=1)
+        self.features = RollingFeatures(col)
+        windows = sliding_window_view(col, self.ds.window_size)
+        window_min = self.features.rolling_min(self.ds.window_size)[:, None]
+        window_max = self.features.rolling_max(self.ds.window_size)[:, None]
+        # windows of constant prices have no range to scale by, they are observed as zeros
+        window_range = window_max - window_min
+        self._scaled_windows = np.divide(
+            windows - window_min, window_range,
+            out=np.zeros(windows.shape), where=window_range != 0,
+        )
+        self._scaled_windows.flags.writeable = False
+
+    def observation(self, idx: int) -> np.ndarray:
+        return self._scaled_windows[self.ds.window_start(idx)]
+
+    def observation_into(self, out: np.ndarray, idx: int):
+        out[:] = self._scaled_windows[self.ds.window_start(idx)]
 
 
 class ConsumptionWrapper(DataStrategyWrapper):
+    # observations only depend on the hour, they are computed for each of them
+    _derived_attrs = ('_hour_observations',)
+
     def __init__(self, ds: HouseholdEnergyConsumptionDataStrategy):
         super().__init__(ds)
 
-    def observation(self, idx: int) -> List[float]:
-        obs = self.ds.observation(idx)
-        return list(map(lambda x: x * 1000, obs))
+    def _build(self):
+        self._hour_observations = []
+        for hour in range(24):
+            obs = np.array(self.ds.observation(hour), dtype=np.float64) * 1000
+            obs.flags.writeable = False
+            self._hour_observations.append(obs)
+
+    def observation(self, idx: int) -> np.ndarray:
+        return self._hour_observations[idx % 24]
+
+    def observation_into(self, out: np.ndarray, idx: int):
+        out[:] = self._hour_observations[idx % 24]
 
 
 class WeatherWrapper(DataStrategyWrapper):
+    # observations are windows of the standardized column
+    _derived_attrs = ('_standardized', '_standardized_windows')
+    _shared_attrs = ('_standardized',)
+
     def __init__(self, ds: Union[ImgwSolarDataStrategy, ImgwWindDataStrategy]):
         super().__init__(ds)
-        self.col_mean = ds.df.iloc[:, ds.col_idx].mean()
-        self.col_std = ds.df.iloc[:, ds.col_idx].std()
 
-    def observation(self, idx: int) -> List[float]:
-        obs = self.ds.observation(idx)
-        obs = list(map(lambda x: (x - self.col_mean) / self.col_std, obs))
-        return obs
+    def _build(self):
+        col = self.ds.col.astype(np.float64)
+        self.col_mean = np.nanmean(col)
+        self.col_std = np.nanstd(col, ddof=1)
+        self._standardized = (col - self.col_mean) / self.col_std
+        self._standardized.flags.writeable = False
+        self._build_views()
+
+    def _build_views(self):
+        self._standardized_windows = sliding_window_view(self._standardized, self.ds.window_size)
+
+    def observation(self, idx: int) -> np.ndarray:
+        return self._standardized_windows[self.ds.window_start(idx)]
+
+    def observation_into(self, out: np.ndarray, idx: int):
+        out[:] = self._standardized_windows[self.ds.window_start(idx)]
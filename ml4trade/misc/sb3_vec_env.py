@@ -0,0 +1,96 @@
+from typing import List, Optional, Any, Type, Sequence
+
+import numpy as np
+import gymnasium as gym
+from stable_baselines3.common.vec_env import VecEnv
+from stable_baselines3.common.vec_env.base_vec_env import VecEnvIndices, VecEnvStepReturn, VecEnvObs
+
+from ml4trade.vector_env import VectorSimulationEnv, spawn_seeds
+
+
+# not imported in ml4trade.misc since stable_baselines3 is an optional dependency
+class SB3VecEnvAdapter(VecEnv):
+    """Exposes VectorSimulationEnv through stable_baselines3's VecEnv interface."""
+
+    def __init__(self, env: VectorSimulationEnv):
+        self.env = env
+        self._seed: Optional[int] = None
+        self._actions: Optional[np.ndarray] = None
+        super().__init__(env.num_envs, env.single_observation_space, env.single_action_space)
+
+    def reset(self) -> VecEnvObs:
+        # sub-envs are reset together, so they take the same options
+        options = self._options[0]
+        if any(o != options for o in self._options):
+            raise ValueError('VectorSimulationEnv resets all sub-envs with the same options')
+        obs, _ = self.env.reset(seed=self._seed, options=options or None)
+        self._seed = None
+        self._reset_options()
+        return obs
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self._actions = actions
+
+    def step_wait(self) -> VecEnvStepReturn:
+        obs, rewards, terminateds, truncateds, infos = self.env.step(self._actions)
+        dones = terminateds | truncateds
+        list_infos = [{} for _ in range(self.num_envs)]
+        for i in np.flatnonzero(dones):
+            list_infos[i]['terminal_observation'] = infos['final_observation'][i]
+            list_infos[i]['TimeLimit.truncated'] = bool(truncateds[i] and not terminateds[i])
+        return obs, rewards.astype(np.float32), dones, list_infos
+
+    def seed(self, seed: Optional[int] = None) -> Sequence[Optional[int]]:
+        self._seed = seed
+        if seed is None:
+            return [None] * self.num_envs
+        return spawn_seeds(seed, self.num_envs)
+
+    def close(self) -> None:
+        self.env.close()
+
+    # Sub-envs live in arrays of VectorSimulationEnv with one entry per sub-env. Values of that shape
+    # are split between the sub-envs, other values are shared by all of them. Shared values can only
+    # be set and methods can only be called for all sub-envs at once since they are stepped together.
+
+    def get_attr(self, attr_name: str, indices: VecEnvIndices = None) -> List[Any]:
+        if attr_name in ('observation_space', 'action_space'):
+            attr_name = f'single_{attr_name}'
+        value = getattr(self.env, attr_name)
+        return [self._sub_env_value(value, i) for i in self._get_indices(indices)]
+
+    def set_attr(self, attr_name: str, value: Any, indices: VecEnvIndices = None) -> None:
+        indices = list(self._get_indices(indices))
+        current = getattr(self.env, attr_name, None)
+        if self._is_per_env(current):
+            # arrays of sub-envs' state may be shared between attributes, so they are replaced
+            current = current.copy()
+            current[indices] = value
+            setattr(self.env, attr_name, current)
+        else:
+            self._check_all_envs(indices, f'set {attr_name} of')
+            setattr(self.env, attr_name, value)
+
+    def env_method(self, method_name: str, *method_args, indices: VecEnvIndices = None, **method_kwargs) -> List[Any]:
+        indices = list(self._get_indices(indices))
+        self._check_all_envs(indices, f'call {method_name} on')
+        result = getattr(self.env, method_name)(*method_args, **method_kwargs)
+        return [self._sub_env_value(result, i) for i in indices]
+
+    def _is_per_env(self, value: Any) -> bool:
+        return isinstance(value, np.ndarray) and value.ndim > 0 and len(value) == self.num_envs
+
+    def _sub_env_value(self, value: Any, i: int) -> Any:
+        if self._is_per_env(value):
+            return value[i]
+        if isinstance(value, tuple):
+            return tuple(self._sub_env_value(v, i) for v in value)
+        return value
+
+    def _check_all_envs(self, indices: List[int], action: str):
+        if sorted(indices) != list(range(self.num_envs)):
+            raise ValueError(f'Cannot {action} a part of the sub-envs of VectorSimulationEnv, '
+                             f'they are stepped together')
+
+    def env_is_wrapped(self, wrapper_class: Type[gym.Wrapper], indices: VecEnvIndices = None) -> List[bool]:
+        return [False for _ in self._get_indices(indices)]
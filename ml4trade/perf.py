@@ -0,0 +1,98 @@
+import math
+import time
+from typing import Callable, Dict
+
+import numpy as np
+
+# durations are counted in log-spaced bins, _BINS_PER_DECADE of them for every power of 10
+# between 10^_MIN_EXP and 10^_MAX_EXP seconds, percentiles are the upper edges of their bins
+_BINS_PER_DECADE = 10
+_MIN_EXP = -7
+_MAX_EXP = 2
+_N_BINS = (_MAX_EXP - _MIN_EXP) * _BINS_PER_DECADE
+_BIN_EDGES = 10 ** (_MIN_EXP + np.arange(1, _N_BINS + 1) / _BINS_PER_DECADE)
+
+TRANSACTIONS = ('scheduled_buy', 'scheduled_sell', 'unscheduled_buy', 'unscheduled_sell')
+
+
+class _Phase:
+    __slots__ = ('calls', 'total', 'bins', 'step_calls', 'step_total')
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.bins = [0] * _N_BINS
+        self.step_calls = 0
+        self.step_total = 0.0
+
+    def add(self, duration: float):
+        self.calls += 1
+        self.total += duration
+        self.step_calls += 1
+        self.step_total += duration
+        idx = int((math.log10(duration) - _MIN_EXP) * _BINS_PER_DECADE) if duration > 0 else 0
+        self.bins[min(max(idx, 0), _N_BINS - 1)] += 1
+
+    def percentile(self, q: float) -> float:
+        cumulative = np.cumsum(self.bins)
+        return float(_BIN_EDGES[np.searchsorted(cumulative, q / 100 * self.calls)])
+
+
+class PerfStats:
+    """Wall times of the phases of a simulation and counts of the transactions it made.
+
+    `timed` wraps a function so that every call is added to the histogram of its phase.
+    `step_info` returns the calls, time and transactions since its previous call,
+    `summary` everything since the stats were created.
+    """
+
+    def __init__(self):
+        self.phases: Dict[str, _Phase] = {}
+        self.transactions = dict.fromkeys(TRANSACTIONS, 0)
+        self._step_transactions = dict.fromkeys(TRANSACTIONS, 0)
+
+    def timed(self, name: str, fn: Callable) -> Callable:
+        phase = self.phases.setdefault(name, _Phase())
+        perf_counter = time.perf_counter
+
+        def timed_fn(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                phase.add(perf_counter() - start)
+
+        timed_fn.__wrapped__ = fn
+        return timed_fn
+
+    def count_transactions(self, scheduled_buy: int, scheduled_sell: int,
+                           unscheduled_buy: int, unscheduled_sell: int):
+        for counts in (self.transactions, self._step_transactions):
+            counts['scheduled_buy'] += scheduled_buy
+            counts['scheduled_sell'] += scheduled_sell
+            counts['unscheduled_buy'] += unscheduled_buy
+            counts['unscheduled_sell'] += unscheduled_sell
+
+    def step_info(self) -> dict:
+        info = {}
+        for name, phase in self.phases.items():
+            if phase.step_calls:
+                info[name] = {'calls': phase.step_calls, 'sec': phase.step_total}
+                phase.step_calls = 0
+                phase.step_total = 0.0
+        info['transactions'] = self._step_transactions
+        self._step_transactions = dict.fromkeys(TRANSACTIONS, 0)
+        return info
+
+    def summary(self) -> dict:
+        stats = {
+            name: {
+                'calls': phase.calls,
+                'total_sec': phase.total,
+                'p50_sec': phase.percentile(50),
+                'p99_sec': phase.percentile(99),
+            }
+            for name, phase in self.phases.items() if phase.calls
+        }
+        stats['transactions'] = dict(self.transactions)
+        return stats
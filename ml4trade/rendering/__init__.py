@@ -1 +1,2 @@
 from ml4trade.rendering.charts import render_all
+from ml4trade.rendering.decimation import set_decimation
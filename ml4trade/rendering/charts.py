@@ -1,5 +1,5 @@
 import math
-from datetime import timedelta
+from datetime import datetime, timedelta
 from typing import List, Union, Tuple, Optional, Dict
 
 import numpy as np
@@ -8,15 +8,45 @@ import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 from mpl_toolkits.axes_grid1 import make_axes_locatable
 
+from ml4trade.rendering import decimation
 
-def _history_to_df(history: List[dict]) -> pd.DataFrame:
+
+def _history_to_df(history: Union[pd.DataFrame, List[dict]]) -> pd.DataFrame:
+    # accepts History.to_dataframe() or a list of row dicts
+    # with (amount, success) pairs for unscheduled transactions
+    if isinstance(history, pd.DataFrame):
+        return history
     history_df = pd.DataFrame(history)
+    for kind in ('buy', 'sell'):
+        column = f'unscheduled_{kind}_amount'
+        if column in history_df:
+            pairs = history_df[column].dropna()
+            split = pd.DataFrame(pairs.tolist(), index=pairs.index, columns=['amount', 'success'])
+            history_df[column] = split['amount']
+            history_df[f'unscheduled_{kind}_success'] = split['success']
     history_df.set_index('datetime', inplace=True)
-    history_df.sort_index()
     return history_df
 
 
-Histories = List[Union['History', List[dict]]]
+def _last_days(ticked: pd.DataFrame, last_n_days: int, n_days_offset: int) -> (pd.DataFrame, datetime, datetime):
+    # rows of the `last_n_days` days ending `n_days_offset` days before the last tick
+    end_datetime = ticked.index[-1] - timedelta(days=n_days_offset)
+    start_datetime = end_datetime - timedelta(days=last_n_days)
+    return ticked.loc[start_datetime:end_datetime], start_datetime, end_datetime
+
+
+def _scheduled_successes(df: pd.DataFrame) -> (pd.Series, pd.Series):
+    # scheduled amounts of the transactions which went through, NaN for the others
+    buys = df['scheduled_buy_amount'].where(
+        (df['scheduled_buy_threshold'] >= df['price']) & (df['scheduled_buy_amount'] > 0)
+    )
+    sells = df['scheduled_sell_amount'].where(
+        (df['scheduled_sell_threshold'] <= df['price']) & (df['scheduled_sell_amount'] > 0)
+    )
+    return buys, sells
+
+
+Histories = List[Union['History', pd.DataFrame, List[dict]]]
 RenderInfo = Dict[str, str]
 HistoriesRenderInfo = Union[Histories, Tuple[Histories, RenderInfo]]
 
@@ -51,20 +81,23 @@ def render_profits_comparison(
         histories, kwargs = _unpack_histories_info(info)
         for i in range(len(histories)):
             h = histories[i]
-            h = _history_to_df(h._history if isinstance(h, History) else h)
+            h = _history_to_df(h.to_dataframe() if isinstance(h, History) else h)
+            # only these columns are read, memory-mapped histories don't load the rest
+            h = h[['wallet_balance', 'potential_profit']]
             histories[i] = h[h['potential_profit'].notna()]
         runs_profits = [h['wallet_balance'].to_numpy() for h in histories]
 
         # note: histories should be generated from same timespan
         timespan = histories[0].index
 
-        means = np.mean([*zip(*runs_profits)], axis=1)
-        stds = np.std([*zip(*runs_profits)], axis=1)
+        runs_profits = np.vstack(runs_profits)
+        means = runs_profits.mean(axis=0)
+        stds = runs_profits.std(axis=0)
 
-        ax.plot(timespan, means, **kwargs)
-        ax.fill_between(timespan, means - stds, means + stds, alpha=0.2, **{**kwargs, 'label': ''})
+        decimation.plot(ax, timespan, means, **kwargs)
+        decimation.fill_between(ax, timespan, means - stds, means + stds, alpha=0.2, **{**kwargs, 'label': ''})
     if len(histories_infos) and draw_potential_profits:
-        ax.plot(timespan, np.cumsum(histories[0]['potential_profit']), **potential_profits_kwargs)
+        decimation.plot(ax, timespan, np.cumsum(histories[0]['potential_profit']), **potential_profits_kwargs)
 
 
     plt.xticks(rotation=45)
@@ -75,17 +108,44 @@ def render_profits_comparison(
     plt.show()
 
 
-def render_all(history: List[dict], last_n_days: int = 2, n_days_offset: int = 0, save_path=None):
+def render_all(history: Union[pd.DataFrame, List[dict]], last_n_days: int = 2, n_days_offset: int = 0, save_path=None):
     history_df = _history_to_df(history)
+    # the charts of the last days share the rows of simulated ticks in that window
+    window, start_datetime, end_datetime = _last_days(
+        history_df[history_df['price'].notna()], last_n_days, n_days_offset,
+    )
+    time_span = f'{start_datetime}-{end_datetime}'
     plt.style.use('ggplot')
     plt.rcParams.update({'font.size': 12})
     fig, axs = plt.subplots(nrows=3, ncols=2, figsize=(16, 16))
 
     _plot_balance(history_df, axs[0, 0], fig, 'Datetime', 'Zł', 'All-time Profit')
-    _plot_battery(history_df, last_n_days, n_days_offset, axs[0, 1], fig, 'Time', '', f'Last {last_n_days} days Battery state')
-    _plot_scheduled_thresholds(history_df, last_n_days, n_days_offset, axs[1, 0], fig, 'Time', 'Zł', f'Last {last_n_days} days Scheduled thresholds')
-    _plot_scheduled_amounts(history_df, last_n_days, n_days_offset, axs[1, 1], fig, 'Time', 'MWh', f'Last {last_n_days} days Scheduled amounts')
-    _plot_unscheduled(history_df, last_n_days, n_days_offset, axs[2, 1], fig, 'Time', 'MWh', f'Last {last_n_days} days Unscheduled energy amounts')
+    _plot_battery(window, time_span, last_n_days, axs[0, 1], fig, 'Time', '', f'Last {last_n_days} days Battery state')
+    _plot_scheduled_thresholds(window, time_span, last_n_days, axs[1, 0], fig, 'Time', 'Zł', f'Last {last_n_days} days Scheduled thresholds')
+    _plot_scheduled_amounts(window, time_span, last_n_days, axs[1, 1], fig, 'Time', 'MWh', f'Last {last_n_days} days Scheduled amounts')
+    _plot_unscheduled(window, time_span, last_n_days, axs[2, 1], fig, 'Time', 'MWh', f'Last {last_n_days} days Unscheduled energy amounts')
+
+    fig.tight_layout()
+    if save_path is not None:
+        fig.savefig(save_path)
+    plt.show()
+
+
+def render_days(history: pd.DataFrame, last_n_days: int = 2, n_days_offset: int = 0, save_path=None):
+    # charts of the day rows kept by SimulationEnv(history_level='daily')
+    window, start_datetime, end_datetime = _last_days(history, last_n_days, n_days_offset)
+    time_span = f'{start_datetime}-{end_datetime}'
+    plt.style.use('ggplot')
+    plt.rcParams.update({'font.size': 12})
+    fig, axs = plt.subplots(nrows=2, ncols=2, figsize=(16, 11))
+
+    _plot_balance(history, axs[0, 0], fig, 'Datetime', 'Zł', 'All-time Profit')
+    _plot_days(window, time_span, {'rel_battery': 'battery at the end of the day'},
+               axs[0, 1], 'Day', '', f'Last {last_n_days} days Battery state')
+    _plot_days(window, time_span, {'energy_produced': 'produced', 'energy_consumed': 'consumed'},
+               axs[1, 0], 'Day', 'MWh', f'Last {last_n_days} days Energy')
+    _plot_days(window, time_span, {'unscheduled_buy_amount': 'buy amount', 'unscheduled_sell_amount': 'sell amount'},
+               axs[1, 1], 'Day', 'MWh', f'Last {last_n_days} days Unscheduled energy amounts')
 
     fig.tight_layout()
     if save_path is not None:
@@ -93,6 +153,18 @@ def render_all(history: List[dict], last_n_days: int = 2, n_days_offset: int = 0
     plt.show()
 
 
+def _plot_days(window: pd.DataFrame, time_span: str, columns: Dict[str, str], ax, xlabel, ylabel, title):
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.title.set_text(f'{title}\n{time_span}')
+    plt.sca(ax)
+    plt.xticks(rotation=45)
+
+    for c, label in columns.items():
+        decimation.plot(ax, window.index, window[c], '.-', label=label)
+    ax.legend(loc='upper right')
+
+
 def _plot_balance(history: pd.DataFrame, ax, fig, xlabel, ylabel, title):
     ax.set_xlabel(xlabel)
     ax.set_ylabel(ylabel)
@@ -100,18 +172,19 @@ def _plot_balance(history: pd.DataFrame, ax, fig, xlabel, ylabel, title):
     plt.xticks(rotation=45)
 
     df = history[history['potential_profit'].notna()]
+    potential_profit = df['potential_profit'].cumsum()
 
-    ax.plot(df.index, df['wallet_balance'], color='green')
-    ax.plot(df.index, np.cumsum(df['potential_profit']), color='blue')
-    ax.plot(df.index, np.cumsum(df['potential_profit']) / 2, color='red')
-    ax.plot(df.index, np.cumsum(df['potential_profit'] + df['price_diff_profit']), color='purple')
+    decimation.plot(ax, df.index, df['wallet_balance'], color='green')
+    decimation.plot(ax, df.index, potential_profit, color='blue')
+    decimation.plot(ax, df.index, potential_profit / 2, color='red')
+    decimation.plot(ax, df.index, (df['potential_profit'] + df['price_diff_profit']).cumsum(), color='purple')
     ax.legend(loc='upper right')
-    start_datetime = df.head(1).index.item()
-    end_datetime = df.tail(1).index.item()
+    start_datetime = df.index[0]
+    end_datetime = df.index[-1]
     ax.title.set_text(f'{title}\n{start_datetime}-{end_datetime}')
 
 
-def _plot_battery(history: pd.DataFrame, last_n_days: int, n_days_offset: int, ax, fig, xlabel, ylabel, title):
+def _plot_battery(window: pd.DataFrame, time_span: str, last_n_days: int, ax, fig, xlabel, ylabel, title):
     ax.set_xlabel(xlabel)
     ax.set_ylabel(ylabel)
     if last_n_days <= 5:
@@ -124,16 +197,12 @@ def _plot_battery(history: pd.DataFrame, last_n_days: int, n_days_offset: int, a
         plt.xticks(rotation=45)
     ax.legend(loc='upper right')
 
-    df = history[history['rel_battery'].notna()]
-    end_datetime = df.tail(1).index.item() - timedelta(days=n_days_offset)
-    start_datetime = end_datetime - timedelta(days=last_n_days)
-    ax.title.set_text(f'{title}\n{start_datetime}-{end_datetime}')
+    ax.title.set_text(f'{title}\n{time_span}')
 
-    battery_history_last_n_days = df['rel_battery'][start_datetime:end_datetime]
-    ax.plot(battery_history_last_n_days.index, battery_history_last_n_days, color='black')
+    decimation.plot(ax, window.index, window['rel_battery'], color='black')
 
 
-def _plot_scheduled_thresholds(history: pd.DataFrame, last_n_days: int, n_days_offset: int,  ax, fig, xlabel, ylabel, title):
+def _plot_scheduled_thresholds(window: pd.DataFrame, time_span: str, last_n_days: int, ax, fig, xlabel, ylabel, title):
     ax.set_xlabel(xlabel)
     divider = make_axes_locatable(ax)
     ax2 = divider.new_vertical(size="400%", pad=0.1)
@@ -171,24 +240,21 @@ def _plot_scheduled_thresholds(history: pd.DataFrame, last_n_days: int, n_days_o
     ax2.plot((-d, +d), (-d, +d), **kwargs)  # top-left diagonal
     ax2.plot((1 - d, 1 + d), (-d, +d), **kwargs)  # top-right diagonal
 
-    df = history[history['price'].notna()]
-    end_datetime = df.tail(1).index.item() - timedelta(days=n_days_offset)
-    start_datetime = end_datetime - timedelta(days=last_n_days)
-    ax2.title.set_text(f'{title}\n{start_datetime}-{end_datetime}')
+    ax2.title.set_text(f'{title}\n{time_span}')
 
-    prices_history_last_n_days = df['price'][start_datetime:end_datetime]
-    buys = df['scheduled_buy_threshold'][start_datetime:end_datetime]
-    sells = df['scheduled_sell_threshold'][start_datetime:end_datetime]
+    prices_history_last_n_days = window['price']
+    buys = window['scheduled_buy_threshold']
+    sells = window['scheduled_sell_threshold']
 
-    ax.plot(buys.index, buys, color='red')
-    ax.plot(sells.index, sells, color='blue')
+    decimation.plot(ax, buys.index, buys, color='red')
+    decimation.plot(ax, sells.index, sells, color='blue')
     ax.set_ylim(0, 5)
 
-    ax2.plot(buys.index, buys, color='red', label='buy threshold')
-    ax2.plot(sells.index, sells, color='blue', label='sell threshold')
-    ax2.plot(prices_history_last_n_days.index, prices_history_last_n_days, color='black', label='market price')
-    ax2.set_ylim(bottom=min(prices_history_last_n_days) - 20)
-    if max(max(buys), max(sells)) > max(prices_history_last_n_days) * 3:
+    decimation.plot(ax2, buys.index, buys, color='red', label='buy threshold')
+    decimation.plot(ax2, sells.index, sells, color='blue', label='sell threshold')
+    decimation.plot(ax2, prices_history_last_n_days.index, prices_history_last_n_days, color='black', label='market price')
+    ax2.set_ylim(bottom=prices_history_last_n_days.min() - 20)
+    if max(buys.max(), sells.max()) > prices_history_last_n_days.max() * 3:
         plt.yscale("log")
 
     if last_n_days <= 5:
@@ -205,32 +271,18 @@ def _plot_scheduled_thresholds(history: pd.DataFrame, last_n_days: int, n_days_o
         plt.xticks(rotation=45)
 
 
-def _plot_scheduled_amounts(history: pd.DataFrame, last_n_days: int, n_days_offset,  ax, fig, xlabel, ylabel, title):
+def _plot_scheduled_amounts(window: pd.DataFrame, time_span: str, last_n_days: int, ax, fig, xlabel, ylabel, title):
     ax.set_xlabel(xlabel)
     ax.set_ylabel(ylabel)
     ax.legend(loc='upper right')
 
-    df = history[history['price'].notna()]
-    end_datetime = df.tail(1).index.item() - timedelta(days=n_days_offset)
-    start_datetime = end_datetime - timedelta(days=last_n_days)
-    ax.title.set_text(f'{title}\n{start_datetime}-{end_datetime}')
+    ax.title.set_text(f'{title}\n{time_span}')
 
-    energy_produced = df['energy_produced'][start_datetime:end_datetime]
-    energy_consumed = df['energy_consumed'][start_datetime:end_datetime]
-    energy_diff = energy_produced - energy_consumed
-    prices = df['price'][start_datetime:end_datetime]
-    buy_amounts = df['scheduled_buy_amount'][start_datetime:end_datetime]
-    sell_amounts = df['scheduled_sell_amount'][start_datetime:end_datetime]
-    buys_success = df.apply(
-        lambda row: row['scheduled_buy_amount'] if row['scheduled_buy_threshold'] >= row['price'] and row['scheduled_buy_amount'] > 0 else np.nan,
-        axis=1,
-    )
-    sells_success = df.apply(
-        lambda row: row['scheduled_sell_amount'] if row['scheduled_sell_threshold'] <= row['price'] and row['scheduled_sell_amount'] > 0 else np.nan,
-        axis=1,
-    )
-    buys_success = buys_success[start_datetime:end_datetime]
-    sells_success = sells_success[start_datetime:end_datetime]
+    energy_diff = window['energy_produced'] - window['energy_consumed']
+    prices = window['price']
+    buy_amounts = window['scheduled_buy_amount']
+    sell_amounts = window['scheduled_sell_amount']
+    buys_success, sells_success = _scheduled_successes(window)
 
     if last_n_days <= 5:
         hours = mdates.HourLocator(byhour=list(range(0, 24, 4)), interval=1)
@@ -241,29 +293,23 @@ def _plot_scheduled_amounts(history: pd.DataFrame, last_n_days: int, n_days_offs
         plt.sca(ax)
         plt.xticks(rotation=45)
 
-    ax.plot(prices.index, prices / max(prices) * max(np.max(buys_success), np.max(sells_success)), color='gray', label='market price')
-    ax.plot(energy_diff.index, energy_diff, color='purple', label='produced - consumed')
-    ax.plot(buy_amounts.index, buy_amounts, color='lightsalmon', label='buy amount')
-    ax.plot(sell_amounts.index, sell_amounts, color='lightblue', label='sell amount')
+    decimation.plot(ax, prices.index, prices / prices.max() * max(buys_success.max(), sells_success.max()), color='gray', label='market price')
+    decimation.plot(ax, energy_diff.index, energy_diff, color='purple', label='produced - consumed')
+    decimation.plot(ax, buy_amounts.index, buy_amounts, color='lightsalmon', label='buy amount')
+    decimation.plot(ax, sell_amounts.index, sell_amounts, color='lightblue', label='sell amount')
     ax.plot(buys_success.index, buys_success, '.', color='red', label='buy amount success')
     ax.plot(sells_success.index, sells_success, '.', color='blue', label='sell amount success')
 
 
-def _plot_unscheduled(history: pd.DataFrame, last_n_days: int, n_days_offset: int, ax, fig, xlabel, ylabel, title):
+def _plot_unscheduled(window: pd.DataFrame, time_span: str, last_n_days: int, ax, fig, xlabel, ylabel, title):
     ax.set_xlabel(xlabel)
     ax.set_ylabel(ylabel)
     ax.title.set_text(title)
 
-    df = history[history['unscheduled_buy_amount'].notna()]
-    end_datetime = df.tail(1).index.item() - timedelta(days=n_days_offset)
-    start_datetime = end_datetime - timedelta(days=last_n_days)
-    ax.title.set_text(f'{title}\n{start_datetime}-{end_datetime}')
-
-    buys = df.apply(lambda row: row['unscheduled_buy_amount'][0], axis=1)[start_datetime:end_datetime]
-    sells = df.apply(lambda row: row['unscheduled_sell_amount'][0], axis=1)[start_datetime:end_datetime]
+    ax.title.set_text(f'{title}\n{time_span}')
 
-    ax.plot(buys.index, buys, color='red', label='buy amount')
-    ax.plot(sells.index, sells, color='blue', label='sell amount')
+    decimation.plot(ax, window.index, window['unscheduled_buy_amount'], color='red', label='buy amount')
+    decimation.plot(ax, window.index, window['unscheduled_sell_amount'], color='blue', label='sell amount')
     ax.legend(loc='upper right')
 
     if last_n_days <= 5:
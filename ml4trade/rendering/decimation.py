@@ -0,0 +1,113 @@
+from typing import Optional
+
+import numpy as np
+from typing_extensions import Literal
+
+# series with more points than the threshold are decimated to about twice as many points as
+# the axes are wide in pixels before being plotted, see set_decimation
+DEFAULT_THRESHOLD = 5000
+_threshold: Optional[int] = DEFAULT_THRESHOLD
+_method = 'minmax'
+
+
+def set_decimation(threshold: Optional[int] = DEFAULT_THRESHOLD, method: Literal['minmax', 'lttb'] = 'minmax'):
+    # threshold=None plots every point;
+    # 'minmax' keeps the lowest and the highest point of every pixel column so peaks and troughs stay,
+    # 'lttb' keeps the points which span the largest triangles (Largest-Triangle-Three-Buckets)
+    global _threshold, _method
+    assert method in ('minmax', 'lttb'), f'Unknown decimation method {method}'
+    _threshold = threshold
+    _method = method
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    # indices of the minimum and the maximum of each of n_out // 2 buckets of consecutive points
+    # and of the first and last point, NaNs are left out
+    n = len(y)
+    n_buckets = max(n_out // 2, 1)
+    if n <= n_out:
+        return np.flatnonzero(~np.isnan(y))
+    size = -(-n // n_buckets)
+    padded = np.full(n_buckets * size, np.nan)
+    padded[:n] = y
+    buckets = padded.reshape(n_buckets, size)
+    nan = np.isnan(buckets)
+    offsets = np.arange(n_buckets) * size
+    lows = np.where(nan, np.inf, buckets).argmin(axis=1) + offsets
+    highs = np.where(nan, -np.inf, buckets).argmax(axis=1) + offsets
+    filled = ~nan.all(axis=1)
+    idx = np.concatenate(([0, n - 1], lows[filled], highs[filled]))
+    idx = np.unique(idx)
+    return idx[~np.isnan(y[idx])]
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    # Largest-Triangle-Three-Buckets: the first and the last point and one point of each of n_out - 2
+    # buckets, the one forming the largest triangle with the point kept from the previous bucket
+    # and the average of the next one
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    edges = (1 + np.arange(n_out - 1) * (n - 2) / (n_out - 2)).astype(int)
+    edges[-1] = n - 1
+    idx = np.empty(n_out, dtype=int)
+    idx[0] = 0
+    idx[-1] = n - 1
+    prev = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        areas = np.abs(
+            (x[prev] - avg_x) * (y[start:end] - y[prev]) - (x[prev] - x[start:end]) * (avg_y - y[prev])
+        )
+        prev = start + int(areas.argmax())
+        idx[i + 1] = prev
+    return idx
+
+
+def decimation_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> Optional[np.ndarray]:
+    # indices of the points to plot with the current settings, None when every point is plotted
+    if _threshold is None or len(y) <= max(_threshold, n_out):
+        return None
+    y = np.asarray(y, dtype=np.float64)
+    if _method == 'lttb':
+        keep = ~np.isnan(y)
+        kept = np.flatnonzero(keep)
+        return kept[lttb_indices(_as_float(np.asarray(x))[keep], y[keep], n_out)]
+    return minmax_indices(y, n_out)
+
+
+def _as_float(x: np.ndarray) -> np.ndarray:
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').view(np.int64).astype(np.float64)
+    return x.astype(np.float64)
+
+
+def axes_points(ax) -> int:
+    # two points for every pixel column of the axes
+    return 2 * max(int(ax.bbox.width), 1)
+
+
+def plot(ax, x, y, *args, **kwargs):
+    # ax.plot of a series, decimated when it is longer than the threshold
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    idx = decimation_indices(x, y, axes_points(ax))
+    if idx is not None:
+        x, y = x[idx], y[idx]
+    return ax.plot(x, y, *args, **kwargs)
+
+
+def fill_between(ax, x, y1, y2, **kwargs):
+    # ax.fill_between keeping the extremes of both bounds
+    x = np.asarray(x)
+    y1 = np.asarray(y1, dtype=np.float64)
+    y2 = np.asarray(y2, dtype=np.float64)
+    n_out = axes_points(ax)
+    idx1 = decimation_indices(x, y1, n_out)
+    if idx1 is not None:
+        idx = np.union1d(idx1, decimation_indices(x, y2, n_out))
+        x, y1, y2 = x[idx], y1[idx], y2[idx]
+    return ax.fill_between(x, y1, y2, **kwargs)
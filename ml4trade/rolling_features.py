@@ -0,0 +1,126 @@
+from typing import Dict, Hashable
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from ml4trade.shared_array import SharedArray, share_array, pickled_array, unpickled_array
+
+
+_ARRAYS = ('values', '_sums', '_sq_sums', '_period_sums')
+
+
+def _rolling_extreme(values: np.ndarray, window: int, take_min: bool) -> np.ndarray:
+    # element i is the extreme of values[i:i + window], reduced over a strided view of the windows
+    if window > len(values):
+        return np.empty(0)
+    windows = sliding_window_view(values, window)
+    return windows.min(axis=1) if take_min else windows.max(axis=1)
+
+
+class RollingFeatures:
+    """Statistics of a series over windows, each answered in O(1).
+
+    `end` and `window` select `values[end - window:end]`. Sums, means and deviations come from
+    prefix sums; minima and maxima from arrays computed once per window length, see `rolling_min`.
+    `period_mean` averages the values a multiple of `period` (a day of hourly values) before `end`.
+    `share` moves the arrays computed so far to memory-mapped files which pickled copies map.
+    """
+
+    def __init__(self, values: np.ndarray, period: int = 24):
+        values = np.asarray(values, dtype=np.float64)
+        self.values = values
+        self.period = period
+        n = len(values)
+        # sums of values shifted by their mean, keeps the variance accurate
+        self._shift = float(values.mean()) if n else 0.0
+        shifted = values - self._shift
+        self._sums = np.concatenate(([0.0], np.cumsum(shifted)))
+        self._sq_sums = np.concatenate(([0.0], np.cumsum(shifted * shifted)))
+        # _period_sums[i] is the sum of shifted[j] for j < i and j = i (mod period)
+        padded = np.zeros(-(-n // period) * period)
+        padded[:n] = shifted
+        period_cumsum = np.cumsum(padded.reshape(-1, period), axis=0).ravel()
+        self._period_sums = np.concatenate((np.zeros(period), period_cumsum))[:n + 1]
+        self._mins: Dict[int, np.ndarray] = {}
+        self._maxs: Dict[int, np.ndarray] = {}
+        self._shared: Dict[Hashable, SharedArray] = {}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def share(self):
+        # extremes of windows first requested later are computed by every copy
+        for attr in _ARRAYS:
+            setattr(self, attr, share_array(self._shared, attr, getattr(self, attr)))
+        for name, extremes in (('min', self._mins), ('max', self._maxs)):
+            for window, array in extremes.items():
+                extremes[window] = share_array(self._shared, (name, window), array)
+
+    def close(self):
+        for shared in self._shared.values():
+            shared.close()
+        self._shared = {}
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        for attr in _ARRAYS:
+            state[attr] = pickled_array(self._shared, attr, state[attr])
+        state['_mins'] = {w: pickled_array(self._shared, ('min', w), a) for w, a in self._mins.items()}
+        state['_maxs'] = {w: pickled_array(self._shared, ('max', w), a) for w, a in self._maxs.items()}
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        for attr in _ARRAYS:
+            setattr(self, attr, unpickled_array(state[attr]))
+        self._mins = {w: unpickled_array(a) for w, a in state['_mins'].items()}
+        self._maxs = {w: unpickled_array(a) for w, a in state['_maxs'].items()}
+
+    def _check_window(self, end: int, window: int):
+        # negative indices would silently wrap around to the end of the series
+        if not 0 < window <= end <= len(self.values):
+            raise ValueError(f'Window of {window} values ending at {end} is out of range of {len(self.values)} values')
+
+    def sum(self, end: int, window: int) -> float:
+        self._check_window(end, window)
+        return float(self._sums[end] - self._sums[end - window]) + window * self._shift
+
+    def mean(self, end: int, window: int) -> float:
+        self._check_window(end, window)
+        return float(self._sums[end] - self._sums[end - window]) / window + self._shift
+
+    def var(self, end: int, window: int, ddof: int = 0) -> float:
+        self._check_window(end, window)
+        s = self._sums[end] - self._sums[end - window]
+        sq = self._sq_sums[end] - self._sq_sums[end - window]
+        return max(float(sq - s * s / window) / (window - ddof), 0.0)
+
+    def std(self, end: int, window: int, ddof: int = 0) -> float:
+        return self.var(end, window, ddof) ** 0.5
+
+    def min(self, end: int, window: int) -> float:
+        self._check_window(end, window)
+        return float(self.rolling_min(window)[end - window])
+
+    def max(self, end: int, window: int) -> float:
+        self._check_window(end, window)
+        return float(self.rolling_max(window)[end - window])
+
+    def period_mean(self, end: int, periods: int) -> float:
+        # mean of values[end - period], values[end - 2 * period], ..., values[end - periods * period]
+        start = end - periods * self.period
+        if periods <= 0 or start < 0 or end > len(self.values):
+            raise ValueError(f'{periods} periods ending at {end} are out of range of {len(self.values)} values')
+        return float(self._period_sums[end] - self._period_sums[start]) / periods + self._shift
+
+    def rolling_min(self, window: int) -> np.ndarray:
+        # element i is the minimum of values[i:i + window]
+        if window not in self._mins:
+            self._mins[window] = _rolling_extreme(self.values, window, take_min=True)
+        return self._mins[window]
+
+    def rolling_max(self, window: int) -> np.ndarray:
+        # element i is the maximum of values[i:i + window]
+        if window not in self._maxs:
+            self._maxs[window] = _rolling_extreme(self.values, window, take_min=False)
+        return self._maxs[window]
@@ -0,0 +1,69 @@
+import os
+import tempfile
+import weakref
+from typing import Tuple, Dict, Hashable, Any
+
+import numpy as np
+from numpy.typing import DTypeLike
+
+# RAM backed where available
+_SHARED_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class SharedArray:
+    """Read-only array in a memory-mapped file shared between processes.
+
+    Pickled SharedArrays (e.g. in data strategies sent to SubprocVecEnv workers) map the file
+    again instead of copying the array. The process which created the file removes it on close()
+    or exit, arrays already mapped stay valid.
+    """
+
+    def __init__(self, path: str, shape: Tuple[int, ...], dtype: DTypeLike, owner: bool = False):
+        self.path = path
+        self.array = np.memmap(path, dtype, 'r', shape=shape).view(np.ndarray)
+        self._finalizer = weakref.finalize(self, _remove, path) if owner else None
+
+    @classmethod
+    def create(cls, array: np.ndarray) -> 'SharedArray':
+        fd, path = tempfile.mkstemp(prefix='ml4trade-', suffix='.bin', dir=_SHARED_DIR)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(np.ascontiguousarray(array).data)
+        return cls(path, array.shape, array.dtype, owner=True)
+
+    def __reduce__(self):
+        return SharedArray, (self.path, self.array.shape, self.array.dtype.str)
+
+    def close(self):
+        if self._finalizer is not None:
+            self._finalizer()
+
+
+def share_array(shared: Dict[Hashable, SharedArray], key: Hashable, array: np.ndarray) -> np.ndarray:
+    # moves `array` to a SharedArray kept in `shared` under `key` and returns the mapped array,
+    # an array which is already the one mapped under `key` is returned as is
+    if key in shared:
+        if shared[key].array is array:
+            return array
+        shared[key].close()
+    shared[key] = SharedArray.create(array)
+    return shared[key].array
+
+
+def pickled_array(shared: Dict[Hashable, SharedArray], key: Hashable, array: Any) -> Any:
+    # the SharedArray `array` is mapped from, which pickles as the path of its file, or `array` itself
+    shared_array = shared.get(key)
+    if shared_array is not None and shared_array.array is array:
+        return shared_array
+    return array
+
+
+def unpickled_array(value: Any) -> Any:
+    # reverses pickled_array()
+    return value.array if isinstance(value, SharedArray) else value
@@ -1,5 +1,6 @@
 from datetime import timedelta, time, datetime
-from typing import Tuple, Generator, Dict, Optional
+from typing import Tuple, Generator, Dict, Optional, List
+from typing_extensions import Literal
 
 import numpy as np
 import gymnasium as gym
@@ -10,13 +11,17 @@ from ml4trade.data_strategies import DataStrategy
 from ml4trade.domain.clock import SimulationClock, ClockView
 from ml4trade.domain.constants import SIMULATION_ENV_ACTION_SPACE
 from ml4trade.domain.consumption import ConsumptionSystem
+from ml4trade.domain.kernel import TickRecords, simulate_day, draw_consume_first
+from ml4trade.domain.lookahead import Projection, TickBatch, RandomSource, project, rng_states, set_rng_states
 from ml4trade.domain.market import EnergyMarket
 from ml4trade.domain.production import ProductionSystem
 from ml4trade.domain.prosumer import Prosumer
+from ml4trade.domain.randomness import RandomStream
 from ml4trade.domain.units import Currency, MWh
 from ml4trade.domain.utils import setup_systems
-from ml4trade.utils import calc_tick_offset, dfs_are_long_enough
-from ml4trade.history import History
+from ml4trade.utils import calc_tick_offset, dfs_are_long_enough, timedelta_to_hours
+from ml4trade.history import History, DailyHistory
+from ml4trade.perf import PerfStats
 
 
 class SimulationEnv(gym.Env):
@@ -33,6 +38,10 @@ class SimulationEnv(gym.Env):
     _market: EnergyMarket
     _production_system: ProductionSystem
     _consumption_system: ConsumptionSystem
+    _engine: str
+    _history_level: str
+    _obs: np.ndarray
+    _obs_parts: Tuple[np.ndarray, np.ndarray, np.ndarray]
     # resetable properties
     _prev_prosumer_balance: Currency
     _prosumer_balance: Currency
@@ -40,6 +49,9 @@ class SimulationEnv(gym.Env):
     _first_actions_set: bool
     history: History
     _simulation: Generator[None, ActType, None]
+    _scheduled_actions: Optional[np.ndarray]
+    _projection: Optional[Projection]
+    _consume_first: Optional[RandomStream]
 
     def __init__(
             self,
@@ -54,7 +66,19 @@ class SimulationEnv(gym.Env):
             battery_efficiency: float,
             start_tick: int = None,
             use_reward_penalties: bool = True,
+            engine: Literal['tick', 'day'] = 'tick',
+            history_level: Literal['full', 'daily', 'off'] = 'full',
+            warm_reset: bool = False,
+            instrument: bool = False,
     ):
+        # 'tick' steps the domain objects hour by hour,
+        # 'day' simulates the hours between two steps at once on arrays, with identical results;
+        # history_level 'full' records every tick, 'daily' keeps a row of aggregates per day
+        # and 'off' only what the reward needs, see DailyHistory;
+        # warm_reset rewinds the history of the previous episode instead of allocating a new one,
+        # see History.clear;
+        # instrument times the phases of the simulation and counts transactions, the stats of a step
+        # are in info['perf'] and the totals in perf_stats(), without it nothing is measured
         if data_strategies is None:
             data_strategies = {}
 
@@ -75,6 +99,13 @@ class SimulationEnv(gym.Env):
         self._prosumer_init_balance = prosumer_init_balance
         self._battery_init_charge = battery_init_charge
         self._use_reward_penalties = use_reward_penalties
+        if engine not in ('tick', 'day'):
+            raise ValueError(f'Unknown engine {engine}, use "tick" or "day"')
+        self._engine = engine
+        if history_level not in ('full', 'daily', 'off'):
+            raise ValueError(f'Unknown history level {history_level}, use "full", "daily" or "off"')
+        self._history_level = history_level
+        self._warm_reset = warm_reset
 
         (
             self._clock,
@@ -85,6 +116,16 @@ class SimulationEnv(gym.Env):
         ) = setup_systems(data_strategies, self._start_tick, prosumer_init_balance,
                           start_datetime, scheduling_time, action_replacement_time,
                           battery_init_charge, battery_efficiency, battery_capacity)
+        self._obs = np.empty(self.observation_space.shape, dtype=self.observation_space.dtype)
+        market_end = self._market.ds.observation_size()
+        production_end = market_end + self._production_system.ds.observation_size()
+        self._obs_parts = (self._obs[:market_end], self._obs[market_end:production_end], self._obs[production_end:-2])
+        self._consume_first = None
+        self.history = None
+        self._simulation = None
+        self._perf = None
+        if instrument:
+            self._instrument()
         self.reset()
 
     def reset(
@@ -93,15 +134,18 @@ class SimulationEnv(gym.Env):
         seed: Optional[int] = None,
         options: Optional[dict] = None,
     ) -> Tuple[ObsType, dict]:
+        # data strategies are not modified, they may be shared with other environments
+        if seed is not None or self._consume_first is None:
+            for system in (self._production_system, self._consumption_system, self._market):
+                rng, _ = seeding.np_random(seed)
+                system.stream = system.ds.random_stream(rng)
         if seed is not None:
             self._np_random, seed = seeding.np_random(seed)
-            self._production_system.ds.set_seed(seed)
-            self._consumption_system.ds.set_seed(seed)
-            self._market.ds.set_seed(seed)
+        if self._consume_first is None or self._consume_first.rng is not self.np_random:
+            self._consume_first = RandomStream(self.np_random, draw_consume_first)
 
-        self._production_system.ds.last_processed = None
-        self._consumption_system.ds.last_processed = None
-        self._market.ds.last_processed = None
+        self._production_system.last_processed = None
+        self._consumption_system.last_processed = None
 
         self._prosumer.wallet.balance = self._prosumer_init_balance
         options = options or {}
@@ -118,28 +162,48 @@ class SimulationEnv(gym.Env):
         self._prev_prosumer_balance = self._prosumer_init_balance
         self._first_actions_scheduled = False
         self._first_actions_set = False
-        self.history = History(self._clock.view(use_tick_offset=False), self._prosumer.battery.capacity, self._prosumer.battery.efficiency)
-        self._simulation = self.__simulation()
-        self._simulation.send(None)
+        # the first partial day, the episode and the scheduled day ahead
+        history_capacity = max(timedelta_to_hours(self._end_datetime - self._start_datetime), 0) + 48
+        if self._warm_reset and self.history is not None:
+            self.history.clear(history_capacity)
+        else:
+            if self.history is not None:
+                # the rows of the finished episode still buffered by a sink are written out
+                self.history.close_sink()
+            history_args = (
+                self._clock.view(use_tick_offset=False), self._prosumer.battery.capacity,
+                self._prosumer.battery.efficiency, history_capacity,
+            )
+            if self._history_level == 'full':
+                self.history = History(*history_args)
+            else:
+                self.history = DailyHistory(*history_args, keep_days=self._history_level == 'daily')
+            if self._perf is not None:
+                self._instrument_history()
+        self._scheduled_actions = None
+        self._projection = None
+        # both engines run the ticks before the first scheduling hour at once, no actions are set yet;
+        # the generator has no state of its own between yields so it is started only once
+        self._simulate_day()
+        if self._engine == 'tick' and self._simulation is None:
+            self._simulation = self.__simulation()
+            self._simulation.send(None)
 
         return self._observation()[0], {}
 
     def _observation(self) -> Tuple[ObsType, float, bool, bool, dict]:
-        market_obs = self._market.observation()
-        production_obs = self._production_system.observation()
-        consumption_obs = self._consumption_system.observation()
-        rel_battery_charge_at_midnight = self._dry_simulation(24 - self._clock.scheduling_time.hour)
-        obs = [
-            *market_obs,
-            *production_obs,
-            *consumption_obs,
-            self._prosumer.battery.rel_current_charge,
-            rel_battery_charge_at_midnight,
-        ]
+        # the data strategies write into the preallocated buffer, callers get a copy of it
+        # since they may hold on to an observation past the next step or reset
+        market_obs, production_obs, consumption_obs = self._obs_parts
+        self._market.observation_into(market_obs)
+        self._production_system.observation_into(production_obs)
+        self._consumption_system.observation_into(consumption_obs)
+        self._obs[-2] = self._prosumer.battery.rel_current_charge
+        self._obs[-1] = self._dry_simulation(24 - self._clock.scheduling_time.hour)
         reward = self._calculate_reward()
         terminated = False
         truncated = self._end_datetime <= self._clock.cur_datetime
-        return obs, reward, terminated, truncated, {}
+        return self._obs.copy(), reward, terminated, truncated, {}
 
     def _calculate_reward(self) -> float:
         potential_profit = 0
@@ -152,14 +216,19 @@ class SimulationEnv(gym.Env):
 
     def step(self, action: ActType) -> Tuple[ObsType, float, bool, bool, dict]:
         self.history.step_update(action)
-        self._simulation.send(action)
+        if self._engine == 'day':
+            self._simulate_day(action)
+        else:
+            self._simulation.send(action)
         return self._observation()
 
     def _rand_produce_consume(self):
-        fs = [self._prosumer.consume, self._prosumer.produce]
-        self.np_random.shuffle(fs)
-        for f in fs:
-            f()
+        if self._consume_first.next():
+            self._prosumer.consume()
+            self._prosumer.produce()
+        else:
+            self._prosumer.produce()
+            self._prosumer.consume()
 
     def __simulation(self) -> Generator[None, ActType, None]:
         while True:
@@ -170,6 +239,7 @@ class SimulationEnv(gym.Env):
                     self._first_actions_scheduled = True
 
             if self._clock.is_it_action_replacement_hour() and self._first_actions_scheduled:
+                self._scheduled_actions = np.asarray(self._prosumer.next_day_actions, dtype=np.float64)
                 self._prosumer.set_new_actions()
                 self._prev_prosumer_balance = self._prosumer_balance
                 self._prosumer_balance = self._prosumer.wallet.balance
@@ -187,34 +257,200 @@ class SimulationEnv(gym.Env):
             )
             self._clock.tick()
 
-    def _dry_simulation(self, ticks: int) -> MWh:
+    def _simulate_day(self, action: Optional[ActType] = None):
+        # runs the same ticks as __simulation between two consecutive yields
+        if action is not None:
+            self._prosumer.schedule(action)
+            self._first_actions_scheduled = True
+            n_ticks = 24
+        else:
+            n_ticks = (self._clock.scheduling_hour() - self._clock.cur_datetime.hour) % 24
+        start_hour = self._clock.cur_datetime.hour
+        hours = [(start_hour + i) % 24 for i in range(n_ticks)]
+        replacement_idx = n_ticks
+        if self._first_actions_scheduled and self._clock.action_replacement_time.hour in hours:
+            replacement_idx = hours.index(self._clock.action_replacement_time.hour)
+
+        self._run_ticks(hours[:replacement_idx])
+        if replacement_idx < n_ticks:
+            self._scheduled_actions = np.asarray(self._prosumer.next_day_actions, dtype=np.float64)
+            self._prosumer.set_new_actions()
+            self._prev_prosumer_balance = self._prosumer_balance
+            self._prosumer_balance = self._prosumer.wallet.balance
+            self._first_actions_set = True
+            self._run_ticks(hours[replacement_idx:])
+
+    def _run_ticks(self, hours: List[int]):
+        if not hours:
+            return
+        if self._first_actions_set:
+            projection, self._projection = self._projection, None
+            if projection is not None and len(projection.batch.prices) <= len(hours) and projection.matches(
+                    self._clock.cur_tick, self._prosumer.wallet.balance.value,
+                    self._prosumer.battery.current_charge.value, self._scheduled_actions, rng_states(self._rngs())):
+                set_rng_states(self._rngs(), projection.next_rng_states)
+                self._record_ticks(projection.batch)
+                hours = hours[len(projection.batch.prices):]
+                if not hours:
+                    return
+            self._record_ticks(self._simulate_ticks(hours))
+            return
+
+        n_ticks = len(hours)
+        data_ticks = np.arange(self._clock.cur_tick, self._clock.cur_tick + n_ticks) + self._clock.tick_offset
+        battery = self._prosumer.battery
+        self._record_ticks(TickBatch(
+            self._market.ds.process_batch(data_ticks, self._market.stream),
+            [self._production_system.last_processed or 0] * n_ticks,
+            [self._consumption_system.last_processed or 0] * n_ticks,
+            TickRecords(
+                [self._prosumer.wallet.balance.value] * n_ticks,
+                [battery.current_charge.value] * n_ticks,
+                [0] * n_ticks,
+                [0] * n_ticks,
+            ),
+        ))
+
+    def _simulate_ticks(self, hours: List[int]) -> TickBatch:
+        # the hours starting at the current tick on arrays, the domain objects are left untouched
+        n_ticks = len(hours)
+        data_ticks = np.arange(self._clock.cur_tick, self._clock.cur_tick + n_ticks) + self._clock.tick_offset
+        hours = np.array(hours)
+        prices = self._market.ds.process_batch(data_ticks, self._market.stream)
+        production = self._production_system.ds.process_batch(data_ticks, self._production_system.stream)
+        consumption = self._consumption_system.ds.process_batch(hours, self._consumption_system.stream)
+        consume_first = self._consume_first.take(n_ticks)
+        battery = self._prosumer.battery
+        actions = self._scheduled_actions
+        records = simulate_day(
+            self._prosumer.wallet.balance.value, battery.current_charge.value,
+            battery.capacity.value, battery.efficiency,
+            prices, production, consumption, consume_first,
+            actions[hours], actions[48 + hours], actions[24 + hours], actions[72 + hours],
+        )
+        return TickBatch(prices, production.tolist(), consumption.tolist(), records)
+
+    def _record_ticks(self, batch: TickBatch):
+        n_ticks = len(batch.prices)
+        ticks = list(range(self._clock.cur_tick, self._clock.cur_tick + n_ticks))
+        datetimes = [self._clock.cur_datetime + i * self._clock.tick_duration for i in range(n_ticks)]
+        records = batch.records
+        battery = self._prosumer.battery
+        if self._first_actions_set:
+            self._prosumer.wallet.balance = Currency(records.balance[-1])
+            battery.current_charge = MWh(records.charge[-1])
+            self._production_system.last_processed = batch.production[-1]
+            self._consumption_system.last_processed = batch.consumption[-1]
+
+        prices = batch.prices.tolist()
+        self.history.ticks_update(
+            ticks, datetimes, prices, records.balance,
+            [c / battery.capacity.value for c in records.charge],
+            batch.production, batch.consumption,
+            records.unscheduled_buy, records.unscheduled_sell,
+        )
+        self._clock.tick(n_ticks)
+
+    def _rngs(self) -> List[RandomSource]:
+        # everything the simulation draws random values from, see ml4trade.domain.randomness
+        return [self._consume_first] + [
+            system.stream
+            for system in (self._production_system, self._consumption_system, self._market)
+            if system.stream is not None
+        ]
+
+    def _dry_simulation(self, ticks: int) -> float:
+        # projects the relative battery charge `ticks` hours ahead without advancing any generator,
+        # the day engine takes the projected ticks over when it reaches them under the same schedule
         if not self._first_actions_set:
             return self._prosumer.battery.rel_current_charge
-        saved_state = (
-            self._prosumer.wallet.balance,
-            self._prosumer.battery.current_charge,
-            self._prosumer.last_scheduled_buy_transaction,
-            self._prosumer.last_unscheduled_sell_transaction,
-            self._prosumer.last_unscheduled_buy_transaction,
-            self._prosumer.last_unscheduled_sell_transaction,
-            self._clock.cur_datetime,
-            self._clock.cur_tick,
+        start_hour = self._clock.cur_datetime.hour
+        hours = [(start_hour + i) % 24 for i in range(ticks)]
+        self._projection = project(
+            self._rngs(), self._clock.cur_tick,
+            self._prosumer.wallet.balance.value, self._prosumer.battery.current_charge.value,
+            self._scheduled_actions, lambda: self._simulate_ticks(hours),
         )
-        for _ in range(ticks):
-            self._rand_produce_consume()
-            self._clock.tick()
-        predicted_rel_battery_charge = self._prosumer.battery.rel_current_charge
-        (
-            self._prosumer.wallet.balance,
-            self._prosumer.battery.current_charge,
-            self._prosumer.last_scheduled_buy_transaction,
-            self._prosumer.last_unscheduled_sell_transaction,
-            self._prosumer.last_unscheduled_buy_transaction,
-            self._prosumer.last_unscheduled_sell_transaction,
-            self._clock.cur_datetime,
-            self._clock.cur_tick,
-        ) = saved_state
-        return predicted_rel_battery_charge
+        return self._projection.batch.records.charge[-1] / self._prosumer.battery.capacity.value
+
+    def _instrument(self):
+        # timed wrappers are set on the instances, so the methods are left untouched when not instrumenting
+        perf = self._perf = PerfStats()
+        self._prosumer.schedule = perf.timed('schedule', self._prosumer.schedule)
+        self._prosumer.set_new_actions = perf.timed('set_new_actions', self._prosumer.set_new_actions)
+        self._rand_produce_consume = perf.timed('produce_consume', self._rand_produce_consume)
+        self._simulate_ticks = perf.timed('simulate_ticks', self._simulate_ticks)
+        self._dry_simulation = perf.timed('dry_simulation', self._dry_simulation)
+        self._observation = perf.timed('observation', self._observation)
+        record_ticks = self._record_ticks
+        step = perf.timed('step', self.step)
+        reset = perf.timed('reset', self.reset)
+
+        def counting_record_ticks(batch: TickBatch):
+            if self._first_actions_set:
+                self._count_batch_transactions(batch)
+            record_ticks(batch)
+
+        def instrumented_step(action: ActType) -> Tuple[ObsType, float, bool, bool, dict]:
+            obs, reward, terminated, truncated, info = step(action)
+            info['perf'] = perf.step_info()
+            return obs, reward, terminated, truncated, info
+
+        def instrumented_reset(**kwargs) -> Tuple[ObsType, dict]:
+            obs, info = reset(**kwargs)
+            info['perf'] = perf.step_info()
+            return obs, info
+
+        self._record_ticks = counting_record_ticks
+        self.step = instrumented_step
+        self.reset = instrumented_reset
+
+    def _instrument_history(self):
+        # a history reused by a warm reset is already instrumented
+        if 'tick_update' in self.history.__dict__:
+            return
+        tick_update = self._perf.timed('history_update', self.history.tick_update)
+
+        def counting_tick_update(prosumer: Prosumer, *args):
+            if self._first_actions_set:
+                self._count_tick_transactions()
+            tick_update(prosumer, *args)
+
+        self.history.tick_update = counting_tick_update
+        self.history.ticks_update = self._perf.timed('history_update', self.history.ticks_update)
+
+    def _count_tick_transactions(self):
+        # transactions of the tick the tick engine has just simulated
+        prosumer = self._prosumer
+        scheduled_buy_amount, scheduled_buy_ok = prosumer.last_scheduled_buy_transaction
+        scheduled_sell_amount, scheduled_sell_ok = prosumer.last_scheduled_sell_transaction
+        unscheduled_buy = prosumer.last_unscheduled_buy_transaction
+        unscheduled_sell = prosumer.last_unscheduled_sell_transaction
+        self._perf.count_transactions(
+            int(scheduled_buy_ok and scheduled_buy_amount > 0),
+            int(scheduled_sell_ok and scheduled_sell_amount > 0),
+            int(unscheduled_buy is not None and unscheduled_buy[0] > 0),
+            int(unscheduled_sell is not None and unscheduled_sell[0] > 0),
+        )
+
+    def _count_batch_transactions(self, batch: TickBatch):
+        # the same counts for the ticks of a batch, see ml4trade.domain.kernel.scheduled_fills
+        n_ticks = len(batch.prices)
+        hours = (self._clock.cur_datetime.hour + np.arange(n_ticks)) % 24
+        actions = self._scheduled_actions
+        prices = np.asarray(batch.prices)
+        buy_ok = ~(prices > actions[48 + hours]) & (actions[hours] > 0)
+        sell_ok = ~(prices < actions[72 + hours]) & (actions[24 + hours] > 0)
+        self._perf.count_transactions(
+            int(buy_ok.sum()), int(sell_ok.sum()),
+            int((np.asarray(batch.records.unscheduled_buy) > 0).sum()),
+            int((np.asarray(batch.records.unscheduled_sell) > 0).sum()),
+        )
+
+    def perf_stats(self) -> dict:
+        # per phase calls, total time and p50/p99 of the call times, and transaction counts, see PerfStats
+        assert self._perf is not None, 'Create the environment with instrument=True to collect perf stats'
+        return self._perf.summary()
 
     def render(self):
         NotImplemented('Use render_all()!')
@@ -15,6 +15,6 @@ def calc_tick_offset(data_strategies: List[DataStrategy], scheduling_time: time)
 
 def dfs_are_long_enough(data_strategies: List[DataStrategy], start_datetime: datetime, end_datetime: datetime,
                         start_tick: int) -> bool:
-    dfs_lengths = [len(ds.df) for ds in data_strategies if ds.df is not None]
+    dfs_lengths = [ds.data_length for ds in data_strategies if ds.data_length is not None]
     episode_hour_length = timedelta_to_hours(end_datetime - start_datetime)
     return episode_hour_length + start_tick <= min(dfs_lengths)
@@ -0,0 +1,282 @@
+from datetime import timedelta, time, datetime
+from typing import Tuple, Dict, Optional, List, Union
+
+import numpy as np
+import gymnasium as gym
+from gymnasium.core import ObsType, ActType
+from gymnasium.utils import seeding
+from gymnasium.vector import VectorEnv
+
+from ml4trade.data_strategies import DataStrategy
+from ml4trade.domain.constants import SIMULATION_ENV_ACTION_SPACE
+from ml4trade.domain.kernel import simulate_ticks, draw_consume_first
+from ml4trade.domain.lookahead import Projection, TickBatch, RandomSource, project, rng_states, set_rng_states
+from ml4trade.domain.randomness import RandomStream
+from ml4trade.domain.units import Currency, MWh
+from ml4trade.domain.utils import setup_systems
+from ml4trade.utils import calc_tick_offset, dfs_are_long_enough
+
+
+def spawn_seeds(seed: Optional[int], n: int) -> List[int]:
+    return [int(s.generate_state(1, np.uint64)[0]) for s in np.random.SeedSequence(seed).spawn(n)]
+
+
+class VectorSimulationEnv(VectorEnv):
+    """N copies of SimulationEnv stepped together on NumPy arrays.
+
+    Sub-env `i` behaves exactly like a SimulationEnv reset with seed `spawn_seeds(seed, num_envs)[i]`.
+    All sub-envs share start and end datetimes, so their episodes are synchronized
+    and they are reset together once truncated.
+    """
+    # immutable properties
+    _start_tick: int
+    _start_datetime: datetime
+    _end_datetime: datetime
+    _prosumer_init_balance: float
+    _battery_init_charge: float
+    _battery_capacity: float
+    _battery_efficiency: float
+    _obs_sections: List[int]
+    # resetable properties, one entry per sub-env
+    _balance: np.ndarray
+    _charge: np.ndarray
+    _prev_prosumer_balance: np.ndarray
+    _prosumer_balance: np.ndarray
+    _scheduled_actions: Optional[np.ndarray]
+    _next_day_actions: Optional[np.ndarray]
+    _projection: Optional[Projection]
+    _first_actions_scheduled: bool
+    _first_actions_set: bool
+
+    def __init__(
+            self,
+            num_envs: int,
+            data_strategies: Dict[str, DataStrategy],
+            start_datetime: datetime,
+            end_datetime: datetime,
+            scheduling_time: time,
+            action_replacement_time: time,
+            prosumer_init_balance: Currency,
+            battery_capacity: MWh,
+            battery_init_charge: MWh,
+            battery_efficiency: float,
+            start_tick: int = None,
+            use_reward_penalties: bool = True,
+    ):
+        if data_strategies is None:
+            data_strategies = {}
+
+        obs_size = 2 + sum(map(lambda x: x.observation_size(), data_strategies.values()))
+        super().__init__(
+            num_envs,
+            gym.spaces.Box(low=-np.inf, high=np.inf, shape=(obs_size,), dtype=np.float32),
+            SIMULATION_ENV_ACTION_SPACE,
+        )
+        if start_tick is None:
+            start_tick = calc_tick_offset(list(data_strategies.values()), scheduling_time)
+            start_datetime += timedelta(hours=start_tick)
+        assert dfs_are_long_enough(list(data_strategies.values()), start_datetime, end_datetime, start_tick), \
+            'Provided dataframe is too short'
+
+        self._start_tick = start_tick
+        self._start_datetime = start_datetime
+        self._end_datetime = end_datetime
+        self._prosumer_init_balance = float(prosumer_init_balance.value)
+        self._battery_init_charge = float(battery_init_charge.value)
+        self._battery_capacity = float(battery_capacity.value)
+        self._battery_efficiency = battery_efficiency
+        self._use_reward_penalties = use_reward_penalties
+
+        (
+            self._clock,
+            _,
+            self._market,
+            self._production_system,
+            self._consumption_system
+        ) = setup_systems(data_strategies, self._start_tick, prosumer_init_balance,
+                          start_datetime, scheduling_time, action_replacement_time,
+                          battery_init_charge, battery_efficiency, battery_capacity)
+        market_end = self._market.ds.observation_size()
+        self._obs_sections = [market_end, market_end + self._production_system.ds.observation_size()]
+        # per sub-env streams used in place of SimulationEnv's consume first stream
+        # and of the consumption data strategy's stream
+        self._consume_first_streams: List[Optional[RandomStream]] = [None] * num_envs
+        self._consumption_streams: List[Optional[RandomStream]] = [None] * num_envs
+        self._actions = None
+        self.reset()
+
+    def reset(
+        self,
+        *,
+        seed: Optional[Union[int, List[int]]] = None,
+        options: Optional[dict] = None,
+    ) -> Tuple[ObsType, dict]:
+        if seed is not None or self._consume_first_streams[0] is None:
+            seeds = seed if isinstance(seed, (list, tuple)) else spawn_seeds(seed, self.num_envs)
+            assert len(seeds) == self.num_envs, 'Provide one seed per sub-env'
+            for i, s in enumerate(seeds):
+                np_random, s = seeding.np_random(s)
+                consumption_rng, _ = seeding.np_random(s)
+                self._consume_first_streams[i] = RandomStream(np_random, draw_consume_first)
+                self._consumption_streams[i] = self._consumption_system.ds.random_stream(consumption_rng)
+
+        self._balance = np.full(self.num_envs, self._prosumer_init_balance)
+        # the same options as SimulationEnv.reset, applied to all sub-envs
+        options = options or {}
+        charge = options.get('battery_charge_to_set')
+        self._charge = np.full(self.num_envs, self._battery_init_charge if charge is None else float(charge.value))
+        self._prosumer_balance = self._balance
+        self._prev_prosumer_balance = self._balance
+        self._scheduled_actions = None
+        self._next_day_actions = None
+        self._projection = None
+        self._first_actions_scheduled = False
+        self._first_actions_set = False
+        self._clock.tick_offset = options.get('tick_offset') or 0
+        self._clock.cur_datetime = self._start_datetime
+        self._clock.cur_tick = self._start_tick
+        self._day_prices: List[float] = []
+        self._day_energy_diffs: List[np.ndarray] = []
+        self._simulate()
+
+        return self._observation()[0], {}
+
+    def step_async(self, actions: ActType):
+        self._actions = actions
+
+    def step_wait(self, **kwargs) -> Tuple[ObsType, np.ndarray, np.ndarray, np.ndarray, dict]:
+        self._simulate(np.asarray(self._actions, dtype=np.float64))
+        self._actions = None
+        obs, rewards, truncated = self._observation()
+        terminateds = np.zeros(self.num_envs, dtype=bool)
+        truncateds = np.full(self.num_envs, truncated)
+
+        infos = {}
+        if truncated:
+            for i in range(self.num_envs):
+                infos = self._add_info(infos, {'final_observation': obs[i], 'final_info': {}}, i)
+            obs, _ = self.reset()
+        return obs, rewards, terminateds, truncateds, infos
+
+    def _simulate(self, actions: Optional[np.ndarray] = None):
+        # mirrors SimulationEnv.__simulation between two consecutive yields
+        if actions is not None:
+            self._next_day_actions = actions
+            self._first_actions_scheduled = True
+        elif self._clock.is_it_scheduling_hour():
+            return
+
+        ticks, hours = [], []
+        while True:
+            if self._clock.is_it_action_replacement_hour() and self._first_actions_scheduled:
+                self._run_ticks(ticks, hours)
+                ticks, hours = [], []
+                self._scheduled_actions = self._next_day_actions
+                self._next_day_actions = None
+                self._prev_prosumer_balance = self._prosumer_balance
+                self._prosumer_balance = self._balance
+                self._first_actions_set = True
+
+            # the data is read `tick_offset` ticks ahead of the clock
+            data_tick = self._clock.cur_tick + self._clock.tick_offset
+            if self._first_actions_set:
+                ticks.append(data_tick)
+                hours.append(self._clock.cur_datetime.hour)
+            else:
+                self._day_prices.append(self._market.ds.process(data_tick))
+                self._day_energy_diffs.append(np.zeros(self.num_envs))
+
+            self._clock.tick()
+            if self._clock.is_it_scheduling_hour():
+                break
+        self._run_ticks(ticks, hours)
+        # two days are enough to look up the last full day
+        del self._day_prices[:-48]
+        del self._day_energy_diffs[:-48]
+
+    def _run_ticks(self, ticks: List[int], hours: List[int]):
+        if not ticks:
+            return
+        projection, self._projection = self._projection, None
+        if projection is not None and len(projection.batch.prices) <= len(ticks) and projection.matches(
+                ticks[0], self._balance, self._charge, self._scheduled_actions, rng_states(self._rngs())):
+            set_rng_states(self._rngs(), projection.next_rng_states)
+            self._record_ticks(projection.batch)
+            n_projected = len(projection.batch.prices)
+            ticks, hours = ticks[n_projected:], hours[n_projected:]
+            if not ticks:
+                return
+        self._record_ticks(self._simulate_ticks(ticks, hours))
+
+    def _simulate_ticks(self, ticks: List[int], hours: List[int]) -> TickBatch:
+        ticks, hours = np.array(ticks), np.array(hours)
+        prices = self._market.ds.process_batch(ticks)
+        production = self._production_system.ds.process_batch(ticks)
+        consumption = np.stack([self._consumption_system.ds.process_batch(hours, stream)
+                                for stream in self._consumption_streams])
+        consume_first = np.stack([stream.take(len(ticks)) for stream in self._consume_first_streams])
+        actions = self._scheduled_actions
+        records = simulate_ticks(
+            self._balance, self._charge,
+            self._battery_capacity, self._battery_efficiency,
+            prices, production, consumption, consume_first,
+            actions[:, hours], actions[:, 48 + hours], actions[:, 24 + hours], actions[:, 72 + hours],
+        )
+        return TickBatch(prices, production, consumption, records)
+
+    def _record_ticks(self, batch: TickBatch):
+        self._balance = batch.records.balance[:, -1]
+        self._charge = batch.records.charge[:, -1]
+        self._day_prices.extend(batch.prices.tolist())
+        self._day_energy_diffs.extend((batch.production - batch.consumption).T)
+
+    def _rngs(self) -> List[RandomSource]:
+        return [s for s in self._consume_first_streams + self._consumption_streams if s is not None]
+
+    def _dry_simulation(self, ticks: int) -> np.ndarray:
+        # same lookahead as SimulationEnv._dry_simulation
+        if not self._first_actions_set:
+            return self._charge / self._battery_capacity
+        start_tick = self._clock.cur_tick + self._clock.tick_offset
+        start_hour = self._clock.cur_datetime.hour
+        self._projection = project(
+            self._rngs(), start_tick, self._balance, self._charge, self._scheduled_actions,
+            lambda: self._simulate_ticks(
+                list(range(start_tick, start_tick + ticks)),
+                [(start_hour + i) % 24 for i in range(ticks)],
+            ),
+        )
+        return self._projection.batch.records.charge[:, -1] / self._battery_capacity
+
+    def _observation(self) -> Tuple[ObsType, np.ndarray, bool]:
+        obs = np.empty(self.observation_space.shape, dtype=np.float32)
+        # the data observations are shared by all sub-environments
+        market_obs, production_obs, consumption_obs = np.split(obs[0, :-2], self._obs_sections)
+        self._market.observation_into(market_obs)
+        self._production_system.observation_into(production_obs)
+        self._consumption_system.observation_into(consumption_obs)
+        obs[1:, :-2] = obs[0, :-2]
+        obs[:, -2] = self._charge / self._battery_capacity
+        obs[:, -1] = self._dry_simulation(24 - self._clock.scheduling_time.hour)
+        reward = self._calculate_reward()
+        truncated = self._end_datetime <= self._clock.cur_datetime
+        return obs, reward, truncated
+
+    def _calculate_reward(self) -> np.ndarray:
+        potential_profit = 0
+        if self._use_reward_penalties:
+            potential_profit = self._last_day_potential_profit()
+        return (self._prosumer_balance - self._prev_prosumer_balance) - potential_profit
+
+    def _last_day_potential_profit(self) -> Union[np.ndarray, int]:
+        # same as History._last_day_summary which
+        # requires 72 simulated ticks (see History._has_1day_of_history)
+        if self._clock.cur_tick - self._start_tick < 72:
+            return 0
+        end_idx = len(self._day_prices) - self._clock.cur_datetime.hour
+        avg_price = sum(self._day_prices[end_idx - 24:end_idx]) / 24
+        extra_produced = sum(self._day_energy_diffs[end_idx - 24:end_idx])
+        return extra_produced * avg_price
+
+    def get_wallet_balance(self) -> np.ndarray:
+        return self._balance
@@ -0,0 +1,17 @@
+import argparse
+
+from ml4trade.history import convert_json_history
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert histories saved as json to the binary format.')
+    parser.add_argument('paths', nargs='+', help='env_history.json files')
+    parser.add_argument('--out', default=None, help='output directory, only with a single path')
+    args = parser.parse_args()
+    assert args.out is None or len(args.paths) == 1, '--out can only be used with a single path'
+    for path in args.paths:
+        print(f'{path} -> {convert_json_history(path, args.out)}')
+
+
+if __name__ == '__main__':
+    main()
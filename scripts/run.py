@@ -1,5 +1,4 @@
-import os
-from typing import List, Dict, Tuple
+from typing import Dict, Tuple
 
 from datetime import datetime, time, timedelta
 
@@ -9,37 +8,23 @@ import hydra
 from omegaconf import DictConfig, OmegaConf
 import quantstats as qs
 
-from ml4trade.data_strategies import ImgwDataStrategy, HouseholdEnergyConsumptionDataStrategy, PricesPlDataStrategy, imgw_col_ids
+from ml4trade.data_strategies import ImgwDataStrategy, HouseholdEnergyConsumptionDataStrategy, PricesPlDataStrategy
+from ml4trade.datasets import load_dataset, list_files
 from ml4trade.simulation_env import SimulationEnv
 from ml4trade.domain.units import *
 
 
-def get_all_csv_filenames(path: str) -> List[str]:
-    return [f for f in os.listdir(path) if f.endswith('.csv')]
-
-
 def setup_sim_env(cfg: DictConfig) -> (SimulationEnv, SimulationEnv):
     orig_cwd = hydra.utils.get_original_cwd()
 
-    weather_data_path = f'{orig_cwd}/../data/.data/weather_unzipped_flattened'
-    filenames = get_all_csv_filenames(weather_data_path)
-    dfs = []
-    for f in filenames:
-        df = pd.read_csv(f'{weather_data_path}/{f}', header=None, encoding='cp1250',
-                         names=imgw_col_ids.keys(), usecols=imgw_col_ids.values())
-        dfs.append(df)
-    weather_df: pd.DataFrame = pd.concat(dfs, axis=0, ignore_index=True)
-    del dfs
-    # 352200375 - station_code for Warszawa Okecie
-    weather_df = weather_df.loc[weather_df['code'] == 352200375]
-    weather_df.sort_values(by=['year', 'month', 'day', 'hour'], inplace=True)
-    weather_df.fillna(method='bfill', inplace=True)
-
-    prices_pl_path = f'{orig_cwd}/../data/.data/prices_pl.csv'
-    prices_df: pd.DataFrame = pd.read_csv(prices_pl_path, header=0)
-    prices_df.fillna(method='bfill', inplace=True)
-
-    prices_df['index'] = pd.to_datetime(prices_df['index'])
+    # built on the first launch, later launches load it from data/.data/cache
+    data_path = f'{orig_cwd}/../data/.data'
+    weather_df, prices_df = load_dataset(
+        list_files(f'{data_path}/weather', '.zip'),
+        f'{data_path}/prices_pl.csv',
+        cache_dir=f'{data_path}/cache',
+    )
+
     avg_month_prices: Dict[Tuple[int, int], float] = prices_df.groupby(
         [prices_df['index'].dt.year.rename('year'), prices_df['index'].dt.month.rename('month')]
     )['Fixing I Price [PLN/MWh]'].mean().to_dict()
@@ -9,6 +9,7 @@ setup(
     description='Machine learning for trading',
     packages=find_packages(),
     install_requires=[
+        'numpy >= 1.20.0',
         'gymnasium',
         'pandas >= 1.3.5',
         'matplotlib >= 3.5.3',
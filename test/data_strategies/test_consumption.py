@@ -1,5 +1,8 @@
 import unittest
 
+import numpy as np
+
+from ml4trade.data_strategies import HouseholdEnergyConsumptionDataStrategy
 from ml4trade.domain.units import MWh
 from utils import setup_default_consumption_system, setup_default_clock
 
@@ -33,6 +36,14 @@ class TestConsumption(unittest.TestCase):
         data_length = len(consumption_system.ds.energy_consumption_MWh)
         self.assertEqual(data_length, 48)
 
+    def test_process_without_stream_is_deprecated(self):
+        ds = HouseholdEnergyConsumptionDataStrategy()
+        with self.assertWarns(DeprecationWarning):
+            ds.set_seed(0)
+        with self.assertWarns(DeprecationWarning):
+            value = ds.process(3)
+        self.assertEqual(value, ds.process(3, ds.random_stream(np.random.default_rng(0))))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,100 @@
+import pickle
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from ml4trade.data_strategies import (
+    ImgwDataStrategy, ImgwWindDataStrategy, ImgwSolarDataStrategy, PricesPlDataStrategy,
+)
+from ml4trade.domain.units import MW
+from ml4trade.misc.norm_ds_wrapper import MarketWrapper, WeatherWrapper, ConsumptionWrapper, DummyWrapper
+from utils import setup_default_data_strategies, setup_default_simulation_env, weather_data_path
+
+
+class TestObservationInto(unittest.TestCase):
+    def setUp(self):
+        self.data_strategies = setup_default_data_strategies()
+        weather_df = pd.read_csv(weather_data_path, header=None, encoding='cp1250')
+        self.data_strategies['wind'] = ImgwWindDataStrategy(weather_df, 24, MW(0.001), 12)
+        self.data_strategies['imgw'] = ImgwDataStrategy(weather_df, 24, MW(0.001), 0.2, MW(0.001), 12)
+
+    def _assert_same_observation(self, ds, idx: int):
+        out = np.empty(ds.observation_size(), dtype=np.float32)
+        ds.observation_into(out, idx)
+        np.testing.assert_array_equal(out, np.array(ds.observation(idx), dtype=np.float32))
+
+    def test_data_strategies(self):
+        for name, ds in self.data_strategies.items():
+            with self.subTest(name):
+                for idx in (10, 34, 58):
+                    self._assert_same_observation(ds, idx)
+
+    def test_wrappers(self):
+        wrappers = [
+            MarketWrapper(self.data_strategies['market']),
+            WeatherWrapper(self.data_strategies['production']),
+            WeatherWrapper(self.data_strategies['wind']),
+            ConsumptionWrapper(self.data_strategies['consumption']),
+            DummyWrapper(self.data_strategies['market']),
+        ]
+        for wrapper in wrappers:
+            with self.subTest(type(wrapper).__name__):
+                for idx in (10, 34, 58):
+                    self._assert_same_observation(wrapper, idx)
+
+    def test_market_wrapper_constant_window(self):
+        prices = np.arange(96, dtype=np.float64)
+        prices[24:72] = 100
+        wrapper = MarketWrapper(PricesPlDataStrategy(pd.DataFrame({'date': 0, 'price': prices})))
+        for idx in (34, 58):
+            np.testing.assert_array_equal(wrapper.observation(idx), np.zeros(24))
+        obs = wrapper.observation(20)
+        self.assertEqual((obs[0], obs[-1]), (0, 1))
+
+    def test_wrapper_observations_are_precomputed(self):
+        wrappers = [
+            MarketWrapper(self.data_strategies['market']),
+            WeatherWrapper(self.data_strategies['production']),
+            ConsumptionWrapper(self.data_strategies['consumption']),
+        ]
+        for wrapper in wrappers:
+            with self.subTest(type(wrapper).__name__):
+                obs = wrapper.observation(34)
+                self.assertFalse(obs.flags.writeable)
+                self.assertIs(wrapper.observation(34).base, obs.base)
+                copy = pickle.loads(pickle.dumps(wrapper))
+                for attr in wrapper._derived_attrs:
+                    self.assertNotIn(attr, wrapper.__getstate__())
+                np.testing.assert_array_equal(copy.observation(34), obs)
+
+    def test_observation_is_view_of_column(self):
+        for name in ('market', 'production', 'wind'):
+            with self.subTest(name):
+                ds = self.data_strategies[name]
+                self.assertFalse(hasattr(ds, 'df'))
+                self.assertTrue(ds.col.flags.owndata)
+                obs = ds.observation(34)
+                self.assertTrue(np.shares_memory(obs, ds.col))
+                self.assertFalse(obs.flags.writeable)
+
+    def test_float32_columns(self):
+        weather_df = pd.read_csv(weather_data_path, header=None, encoding='cp1250')
+        ds64 = ImgwSolarDataStrategy(weather_df, 24, MW(0.001), 0.2)
+        ds32 = ImgwSolarDataStrategy(weather_df, 24, MW(0.001), 0.2, dtype=np.float32)
+        self.assertEqual(ds32.col.dtype, np.float32)
+        self.assertEqual(ds32.col.nbytes * 2, ds64.col.nbytes)
+        np.testing.assert_array_equal(ds32.observation(34), ds64.observation(34))
+        self.assertEqual(ds32.data_length, len(weather_df))
+
+    def test_env_observation(self):
+        env = setup_default_simulation_env()
+        obs, _ = env.reset(seed=0)
+        self.assertEqual(obs.dtype, np.float32)
+        self.assertEqual(obs.shape, env.observation_space.shape)
+        next_obs = env.step(env.action_space.sample())[0]
+        self.assertFalse(np.shares_memory(obs, next_obs))
+
+
+if __name__ == '__main__':
+    unittest.main()
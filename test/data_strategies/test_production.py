@@ -1,9 +1,10 @@
 import os
 import unittest
 
+import numpy as np
 import pandas as pd
 
-from ml4trade.data_strategies import ImgwWindDataStrategy, ImgwSolarDataStrategy, imgw_col_ids
+from ml4trade.data_strategies import ImgwDataStrategy, ImgwWindDataStrategy, ImgwSolarDataStrategy, imgw_col_ids
 from ml4trade.domain.production import ProductionSystem
 from ml4trade.domain.units import MWh, MW
 
@@ -34,7 +35,33 @@ class TestProduction(unittest.TestCase):
     def test_observation_frame(self):
         ds = self.solarDs
         scheduling_hour = 10
-        self.assertListEqual(self.df.iloc[24:48, ds.col_idx].tolist(), ds.observation(scheduling_hour))
+        self.assertListEqual(self.df.iloc[24:48, ds.col_idx].tolist(), ds.observation(scheduling_hour).tolist())
+
+    def test_production_series(self):
+        cloudiness = self.df.iloc[:, self.solarDs.col_idx].to_numpy()
+        wind_speed = self.df.iloc[:, self.windDs.col_idx].to_numpy()
+        expected_solar = [0.001 * (1 - min(c, 8) / 8) * 0.2 for c in cloudiness]
+        expected_wind = [0 if w > 11 or w < 0 else w * 0.01 / 11 for w in wind_speed]
+        self.assertListEqual(self.solarDs.production.tolist(), expected_solar)
+        self.assertListEqual(self.windDs.production.tolist(), expected_wind)
+        self.assertEqual(self.solarDs.process(30), expected_solar[30])
+        idx = np.arange(5, 50)
+        np.testing.assert_array_equal(self.windDs.process_batch(idx), np.array(expected_wind)[idx])
+
+    def test_production_recomputed_on_parameter_change(self):
+        ds = ImgwDataStrategy(self.df, 24, MW(0.001), 0.2, MW(0.01), 11)
+        np.testing.assert_array_equal(ds.production, self.solarDs.production + self.windDs.production)
+        solar_production = ds.imgwSolarDataStrategy.production
+        self.assertIs(ds.imgwSolarDataStrategy.production, solar_production)
+
+        ds.imgwSolarDataStrategy.solar_efficiency = 0.4
+        np.testing.assert_allclose(ds.imgwSolarDataStrategy.production, 2 * solar_production)
+        ds.imgwWindDataStrategy.max_wind_speed = 100
+        self.assertTrue((ds.imgwWindDataStrategy.production <= 0.01 * 20 / 100).all())
+        np.testing.assert_array_equal(
+            ds.production, ds.imgwSolarDataStrategy.production + ds.imgwWindDataStrategy.production,
+        )
+        self.assertEqual(ds.process(7), ds.production[7])
 
 
 if __name__ == '__main__':
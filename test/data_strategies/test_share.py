@@ -0,0 +1,111 @@
+import multiprocessing
+import os
+import pickle
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from ml4trade.data_strategies import ImgwDataStrategy
+from ml4trade.domain.units import MW
+from ml4trade.misc.norm_ds_wrapper import MarketWrapper, WeatherWrapper
+from utils import setup_default_data_strategies, setup_default_simulation_env, weather_data_path
+
+
+def _process_in_worker(ds, idx: int) -> float:
+    return ds.process(idx)
+
+
+def _is_mapped(array: np.ndarray) -> bool:
+    while array is not None and not isinstance(array, np.memmap):
+        array = array.base
+    return array is not None
+
+
+class TestShare(unittest.TestCase):
+    def setUp(self):
+        self.data_strategies = setup_default_data_strategies()
+
+    def tearDown(self):
+        for ds in self.data_strategies.values():
+            ds.close()
+
+    def test_pickled_strategy_maps_shared_column(self):
+        ds = self.data_strategies['market']
+        size = len(pickle.dumps(ds))
+        ds.share()
+        self.assertLess(len(pickle.dumps(ds)), size // 4)
+
+        copy = pickle.loads(pickle.dumps(ds))
+        self.assertFalse(copy.col.flags.writeable)
+        np.testing.assert_array_equal(copy.col, ds.col)
+        np.testing.assert_array_equal(copy.observation(30), ds.observation(30))
+
+    def test_pickled_strategies_map_derived_arrays(self):
+        market = MarketWrapper(self.data_strategies['market'])
+        weather = WeatherWrapper(self.data_strategies['production'])
+        production = ImgwDataStrategy(
+            pd.read_csv(weather_data_path, header=None, encoding='cp1250'), window_size=24,
+            max_solar_power=MW(0.001), solar_efficiency=0.2, max_wind_power=MW(0.001), max_wind_speed=10,
+        )
+        expected = (
+            market.observation(30), market.features.max(100, 24), weather.observation(30), production.process(30),
+        )
+        for ds in (market, weather, production):
+            ds.share()
+        for ds in (market, weather):
+            # neither the column nor any of the larger derived arrays are copied
+            self.assertLess(len(pickle.dumps(ds)), ds.ds.col.nbytes)
+
+        originals = (market, weather, production)
+        market, weather, production = pickle.loads(pickle.dumps(originals))
+        for array in (
+            market._scaled_windows, market.features.values, market.features._sums,
+            market.features.rolling_max(24), weather._standardized, weather._standardized_windows,
+            production._production, production.imgwSolarDataStrategy._production,
+            production.imgwWindDataStrategy._production,
+        ):
+            self.assertTrue(_is_mapped(array))
+        # the sum isn't recomputed from the productions it is mapped along with
+        self.assertIs(production.production, production._production)
+        np.testing.assert_array_equal(market.observation(30), expected[0])
+        self.assertEqual(market.features.max(100, 24), expected[1])
+        np.testing.assert_array_equal(weather.observation(30), expected[2])
+        self.assertEqual(production.process(30), expected[3])
+        for ds in originals:
+            ds.close()
+
+    def test_same_simulation_with_shared_strategies(self):
+        rewards = []
+        for share in (False, True):
+            data_strategies = setup_default_data_strategies()
+            if share:
+                for ds in data_strategies.values():
+                    ds.share()
+                data_strategies = pickle.loads(pickle.dumps(data_strategies))
+            env = setup_default_simulation_env(data_strategies)
+            env.reset(seed=0)
+            rewards.append([env.step(np.full(96, 0.5, dtype=np.float32))[1] for _ in range(3)])
+            for ds in data_strategies.values():
+                ds.close()
+        self.assertEqual(rewards[0], rewards[1])
+
+    def test_close_removes_file(self):
+        ds = self.data_strategies['production']
+        ds.share()
+        path = ds._shared.path
+        self.assertTrue(os.path.exists(path))
+        ds.close()
+        self.assertFalse(os.path.exists(path))
+        # copies made after close() carry the column again
+        self.assertEqual(pickle.loads(pickle.dumps(ds)).process(30), ds.process(30))
+
+    def test_worker_process(self):
+        ds = MarketWrapper(self.data_strategies['market'])
+        ds.share()
+        with multiprocessing.get_context('spawn').Pool(1) as pool:
+            self.assertEqual(pool.apply(_process_in_worker, (ds, 30)), ds.process(30))
+
+
+if __name__ == '__main__':
+    unittest.main()
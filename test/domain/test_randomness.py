@@ -0,0 +1,54 @@
+import unittest
+
+import numpy as np
+
+from ml4trade.domain.kernel import draw_consume_first
+from ml4trade.domain.randomness import RandomStream
+
+
+def _draw_normal(rng: np.random.Generator, n: int) -> np.ndarray:
+    return rng.normal(0, 0.03, size=n)
+
+
+class TestRandomStream(unittest.TestCase):
+    def test_same_values_as_scalar_draws(self):
+        rng = np.random.default_rng(0)
+        expected = [rng.normal(0, 0.03) for _ in range(100)]
+
+        stream = RandomStream(np.random.default_rng(0), _draw_normal, block_size=16)
+        values = [stream.next() for _ in range(10)]
+        values.extend(stream.take(40).tolist())
+        values.extend(stream.next() for _ in range(25))
+        values.extend(stream.take(25).tolist())
+        self.assertEqual(values, expected)
+
+    def test_consume_first_matches_shuffle(self):
+        rng = np.random.default_rng(0)
+        expected = []
+        for _ in range(50):
+            fs = ['consume', 'produce']
+            rng.shuffle(fs)
+            expected.append(fs[0] == 'consume')
+
+        stream = RandomStream(np.random.default_rng(0), draw_consume_first, block_size=8)
+        self.assertEqual([bool(stream.next()) for _ in range(50)], expected)
+
+    def test_restore_state(self):
+        stream = RandomStream(np.random.default_rng(0), _draw_normal, block_size=16)
+        stream.take(10)
+        state = stream.state
+        values = stream.take(12).tolist()
+        stream.state = state
+        self.assertEqual(stream.take(12).tolist(), values)
+
+    def test_restore_state_too_far_behind(self):
+        stream = RandomStream(np.random.default_rng(0), _draw_normal, block_size=16)
+        state = stream.state
+        for _ in range(5):
+            stream.take(20)
+        with self.assertRaises(AssertionError):
+            stream.state = state
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import pickle
+import unittest
+
+from ml4trade.domain.units import MWh, MW, Currency, set_debug_units, debug_units_enabled
+
+
+class TestUnits(unittest.TestCase):
+    def test_value_semantics(self):
+        self.assertEqual(MWh(1.5), MWh(1.5))
+        self.assertNotEqual(MWh(1.5), Currency(1.5))
+        self.assertEqual(hash(Currency(2)), hash(Currency(2)))
+        self.assertEqual(repr(MW(3)), 'MW(value=3)')
+        self.assertEqual(pickle.loads(pickle.dumps(MWh(0.25))), MWh(0.25))
+
+    def test_arithmetic(self):
+        self.assertEqual(MWh(1) + MWh(2), MWh(3))
+        self.assertEqual(MWh(2).to_cost(Currency(10)), Currency(20))
+        self.assertEqual(MWh(1) / MWh(4), 0.25)
+        self.assertEqual(sum([Currency(1), Currency(2)]), Currency(3))
+        self.assertTrue(MWh(0) <= MWh(1) < MWh(2))
+
+
+class TestDebugUnits(unittest.TestCase):
+    def setUp(self):
+        set_debug_units(True)
+
+    def tearDown(self):
+        set_debug_units(False)
+
+    def test_enabled(self):
+        self.assertTrue(debug_units_enabled())
+
+    def test_rejects_mixed_units(self):
+        with self.assertRaises(TypeError):
+            MWh(1) + Currency(1)
+        with self.assertRaises(TypeError):
+            Currency(1) < MWh(1)
+        with self.assertRaises(TypeError):
+            MWh(1) * MWh(1)
+        with self.assertRaises(TypeError):
+            MWh(Currency(1))
+
+    def test_accepts_matching_units(self):
+        self.assertEqual(MWh(1) + MWh(2), MWh(3))
+        self.assertEqual(MWh(1) / MWh(4), 0.25)
+        self.assertEqual(MWh(1) / 4, MWh(0.25))
+        self.assertEqual(Currency(2) * 2.0, Currency(4))
+
+    def test_immutable(self):
+        with self.assertRaises(AttributeError):
+            MWh(1).value = 2
+
+    def test_disable_restores_unchecked_operations(self):
+        set_debug_units(False)
+        self.assertEqual((MWh(1) + Currency(1)).value, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
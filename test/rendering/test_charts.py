@@ -0,0 +1,58 @@
+import json
+import unittest
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from ml4trade.history import History
+from ml4trade.rendering.charts import render_all, _history_to_df, _scheduled_successes
+from utils import rendering_data_paths
+
+
+class TestCharts(unittest.TestCase):
+    def setUp(self) -> None:
+        plt.show = lambda: ...
+        self.history_df = History.load(rendering_data_paths[0]).to_dataframe()
+
+    def tearDown(self) -> None:
+        plt.close('all')
+
+    def test_scheduled_successes(self):
+        df = self.history_df
+        buys, sells = _scheduled_successes(df)
+        expected_buys = df.apply(
+            lambda row: row['scheduled_buy_amount']
+            if row['scheduled_buy_threshold'] >= row['price'] and row['scheduled_buy_amount'] > 0 else np.nan,
+            axis=1,
+        )
+        expected_sells = df.apply(
+            lambda row: row['scheduled_sell_amount']
+            if row['scheduled_sell_threshold'] <= row['price'] and row['scheduled_sell_amount'] > 0 else np.nan,
+            axis=1,
+        )
+        np.testing.assert_array_equal(buys.to_numpy(), expected_buys.to_numpy())
+        np.testing.assert_array_equal(sells.to_numpy(), expected_sells.to_numpy())
+        self.assertTrue(buys.notna().any())
+
+    def test_history_rows_to_df(self):
+        with open(rendering_data_paths[0]) as f:
+            rows = json.load(f)
+        df = _history_to_df(rows)
+        for kind in ('buy', 'sell'):
+            pairs = [row[f'unscheduled_{kind}_amount'] for row in rows if f'unscheduled_{kind}_amount' in row]
+            amounts = df[f'unscheduled_{kind}_amount'].dropna()
+            np.testing.assert_array_equal(amounts.to_numpy(), [p[0] for p in pairs])
+            self.assertListEqual(df[f'unscheduled_{kind}_success'].dropna().tolist(), [p[1] for p in pairs])
+
+    def test_render_all(self):
+        for last_n_days, n_days_offset in ((2, 0), (7, 3)):
+            render_all(self.history_df, last_n_days, n_days_offset)
+            axs = plt.gcf().axes
+            battery = axs[1].lines[-1]
+            end = self.history_df[self.history_df['price'].notna()].index[-1] - np.timedelta64(n_days_offset, 'D')
+            self.assertEqual(battery.get_xdata()[-1], end)
+            self.assertEqual(len(battery.get_xdata()), last_n_days * 24 + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from ml4trade.rendering import decimation, set_decimation
+from ml4trade.rendering.charts import render_all, render_profits_comparison
+from ml4trade.rendering.decimation import minmax_indices, lttb_indices
+
+
+def _series(n: int) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return np.cumsum(rng.normal(0, 1, n)) + 50 * np.sin(np.arange(n) / 500)
+
+
+class TestDecimation(unittest.TestCase):
+    def setUp(self) -> None:
+        plt.show = lambda: ...
+
+    def tearDown(self) -> None:
+        set_decimation()
+        plt.close('all')
+
+    def test_minmax_keeps_extremes(self):
+        y = _series(50_000)
+        y[1234] = 1e6
+        y[40_000] = -1e6
+        idx = minmax_indices(y, 1000)
+        self.assertLessEqual(len(idx), 1002)
+        self.assertTrue(np.all(np.diff(idx) > 0))
+        self.assertIn(1234, idx)
+        self.assertIn(40_000, idx)
+        self.assertEqual((idx[0], idx[-1]), (0, len(y) - 1))
+        # the extremes of every bucket are kept
+        buckets = np.array_split(y, 100)
+        decimated = np.array_split(np.arange(len(y)), 100)
+        for bucket, positions in zip(buckets, decimated):
+            kept = y[np.intersect1d(idx, positions)]
+            self.assertEqual(kept.min(), bucket.min())
+            self.assertEqual(kept.max(), bucket.max())
+
+    def test_minmax_skips_nan(self):
+        y = _series(10_000)
+        y[:3000] = np.nan
+        idx = minmax_indices(y, 500)
+        self.assertFalse(np.isnan(y[idx]).any())
+        self.assertEqual(y[idx].max(), np.nanmax(y))
+
+    def test_lttb(self):
+        y = _series(20_000)
+        x = np.arange(len(y), dtype=np.float64)
+        idx = lttb_indices(x, y, 800)
+        self.assertEqual(len(idx), 800)
+        self.assertTrue(np.all(np.diff(idx) > 0))
+        self.assertEqual((idx[0], idx[-1]), (0, len(y) - 1))
+        np.testing.assert_array_equal(lttb_indices(x[:500], y[:500], 800), np.arange(500))
+
+    def test_plots_are_decimated_above_threshold(self):
+        index = pd.date_range('2020-01-01', periods=5 * 365 * 24, freq='h')
+        history = pd.DataFrame({'wallet_balance': _series(len(index))}, index=index)
+        history['potential_profit'] = 0.1
+        for threshold, method in ((decimation.DEFAULT_THRESHOLD, 'minmax'), (1000, 'lttb'), (None, 'minmax')):
+            with self.subTest(threshold=threshold, method=method):
+                set_decimation(threshold, method)
+                render_profits_comparison(([history, history * 1.1], {'label': 'runs'}))
+                ax = plt.gcf().axes[0]
+                line = ax.lines[0]
+                if threshold is None:
+                    self.assertEqual(len(line.get_xdata()), len(index))
+                else:
+                    self.assertLessEqual(len(line.get_xdata()), 2 * ax.bbox.width + 2)
+                    if method == 'minmax':
+                        means = np.vstack([history['wallet_balance'], history['wallet_balance'] * 1.1]).mean(axis=0)
+                        self.assertEqual(max(line.get_ydata()), means.max())
+                        self.assertEqual(min(line.get_ydata()), means.min())
+                plt.close('all')
+
+    def test_short_series_are_not_decimated(self):
+        index = pd.date_range('2020-01-01', periods=1000, freq='h')
+        history = pd.DataFrame({
+            c: _series(len(index)) for c in (
+                'price', 'wallet_balance', 'rel_battery', 'energy_produced', 'energy_consumed',
+                'scheduled_buy_amount', 'scheduled_sell_amount', 'scheduled_buy_threshold',
+                'scheduled_sell_threshold', 'unscheduled_buy_amount', 'unscheduled_sell_amount',
+                'potential_profit', 'price_diff_profit',
+            )
+        }, index=index)
+        render_all(history, last_n_days=30)
+        self.assertEqual(len(plt.gcf().axes[0].lines[0].get_xdata()), len(index))
+
+
+if __name__ == '__main__':
+    unittest.main()
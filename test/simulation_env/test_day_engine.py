@@ -0,0 +1,56 @@
+import unittest
+from datetime import timedelta
+
+import numpy as np
+
+from ml4trade.domain.constants import START_TIME
+from ml4trade.misc.interval_wrapper import IntervalWrapper
+from utils import setup_default_simulation_env, random_actions
+
+
+class TestDayEngine(unittest.TestCase):
+    def _assert_results_equal(self, res_tick, res_day):
+        np.testing.assert_array_equal(res_tick[0], res_day[0])
+        self.assertEqual(res_tick[1:], res_day[1:])
+
+    def _assert_engines_match(self, env_tick, env_day, n_steps: int = 20, seed: int = 0):
+        self._assert_results_equal(env_tick.reset(seed=seed), env_day.reset(seed=seed))
+        rng = np.random.default_rng(seed)
+        for _ in range(n_steps):
+            action = random_actions(rng)
+            res_tick = env_tick.step(action)
+            res_day = env_day.step(action)
+            self._assert_results_equal(res_tick, res_day)
+            self.assertListEqual(env_tick.unwrapped.history._history, env_day.unwrapped.history._history)
+            if res_tick[3]:
+                self._assert_results_equal(env_tick.reset(), env_day.reset())
+        env_tick, env_day = env_tick.unwrapped, env_day.unwrapped
+        self.assertEqual(env_tick.get_wallet_balance(), env_day.get_wallet_balance())
+        self.assertEqual(env_tick._prosumer.battery.current_charge, env_day._prosumer.battery.current_charge)
+
+    def test_matches_tick_engine(self):
+        kwargs = dict(end_datetime=START_TIME + timedelta(days=10), battery_efficiency=0.9)
+        self._assert_engines_match(
+            setup_default_simulation_env(**kwargs),
+            setup_default_simulation_env(**kwargs, engine='day'),
+        )
+
+    def test_matches_tick_engine_starting_at_scheduling_hour(self):
+        kwargs = dict(start_datetime=START_TIME + timedelta(days=1), start_tick=24)
+        self._assert_engines_match(
+            setup_default_simulation_env(**kwargs),
+            setup_default_simulation_env(**kwargs, engine='day'),
+            n_steps=5,
+        )
+
+    def test_matches_tick_engine_with_interval_wrapper(self):
+        kwargs = dict(end_datetime=START_TIME + timedelta(days=14))
+        wrapper_kwargs = dict(interval=timedelta(days=3), randomly_set_battery=True, randomly_shift_obs=True)
+        self._assert_engines_match(
+            IntervalWrapper(setup_default_simulation_env(**kwargs), **wrapper_kwargs),
+            IntervalWrapper(setup_default_simulation_env(**kwargs, engine='day'), **wrapper_kwargs),
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,7 @@
 import unittest
+from unittest.mock import patch
 
+from ml4trade.domain.lookahead import rng_states
 from utils import setup_default_simulation_env
 
 
@@ -44,6 +46,43 @@ class TestDrySimulation(unittest.TestCase):
         )
         self.assertEqual(state_before, state_after)
 
+    def test_does_not_advance_rng(self):
+        env = setup_default_simulation_env()
+        env.reset(seed=0)
+        env.step(env.action_space.sample())
+        states_before = rng_states(env._rngs())
+        env._dry_simulation(24 - 10)
+        states_after = rng_states(env._rngs())
+        self.assertEqual(states_before, states_after)
+
+    def test_predicts_charge_reached_by_simulation(self):
+        for engine in ('tick', 'day'):
+            env = setup_default_simulation_env(engine=engine)
+            env.reset(seed=0)
+            env.step(env.action_space.sample())
+            predicted_rel_battery_charge = env._dry_simulation(24 - 10)
+            env.step(env.action_space.sample())
+            # the last tick before midnight
+            last_idx = env.history._cur_tick_to_idx() - 11
+            self.assertEqual(predicted_rel_battery_charge, env.history[last_idx]['rel_battery'])
+
+    def test_projection_is_reused(self):
+        env = setup_default_simulation_env(engine='day')
+        env.reset(seed=0)
+        env.step(env.action_space.sample())
+        projection = env._projection
+        self.assertIsNotNone(projection)
+        with patch.object(env, '_simulate_ticks', wraps=env._simulate_ticks) as simulate_ticks:
+            env.step(env.action_space.sample())
+        # hours after midnight and the next projection, the ones before midnight were projected
+        self.assertEqual(simulate_ticks.call_count, 2)
+        self.assertIsNot(env._projection, projection)
+        cur_idx = env.history._cur_tick_to_idx()
+        self.assertListEqual(
+            [row['rel_battery'] for row in env.history[cur_idx - 24:cur_idx - 10]],
+            [c / env._prosumer.battery.capacity.value for c in projection.batch.records.charge],
+        )
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+from datetime import timedelta
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from ml4trade.domain.constants import START_TIME
+from ml4trade.history import History, DailyHistory
+from ml4trade.history_sink import HistorySink, HistoryChunks
+from utils import setup_default_simulation_env, run_episode, random_actions
+
+
+def _run(history_level: str, engine: str = 'tick', seed: int = 0):
+    env = setup_default_simulation_env(
+        end_datetime=START_TIME + timedelta(days=10), battery_efficiency=0.9,
+        engine=engine, history_level=history_level,
+    )
+    _, steps = run_episode(env, np.random.default_rng(seed), seed)
+    return env, steps
+
+
+class TestHistoryLevel(unittest.TestCase):
+    def test_history_types(self):
+        self.assertIs(type(_run('full')[0].history), History)
+        self.assertIsInstance(_run('daily')[0].history, DailyHistory)
+        with self.assertRaises(ValueError):
+            setup_default_simulation_env(history_level='ticks')
+
+    def test_rewards_do_not_depend_on_level(self):
+        for engine in ('tick', 'day'):
+            _, full = _run('full', engine)
+            for level in ('daily', 'off'):
+                with self.subTest(engine=engine, level=level):
+                    self.assertEqual(_run(level, engine)[1], full)
+
+    def test_daily_rows_aggregate_full_history(self):
+        full = _run('full')[0].history.to_dataframe()
+        daily_history = _run('daily', 'day')[0].history
+        daily = daily_history.to_dataframe()
+        self.assertGreater(len(daily), 0)
+        self.assertEqual(len(daily_history), len(daily))
+        self.assertEqual(daily_history[0]['datetime'], daily.index[0].to_pydatetime())
+
+        days = full.loc[daily.index[0]:daily.index[-1] + pd.Timedelta(hours=23)]
+        by_day = days.groupby(days.index.floor('D'))
+        self.assertTrue((by_day.size() == 24).all())
+        np.testing.assert_allclose(daily['price'], by_day['price'].mean())
+        np.testing.assert_allclose(daily['energy_produced'], by_day['energy_produced'].sum())
+        np.testing.assert_allclose(daily['energy_consumed'], by_day['energy_consumed'].sum())
+        unscheduled_buys = days['unscheduled_buy_amount'].where(days['unscheduled_buy_success'], 0)
+        np.testing.assert_allclose(daily['unscheduled_buy_amount'], unscheduled_buys.groupby(by_day.ngroup()).sum())
+        np.testing.assert_array_equal(daily['wallet_balance'], by_day['wallet_balance'].last())
+        np.testing.assert_array_equal(daily['rel_battery'], by_day['rel_battery'].last())
+        # full histories write the summary of a day at the following step
+        recorded = by_day['potential_profit'].last().notna().to_numpy()
+        self.assertGreater(recorded.sum(), 0)
+        np.testing.assert_array_equal(daily['potential_profit'][recorded], by_day['potential_profit'].last()[recorded])
+
+    def test_off_keeps_only_last_summary(self):
+        env, _ = _run('off', 'day')
+        self.assertEqual(len(env.history), 0)
+        self.assertEqual(len(env.history.to_dataframe()), 0)
+        self.assertEqual(len(env.history._day_summaries), 1)
+        with self.assertRaises(ValueError):
+            env.render_all()
+
+    def test_daily_sink_save_and_render(self):
+        env, _ = _run('daily', 'day')
+        history = env.history
+        expected = history.to_dataframe().copy()
+        with tempfile.TemporaryDirectory() as tmp:
+            history.save_binary(os.path.join(tmp, 'history'))
+            loaded = History.load(os.path.join(tmp, 'history'))
+            self.assertIsInstance(loaded, DailyHistory)
+            pd.testing.assert_frame_equal(loaded.to_dataframe(), expected)
+
+            env = setup_default_simulation_env(
+                end_datetime=START_TIME + timedelta(days=10), battery_efficiency=0.9,
+                engine='day', history_level='daily',
+            )
+            env.reset(seed=0)
+            env.history.attach_sink(HistorySink(os.path.join(tmp, 'sink')), max_rows_in_memory=2)
+            rng = np.random.default_rng(0)
+            truncated = False
+            while not truncated:
+                truncated = env.step(random_actions(rng))[3]
+            env.history.close_sink()
+            self.assertEqual(len(env.history), 2)
+            written = HistoryChunks(os.path.join(tmp, 'sink')).read()
+            pd.testing.assert_frame_equal(written, expected, check_freq=False)
+
+        plt.show = lambda: ...
+        env.render_all(last_n_days=5)
+        self.assertEqual(len(plt.gcf().axes), 4)
+        plt.close('all')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+from datetime import timedelta
+
+import numpy as np
+
+from ml4trade.domain.constants import START_TIME
+from ml4trade.perf import TRANSACTIONS
+from utils import setup_default_simulation_env, run_episode
+
+
+def _run(engine: str, instrument: bool, warm_reset: bool = False):
+    env = setup_default_simulation_env(
+        end_datetime=START_TIME + timedelta(days=6), battery_efficiency=0.9,
+        engine=engine, instrument=instrument, warm_reset=warm_reset,
+    )
+    rng = np.random.default_rng(0)
+    steps = []
+    for seed in (0, 1):
+        steps.extend(run_episode(env, rng, seed)[1])
+    return env, steps
+
+
+class TestInstrumentation(unittest.TestCase):
+    def test_same_results(self):
+        for engine in ('tick', 'day'):
+            with self.subTest(engine):
+                _, steps = _run(engine, instrument=True)
+                _, expected_steps = _run(engine, instrument=False)
+                for (obs, reward, info), (expected_obs, expected_reward, expected_info) in zip(steps, expected_steps):
+                    self.assertEqual(obs, expected_obs)
+                    self.assertEqual(reward, expected_reward)
+                    self.assertIn('perf', info)
+                    self.assertEqual(expected_info, {})
+
+    def test_disabled_leaves_methods_untouched(self):
+        env = setup_default_simulation_env()
+        for name in ('step', 'reset', '_observation', '_dry_simulation', '_record_ticks'):
+            self.assertNotIn(name, env.__dict__)
+        self.assertNotIn('schedule', env._prosumer.__dict__)
+        self.assertNotIn('tick_update', env.history.__dict__)
+
+    def test_step_info(self):
+        _, steps = _run('tick', instrument=True)
+        info = steps[-1][2]['perf']
+        self.assertEqual(info['step']['calls'], 1)
+        self.assertEqual(info['schedule']['calls'], 1)
+        self.assertEqual(info['produce_consume']['calls'], 24)
+        self.assertEqual(info['history_update']['calls'], 24)
+        self.assertGreater(info['step']['sec'], info['observation']['sec'])
+        self.assertEqual(set(info['transactions']), set(TRANSACTIONS))
+
+    def test_perf_stats(self):
+        for engine in ('tick', 'day'):
+            with self.subTest(engine):
+                env, steps = _run(engine, instrument=True, warm_reset=True)
+                stats = env.perf_stats()
+                self.assertEqual(stats['step']['calls'], len(steps))
+                self.assertEqual(stats['reset']['calls'], 3)
+                for name, phase in stats.items():
+                    if name != 'transactions':
+                        self.assertLessEqual(phase['p50_sec'], phase['p99_sec'])
+                self.assertEqual(
+                    stats['transactions'],
+                    {k: sum(info['perf']['transactions'][k] for _, _, info in steps) for k in TRANSACTIONS},
+                )
+                self.assertGreater(stats['transactions']['scheduled_buy'], 0)
+                self.assertGreater(stats['transactions']['unscheduled_buy'], 0)
+
+    def test_engines_count_same_transactions(self):
+        tick_env, _ = _run('tick', instrument=True)
+        day_env, _ = _run('day', instrument=True)
+        self.assertEqual(tick_env.perf_stats()['transactions'], day_env.perf_stats()['transactions'])
+
+
+if __name__ == '__main__':
+    unittest.main()
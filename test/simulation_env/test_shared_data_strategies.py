@@ -0,0 +1,45 @@
+import unittest
+from datetime import timedelta
+
+import numpy as np
+
+from ml4trade.domain.constants import START_TIME
+from utils import setup_default_simulation_env, setup_default_data_strategies
+
+
+def _setup_env(data_strategies, engine: str):
+    return setup_default_simulation_env(
+        data_strategies, end_datetime=START_TIME + timedelta(days=5), engine=engine,
+    )
+
+
+class TestSharedDataStrategies(unittest.TestCase):
+    def test_envs_sharing_strategies_are_independent(self):
+        for engine in ('tick', 'day'):
+            with self.subTest(engine):
+                data_strategies = setup_default_data_strategies()
+                shared = [_setup_env(data_strategies, engine) for _ in range(2)]
+                separate = [_setup_env(setup_default_data_strategies(), engine) for _ in range(2)]
+                for i, (env, expected_env) in enumerate(zip(shared, separate)):
+                    env.reset(seed=i)
+                    expected_env.reset(seed=i)
+
+                rng = np.random.default_rng(0)
+                truncated = False
+                while not truncated:
+                    # steps of both envs interleave
+                    for env, expected_env in zip(shared, separate):
+                        action = rng.uniform(0, 0.001, 96).astype(np.float32)
+                        obs, reward, _, truncated, _ = env.step(action)
+                        expected_obs, expected_reward, _, _, _ = expected_env.step(action)
+                        np.testing.assert_array_equal(obs, expected_obs)
+                        self.assertEqual(reward, expected_reward)
+
+                for ds in data_strategies.values():
+                    # the deprecated stream of the strategy itself is never used
+                    self.assertIsNone(ds._rng)
+                    self.assertIsNone(ds._stream)
+
+
+if __name__ == '__main__':
+    unittest.main()
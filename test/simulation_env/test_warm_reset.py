@@ -0,0 +1,53 @@
+import unittest
+from datetime import timedelta
+
+import numpy as np
+
+from ml4trade.domain.constants import START_TIME
+from ml4trade.misc import IntervalWrapper
+from utils import setup_default_simulation_env, run_episode
+
+
+def _run_episodes(engine: str, history_level: str, warm_reset: bool):
+    env = IntervalWrapper(
+        setup_default_simulation_env(
+            end_datetime=START_TIME + timedelta(days=14), battery_efficiency=0.9,
+            engine=engine, history_level=history_level, warm_reset=warm_reset,
+        ),
+        timedelta(days=2), randomly_set_battery=True, randomly_shift_obs=True,
+    )
+    rng = np.random.default_rng(0)
+    episodes = []
+    for episode in range(4):
+        results = run_episode(env, rng, seed=0 if episode == 0 else None)
+        df = env.unwrapped.history.to_dataframe()
+        # the frame wraps the columns which the next warm reset rewinds
+        episodes.append((results, df.set_axis(df.index.copy(deep=True)).copy()))
+    return env, episodes
+
+
+class TestWarmReset(unittest.TestCase):
+    def test_same_episodes_as_cold_reset(self):
+        for engine in ('tick', 'day'):
+            for history_level in ('full', 'daily', 'off'):
+                with self.subTest(engine=engine, history_level=history_level):
+                    _, warm = _run_episodes(engine, history_level, warm_reset=True)
+                    _, cold = _run_episodes(engine, history_level, warm_reset=False)
+                    for (results, df), (expected_results, expected_df) in zip(warm, cold):
+                        self.assertEqual(results, expected_results)
+                        self.assertTrue(df.equals(expected_df))
+
+    def test_history_is_reused(self):
+        env = setup_default_simulation_env(warm_reset=True)
+        history = env.history
+        env.reset()
+        self.assertIs(env.history, history)
+
+        env = setup_default_simulation_env()
+        history = env.history
+        env.reset()
+        self.assertIsNot(env.history, history)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from ml4trade import datasets
+from ml4trade.data_strategies import imgw_col_ids
+from ml4trade.datasets import load_dataset, read_weather, read_prices_csv, dataset_key
+from utils import weather_data_path, prices_pl_path
+
+station_code = 349190600
+
+
+class TestDatasets(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_weather_is_hourly_aligned(self):
+        df = read_weather([weather_data_path], station_code)
+        self.assertEqual(list(df.columns), list(imgw_col_ids.keys()))
+        datetimes = pd.to_datetime(df[['year', 'month', 'day', 'hour']])
+        self.assertTrue((datetimes.diff().iloc[1:] == pd.Timedelta(hours=1)).all())
+        self.assertFalse(df.isna().any().any())
+
+    def test_weather_keeps_csv_values(self):
+        raw = pd.read_csv(weather_data_path, header=None, encoding='cp1250',
+                          names=imgw_col_ids.keys(), usecols=imgw_col_ids.values())
+        df = read_weather([weather_data_path], station_code)
+        merged = df.merge(raw, on=['year', 'month', 'day', 'hour'], suffixes=('', '_csv'))
+        self.assertEqual(len(merged), len(raw))
+        for c in ('cloudiness', 'wind_speed'):
+            np.testing.assert_array_equal(merged[c], merged[f'{c}_csv'])
+
+    def _zip_weather_data(self, name: str, start: int, end: int) -> str:
+        with open(weather_data_path, 'rb') as f:
+            lines = f.readlines()[start:end]
+        path = os.path.join(self.cache_dir, name)
+        with zipfile.ZipFile(path, 'w') as archive:
+            archive.writestr(name.replace('.zip', '.csv'), b''.join(lines))
+        return path
+
+    def test_weather_from_zips(self):
+        zips = [self._zip_weather_data('s_t_1.zip', 0, 200), self._zip_weather_data('s_t_2.zip', 200, None)]
+        pd.testing.assert_frame_equal(
+            read_weather(zips, station_code, max_workers=2),
+            read_weather([weather_data_path], station_code),
+        )
+
+    def test_weather_reads_only_new_files(self):
+        zips = [self._zip_weather_data('s_t_1.zip', 0, 200)]
+        read_weather(zips, station_code, self.cache_dir)
+        zips.append(self._zip_weather_data('s_t_2.zip', 200, None))
+        with patch.object(datasets, '_read_station_rows', wraps=datasets._read_station_rows) as read_rows:
+            df = read_weather(zips, station_code, self.cache_dir, max_workers=1)
+            self.assertEqual([c.args[0] for c in read_rows.call_args_list], zips[1:])
+        pd.testing.assert_frame_equal(df, read_weather([weather_data_path], station_code))
+
+    def test_store_is_built_once(self):
+        dataset = load_dataset([weather_data_path], prices_pl_path, self.cache_dir, station_code)
+        with patch.object(datasets, 'read_weather') as read:
+            cached = load_dataset([weather_data_path], prices_pl_path, self.cache_dir, station_code)
+            read.assert_not_called()
+        pd.testing.assert_frame_equal(dataset.weather, cached.weather)
+        pd.testing.assert_frame_equal(dataset.prices, cached.prices)
+        pd.testing.assert_frame_equal(cached.prices, read_prices_csv(prices_pl_path))
+
+    def test_key_changes_with_content(self):
+        prices_path = os.path.join(self.cache_dir, 'prices.csv')
+        shutil.copy(prices_pl_path, prices_path)
+        key = dataset_key([weather_data_path], prices_path, station_code, self.cache_dir)
+        self.assertEqual(key, dataset_key([weather_data_path], prices_path, station_code, self.cache_dir))
+        self.assertNotEqual(key, dataset_key([weather_data_path], prices_path, 1, self.cache_dir))
+
+        with open(prices_path, 'a') as f:
+            f.write('2016-01-22 00:00:00,1.0,0,0,0,0,0\n')
+        self.assertNotEqual(key, dataset_key([weather_data_path], prices_path, station_code, self.cache_dir))
+
+    def test_interrupted_digests_write(self):
+        key = dataset_key([weather_data_path], prices_pl_path, station_code, self.cache_dir)
+        prices_path = os.path.join(self.cache_dir, 'prices.csv')
+        shutil.copy(prices_pl_path, prices_path)
+
+        def interrupted_dump(obj, f):
+            f.write('{"')
+            raise KeyboardInterrupt
+
+        with patch.object(datasets.json, 'dump', interrupted_dump), self.assertRaises(KeyboardInterrupt):
+            dataset_key([weather_data_path], prices_path, station_code, self.cache_dir)
+        self.assertEqual(key, dataset_key([weather_data_path], prices_pl_path, station_code, self.cache_dir))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+from datetime import timedelta
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from ml4trade.domain.constants import START_TIME
+from ml4trade.evaluation import evaluate, run_episode, summarize
+from ml4trade.misc import IntervalWrapper
+from ml4trade.rendering.charts import render_profits_comparison
+from utils import setup_default_simulation_env
+
+
+def _env_factory() -> IntervalWrapper:
+    env = setup_default_simulation_env(end_datetime=START_TIME + timedelta(days=14), battery_efficiency=0.9)
+    return IntervalWrapper(env, timedelta(days=3), split_ratio=0.5)
+
+
+def _policy(obs: np.ndarray) -> np.ndarray:
+    # depends on the observation so that episodes differ
+    action = np.full(96, 0.0005 + 0.0001 * np.tanh(obs[0]), dtype=np.float32)
+    action[48:] = 300 + obs[-1]
+    return action
+
+
+class _Model:
+    def predict(self, obs: np.ndarray):
+        return _policy(obs), None
+
+
+class TestEvaluation(unittest.TestCase):
+    def setUp(self):
+        self.start_ticks = _env_factory().test_start_ticks()
+
+    def test_process_pool_runs_same_episodes(self):
+        seeds = [0, 1]
+        results = evaluate(_env_factory, _policy, seeds, self.start_ticks, max_workers=2)
+        self.assertEqual(len(results), len(seeds) * len(self.start_ticks))
+
+        env = _env_factory()
+        for i, (seed, start_tick) in enumerate((s, t) for s in seeds for t in self.start_ticks):
+            expected = run_episode(env, _Model(), seed, start_tick)
+            result = results[i]
+            self.assertEqual((result.seed, result.start_tick), (seed, start_tick))
+            self.assertEqual(result.total_reward, expected.total_reward)
+            self.assertEqual(result.final_balance, expected.final_balance)
+            self.assertTrue(result.history.equals(expected.history))
+            self.assertListEqual(list(result.history.columns), ['wallet_balance', 'potential_profit'])
+
+    def test_test_windows(self):
+        results = evaluate(_env_factory, _policy, start_ticks=self.start_ticks, max_workers=1)
+        env = _env_factory()
+        for start_tick, result in zip(self.start_ticks, results):
+            self.assertGreaterEqual(start_tick, env.test_data_start_tick)
+            self.assertEqual(result.start_datetime, env._ep_interval_from_start_tick(start_tick)[0])
+            self.assertEqual(result.n_steps, 3)
+
+    def test_results_feed_rendering(self):
+        plt.show = lambda: ...
+        results = evaluate(_env_factory, _policy, seeds=[0, 1], start_ticks=self.start_ticks[:1], max_workers=1)
+        render_profits_comparison(([r.history for r in results], {'label': 'policy'}))
+        summary = summarize(results)
+        self.assertEqual(len(summary), 2)
+        self.assertNotIn('history', summary)
+
+
+if __name__ == '__main__':
+    unittest.main()
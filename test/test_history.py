@@ -1,7 +1,13 @@
+import os
+import tempfile
 import unittest
+from unittest.mock import patch
 
-from ml4trade.history import History
-from utils import setup_default_simulation_env
+import numpy as np
+import pandas as pd
+
+from ml4trade.history import History, convert_json_history
+from utils import setup_default_simulation_env, rendering_data_paths
 
 
 class TestHistory(unittest.TestCase):
@@ -31,9 +37,9 @@ class TestHistory(unittest.TestCase):
         self.assertEqual(history[0]['rel_battery'], self.env._prosumer.battery.rel_current_charge)
         self.assertEqual(history[0]['unscheduled_buy_amount'], self.env._prosumer.last_unscheduled_buy_transaction or (0, False))
         self.assertEqual(history[0]['unscheduled_sell_amount'], self.env._prosumer.last_unscheduled_sell_transaction or (0, False))
-        self.assertEqual(history[0]['price'], self.env._market.ds.last_processed)
-        self.assertEqual(history[0]['energy_produced'], self.env._production_system.ds.last_processed or 0)
-        self.assertEqual(history[0]['energy_consumed'], self.env._consumption_system.ds.last_processed or 0)
+        self.assertEqual(history[0]['price'], self.env._market.get_buy_price().value)
+        self.assertEqual(history[0]['energy_produced'], self.env._production_system.last_processed or 0)
+        self.assertEqual(history[0]['energy_consumed'], self.env._consumption_system.last_processed or 0)
 
     def test_tick_update_existing_row(self):
         history = History(self.env._clock.view())
@@ -75,12 +81,12 @@ class TestHistory(unittest.TestCase):
         history = History(self.env._clock.view())
 
         def update():
-            row = {
-                'price': 100,
-                'energy_produced': 10,
-                'energy_consumed': 2,
-            }
-            history._history.append(row)
+            history.ticks_update(
+                [self.env._clock.cur_tick], [self.env._clock.cur_datetime],
+                prices=[100], wallet_balances=[0], rel_batteries=[0],
+                energy_produced=[10], energy_consumed=[2],
+                unscheduled_buys=[0], unscheduled_sells=[0],
+            )
 
         for _ in range(72 - 11 - 1):
             update()
@@ -89,12 +95,76 @@ class TestHistory(unittest.TestCase):
         update()
         history.step_update(self.env.action_space.sample())
         self.assertEqual(history._last_day_summary(), (0, 0))
-        update()
+        history._add_empty_rows(1)
 
         self.assertNotEqual(history._last_day_summary(), 0)
         potential_profit = history.last_day_potential_profit()
         self.assertEqual(potential_profit, 100 * (10 - 2) * 24)  # 19200
 
+    def test_to_dataframe_shares_columns(self):
+        self.env.step(self.env.action_space.sample())
+        history = self.env.history
+        df = history.to_dataframe()
+        self.assertEqual(len(df), len(history))
+        self.assertTrue(np.shares_memory(df['price'].to_numpy(), history._columns['price']))
+        self.assertTrue(np.shares_memory(df.index.values, history._datetime))
+        self.assertIn('unscheduled_buy_success', df)
+        idx = history._cur_tick_to_idx() - 1
+        self.assertEqual(df['wallet_balance'].iloc[idx], history[idx]['wallet_balance'])
+
+    def test_preallocated_from_episode_length(self):
+        capacity = len(self.history._datetime)
+        while not self.env.step(self.env.action_space.sample())[3]:
+            pass
+        self.assertEqual(len(self.env.history._datetime), capacity)
+        self.assertLessEqual(len(self.env.history), capacity)
+
+    def test_grows_without_capacity(self):
+        history = History(self.env._clock.view())
+        for _ in range(3):
+            history.step_update(self.env.action_space.sample())
+        self.assertEqual(len(history), 24 - 10 + 3 * 24)
+        self.assertEqual(len(history.to_dataframe()), len(history))
+
+    def test_daily_summary_accumulated_while_recording(self):
+        with patch.object(History, '_summarize_rows', wraps=self.history._summarize_rows) as summarize_rows:
+            while not self.env.step(self.env.action_space.sample())[3]:
+                pass
+        summarize_rows.assert_not_called()
+
+        history = self.env.history
+        self.assertGreater(len(history._day_summaries), 0)
+        for end_idx, summary in history._day_summaries.items():
+            self.assertEqual(summary, history._summarize_rows(end_idx - 23, end_idx + 1))
+
+    def test_rewritten_row_is_not_accumulated_twice(self):
+        history = History(self.env._clock.view())
+        history._accumulate(0, 0, 100, 1)
+        history._accumulate(0, 0, 100, 1)
+        self.assertEqual(history._acc_price_sum, 100)
+        self.assertEqual(history._acc_hours, 1)
+
+    def test_save_binary_load_roundtrip(self):
+        for _ in range(3):
+            self.env.step(self.env.action_space.sample())
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'env_history')
+            self.history.save_binary(path)
+            loaded = History.load(path)
+            self.assertIsInstance(loaded._columns['price'], np.memmap)
+            self.assertEqual(len(loaded), len(self.history))
+            self.assertEqual(loaded._battery_cap, self.history._battery_cap)
+            pd.testing.assert_frame_equal(loaded.to_dataframe(), self.history.to_dataframe())
+
+    def test_convert_json_history(self):
+        json_path = rendering_data_paths[0]
+        from_json = History.load(json_path)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = convert_json_history(json_path, os.path.join(tmp_dir, 'env_history'))
+            pd.testing.assert_frame_equal(History.load(path).to_dataframe(), from_json.to_dataframe())
+        self.assertEqual(from_json[0]['unscheduled_buy_amount'], (0.006470623145897268, True))
+        self.assertIsInstance(from_json[0]['rel_battery'], float)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,99 @@
+import tempfile
+import unittest
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from ml4trade.domain.constants import START_TIME
+from ml4trade.history_sink import HistorySink, HistoryChunks
+from utils import setup_default_simulation_env, random_actions
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+class TestHistorySink(unittest.TestCase):
+    def _run_episode(self, sink: HistorySink = None, max_rows_in_memory: int = None):
+        env = setup_default_simulation_env(end_datetime=START_TIME + timedelta(days=10))
+        env.reset(seed=0)
+        if sink is not None:
+            env.history.attach_sink(sink, max_rows_in_memory)
+        rng = np.random.default_rng(0)
+        rewards, max_len = [], 0
+        truncated = False
+        while not truncated:
+            _, reward, _, truncated, _ = env.step(rng.uniform(0, 1, 96).astype(np.float32))
+            rewards.append(reward)
+            max_len = max(max_len, len(env.history))
+        return env, rewards, max_len
+
+    def _assert_streams_episode(self, fmt: str):
+        expected_env, expected_rewards, _ = self._run_episode()
+        expected = expected_env.history.to_dataframe()
+        with tempfile.TemporaryDirectory() as path:
+            env, rewards, max_len = self._run_episode(HistorySink(path, fmt, chunk_rows=48), max_rows_in_memory=72)
+            env.history.close_sink()
+
+            self.assertListEqual(rewards, expected_rewards)
+            self.assertLessEqual(max_len, 72 + 48)
+            chunks = HistoryChunks(path)
+            self.assertGreater(len(chunks), 1)
+            streamed = chunks.read()
+            pd.testing.assert_frame_equal(streamed, expected[streamed.columns])
+            prices = chunks.read(columns=['price'])
+            self.assertListEqual(list(prices.columns), ['price'])
+
+    def test_streams_npz_chunks(self):
+        self._assert_streams_episode('npz')
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_streams_parquet_chunks(self):
+        self._assert_streams_episode('parquet')
+
+    def test_rows_stay_in_memory_without_cap(self):
+        with tempfile.TemporaryDirectory() as path:
+            env, _, _ = self._run_episode(HistorySink(path))
+            n_rows = len(env.history)
+            env.history.close_sink()
+            self.assertEqual(len(HistoryChunks(path).read()), n_rows)
+
+    def test_clear_closes_sink(self):
+        with tempfile.TemporaryDirectory() as path:
+            sink = HistorySink(path, chunk_rows=24)
+            env, _, _ = self._run_episode(sink)
+            n_rows = len(env.history)
+            env.history.clear()
+            self.assertFalse(sink._thread.is_alive())
+            self.assertEqual(len(HistoryChunks(path).read()), n_rows)
+
+    def test_reset_closes_sink(self):
+        for warm_reset in (False, True):
+            with self.subTest(warm_reset=warm_reset), tempfile.TemporaryDirectory() as path:
+                env = setup_default_simulation_env(end_datetime=START_TIME + timedelta(days=5), warm_reset=warm_reset)
+                env.reset(seed=0)
+                sink = HistorySink(path, chunk_rows=24)
+                env.history.attach_sink(sink)
+                rng = np.random.default_rng(0)
+                truncated = False
+                while not truncated:
+                    truncated = env.step(random_actions(rng))[3]
+                n_rows = len(env.history)
+                env.reset()
+                self.assertFalse(sink._thread.is_alive())
+                self.assertEqual(len(HistoryChunks(path).read()), n_rows)
+
+    def test_writer_error_is_raised(self):
+        with tempfile.TemporaryDirectory() as path:
+            sink = HistorySink(path, chunk_rows=1)
+            sink.write({'datetime': np.array(['2022-01-01'], dtype='datetime64[ns]'), 'price': np.array([1.0])})
+            sink.path = '/nonexistent/dir'
+            sink.write({'datetime': np.array(['2022-01-01'], dtype='datetime64[ns]'), 'price': np.array([1.0])})
+            with self.assertRaises(RuntimeError):
+                sink.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
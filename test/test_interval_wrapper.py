@@ -30,12 +30,20 @@ class TestIntervalWrapper(unittest.TestCase):
         self.assertEqual(self.env_wrapper.train_mode, True)
         self.assertEqual(self.env_wrapper.test_data_start_tick, self.data_start_tick)
 
-    def test_interval_ticks_generator(self):
-        ticks = [next(self.env_wrapper._ep_interval_ticks_generator) for _ in range(100)]
+    def test_next_start_tick(self):
+        ticks = [self.env_wrapper._next_start_tick() for _ in range(100)]
         # check if ticks are within allowed range
         self.assertTrue(all([self.env_wrapper.start_tick <= t <= self.env_wrapper.test_data_start_tick
                              for t in ticks]))
 
+    def test_start_ticks_of_a_cycle(self):
+        self.env_wrapper.reset(seed=0)
+        n = len(self.env_wrapper.interval_start_ticks)
+        ticks = [self.env._start_tick] + [self.env_wrapper._next_start_tick() for _ in range(n - 1)]
+        # each start tick is used once in a cycle
+        self.assertEqual(ticks, self.env_wrapper.interval_start_ticks)
+        self.assertEqual(sorted(ticks), list(range(self.env_wrapper.start_tick, self.data_start_tick - 23, 24)))
+
     def test_ep_interval_from_start_tick(self):
         tick = 42
         start, end = self.env_wrapper._ep_interval_from_start_tick(tick)
@@ -0,0 +1,74 @@
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from ml4trade.misc import AvgIntervalPriceRetriever
+from ml4trade.rolling_features import RollingFeatures
+from utils import prices_pl_path
+
+
+class TestRollingFeatures(unittest.TestCase):
+    def setUp(self):
+        self.values = np.random.default_rng(0).normal(300, 50, 2000)
+        self.features = RollingFeatures(self.values)
+
+    def test_window_statistics(self):
+        for end, window in ((1, 1), (24, 24), (500, 24), (2000, 720)):
+            values = self.values[end - window:end]
+            with self.subTest(end=end, window=window):
+                self.assertAlmostEqual(self.features.sum(end, window), values.sum(), 6)
+                self.assertAlmostEqual(self.features.mean(end, window), values.mean(), 9)
+                self.assertAlmostEqual(self.features.std(end, window), values.std(), 9)
+                self.assertEqual(self.features.min(end, window), values.min())
+                self.assertEqual(self.features.max(end, window), values.max())
+
+    def test_out_of_range_windows(self):
+        features = RollingFeatures(np.arange(100.))
+        for end, window in ((10, 11), (3, 10), (101, 10), (100, 0), (0, 0), (-1, 1)):
+            for method in (features.sum, features.mean, features.std, features.min, features.max):
+                with self.subTest(method=method.__name__, end=end, window=window):
+                    with self.assertRaises(ValueError):
+                        method(end, window)
+        self.assertEqual(features.mean(100, 100), 49.5)
+        for end, periods in ((24, 2), (101, 1), (48, 0)):
+            with self.subTest(end=end, periods=periods):
+                with self.assertRaises(ValueError):
+                    features.period_mean(end, periods)
+
+    def test_period_mean(self):
+        for end, periods in ((24, 1), (500, 7), (2000, 30)):
+            expected = np.mean([self.values[end - k * 24] for k in range(1, periods + 1)])
+            self.assertAlmostEqual(self.features.period_mean(end, periods), expected, 9)
+
+    def test_rolling_min_max(self):
+        for window in (1, 5, 24, 200):
+            windows = sliding_window_view(self.values, window)
+            np.testing.assert_array_equal(self.features.rolling_min(window), windows.min(axis=1))
+            np.testing.assert_array_equal(self.features.rolling_max(window), windows.max(axis=1))
+
+    def test_avg_interval_price_retriever(self):
+        prices_df = pd.read_csv(prices_pl_path, header=0)
+        prices_df['index'] = pd.to_datetime(prices_df['index'])
+        retriever = AvgIntervalPriceRetriever(prices_df, interval_days=7)
+        day_prices = prices_df.groupby(prices_df['index'].dt.date)['Fixing I Price [PLN/MWh]'].mean().to_numpy()
+        for day in (3, 8, 15, 20):
+            expected = day_prices[:7].mean() if day <= 7 else day_prices[day - 7:day].mean()
+            self.assertAlmostEqual(
+                retriever.get_prev_interval_avg_price(datetime(2016, 1, 1) + timedelta(days=day, hours=5)),
+                expected, 9,
+            )
+
+    def test_avg_interval_price_retriever_past_data(self):
+        prices_df = pd.read_csv(prices_pl_path, header=0)
+        prices_df['index'] = pd.to_datetime(prices_df['index'])
+        retriever = AvgIntervalPriceRetriever(prices_df, interval_days=5)
+        for day, expected in ((12, 186.66950000000003), (24, 203.37625000000003)):
+            price = retriever.get_prev_interval_avg_price(datetime(2016, 1, 1) + timedelta(days=day))
+            self.assertEqual(price, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
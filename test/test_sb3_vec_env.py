@@ -0,0 +1,97 @@
+import importlib.util
+import unittest
+from datetime import timedelta
+
+import numpy as np
+
+from ml4trade.domain.constants import START_TIME, SCHEDULING_TIME, ACTION_REPLACEMENT_TIME
+from ml4trade.domain.units import Currency, MWh
+from ml4trade.vector_env import VectorSimulationEnv
+from utils import setup_default_data_strategies, random_actions
+
+_has_sb3 = importlib.util.find_spec('stable_baselines3') is not None
+
+
+def _vec_env(n_envs: int = 3) -> VectorSimulationEnv:
+    return VectorSimulationEnv(
+        n_envs, setup_default_data_strategies(),
+        start_datetime=START_TIME,
+        end_datetime=START_TIME + timedelta(days=4),
+        scheduling_time=SCHEDULING_TIME,
+        action_replacement_time=ACTION_REPLACEMENT_TIME,
+        prosumer_init_balance=Currency(0),
+        battery_capacity=MWh(0.1),
+        battery_init_charge=MWh(0.05),
+        battery_efficiency=0.9,
+    )
+
+
+@unittest.skipIf(not _has_sb3, 'stable_baselines3 is not installed')
+class TestSB3VecEnvAdapter(unittest.TestCase):
+    def setUp(self) -> None:
+        from ml4trade.misc.sb3_vec_env import SB3VecEnvAdapter
+        self.vec_env = _vec_env()
+        self.env = SB3VecEnvAdapter(self.vec_env)
+
+    def test_step_wait(self):
+        obs = self.env.reset()
+        rng = np.random.default_rng(0)
+        dones = np.zeros(3, dtype=bool)
+        while not dones.any():
+            last_obs = obs
+            obs, rewards, dones, infos = self.env.step(random_actions(rng, 3))
+            self.assertEqual(rewards.dtype, np.float32)
+        self.assertTrue(dones.all())
+        for i, info in enumerate(infos):
+            self.assertTrue(info['TimeLimit.truncated'])
+            self.assertEqual(info['terminal_observation'].shape, last_obs[i].shape)
+            self.assertFalse(np.array_equal(info['terminal_observation'], obs[i]))
+
+    def test_seed(self):
+        self.env.seed(42)
+        obs = self.env.reset()
+        np.testing.assert_array_equal(obs, _vec_env().reset(seed=42)[0])
+        self.env.seed(42)
+        np.testing.assert_array_equal(self.env.reset(), obs)
+
+    def test_reset_options(self):
+        self.env.set_options({'a': 1})
+        self.env.reset()
+        self.assertEqual(self.env._options, [{}, {}, {}])
+        self.env.set_options({'battery_charge_to_set': MWh(0.02)})
+        np.testing.assert_array_almost_equal(self.env.reset()[:, -2], [0.2] * 3)
+        self.env.set_options([{'a': 1}, {}, {}])
+        with self.assertRaises(ValueError):
+            self.env.reset()
+
+    def test_get_attr(self):
+        self.env.reset()
+        self.env.step(random_actions(np.random.default_rng(0), 3))
+        balances = self.vec_env.get_wallet_balance()
+        self.assertEqual(self.env.get_attr('_balance', indices=[2, 0]), [balances[2], balances[0]])
+        self.assertEqual(self.env.get_attr('_battery_capacity', indices=1), [self.vec_env._battery_capacity])
+        self.assertEqual(self.env.get_attr('observation_space'), [self.vec_env.single_observation_space] * 3)
+
+    def test_set_attr(self):
+        self.env.set_attr('_charge', 0.01, indices=[1])
+        np.testing.assert_array_equal(self.vec_env._charge, [0.05, 0.01, 0.05])
+        self.env.set_attr('_battery_efficiency', 0.5)
+        self.assertEqual(self.vec_env._battery_efficiency, 0.5)
+        with self.assertRaises(ValueError):
+            self.env.set_attr('_battery_efficiency', 0.8, indices=[0])
+
+    def test_env_method(self):
+        self.env.reset()
+        self.env.step(random_actions(np.random.default_rng(0), 3))
+        balances = self.env.env_method('get_wallet_balance')
+        np.testing.assert_array_equal(balances, self.vec_env.get_wallet_balance())
+
+        (obs, info), = self.env.env_method('reset', indices=None, seed=42)[:1]
+        np.testing.assert_array_equal(obs, _vec_env().reset(seed=42)[0][0])
+        self.assertEqual(info, {})
+        with self.assertRaises(ValueError):
+            self.env.env_method('reset', indices=[0, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
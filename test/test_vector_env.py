@@ -0,0 +1,87 @@
+import unittest
+from datetime import timedelta
+
+import numpy as np
+
+from ml4trade.domain.constants import START_TIME, SCHEDULING_TIME, ACTION_REPLACEMENT_TIME
+from ml4trade.domain.units import Currency, MWh
+from ml4trade.vector_env import VectorSimulationEnv, spawn_seeds
+from utils import setup_default_simulation_env, setup_default_data_strategies, random_actions
+
+
+def _env_kwargs(**kwargs) -> dict:
+    return {
+        'start_datetime': START_TIME,
+        'end_datetime': START_TIME + timedelta(days=10),
+        'scheduling_time': SCHEDULING_TIME,
+        'action_replacement_time': ACTION_REPLACEMENT_TIME,
+        'prosumer_init_balance': Currency(0),
+        'battery_capacity': MWh(0.1),
+        'battery_init_charge': MWh(0.05),
+        'battery_efficiency': 0.9,
+        **kwargs,
+    }
+
+
+class TestVectorSimulationEnv(unittest.TestCase):
+    def _assert_matches_separate_envs(self, n_envs: int, n_steps: int, options: dict = None, **kwargs):
+        env_kwargs = _env_kwargs(**kwargs)
+        vec_env = VectorSimulationEnv(n_envs, setup_default_data_strategies(), **env_kwargs)
+        envs = [setup_default_simulation_env(**env_kwargs) for _ in range(n_envs)]
+
+        vec_obs, _ = vec_env.reset(seed=42, options=options)
+        obs = [env.reset(seed=seed, options=options)[0] for env, seed in zip(envs, spawn_seeds(42, n_envs))]
+        np.testing.assert_array_equal(vec_obs, np.array(obs, dtype=np.float32))
+
+        rng = np.random.default_rng(0)
+        for _ in range(n_steps):
+            actions = random_actions(rng, n_envs)
+            vec_obs, vec_rewards, _, vec_truncateds, vec_infos = vec_env.step(actions)
+            results = [env.step(action) for env, action in zip(envs, actions)]
+            obs = np.array([r[0] for r in results], dtype=np.float32)
+            np.testing.assert_array_equal(vec_rewards, [r[1] for r in results])
+            np.testing.assert_array_equal(vec_truncateds, [r[3] for r in results])
+            if vec_truncateds[0]:
+                np.testing.assert_array_equal(np.stack(vec_infos['final_observation']), obs)
+                obs = np.array([env.reset()[0] for env in envs], dtype=np.float32)
+            np.testing.assert_array_equal(vec_obs, obs)
+
+    def test_matches_separate_envs(self):
+        self._assert_matches_separate_envs(n_envs=4, n_steps=20)
+
+    def test_matches_separate_envs_starting_at_scheduling_hour(self):
+        self._assert_matches_separate_envs(
+            n_envs=2, n_steps=5,
+            start_datetime=START_TIME + timedelta(days=1), start_tick=24,
+        )
+
+    def test_matches_separate_envs_with_reset_options(self):
+        self._assert_matches_separate_envs(
+            n_envs=2, n_steps=20,
+            options={'tick_offset': 7, 'battery_charge_to_set': MWh(0.02)},
+        )
+
+    def test_observation_shape(self):
+        vec_env = VectorSimulationEnv(3, setup_default_data_strategies(), **_env_kwargs())
+        obs, _ = vec_env.reset(seed=0)
+        self.assertEqual(obs.shape, (3, vec_env.single_observation_space.shape[0]))
+        self.assertEqual(obs.dtype, np.float32)
+
+    def test_spawn_seeds(self):
+        self.assertListEqual(spawn_seeds(42, 4), spawn_seeds(42, 4))
+        self.assertEqual(len(set(spawn_seeds(42, 4))), 4)
+
+    def test_autoreset(self):
+        vec_env = VectorSimulationEnv(2, setup_default_data_strategies(), **_env_kwargs())
+        init_obs, _ = vec_env.reset(seed=0)
+        truncated = False
+        while not truncated:
+            obs, _, _, truncateds, infos = vec_env.step(vec_env.action_space.sample())
+            truncated = truncateds[0]
+        self.assertTrue(infos['_final_observation'].all())
+        self.assertEqual(vec_env._clock.cur_datetime, vec_env._start_datetime + timedelta(hours=14))
+        np.testing.assert_array_equal(obs[:, :-2], init_obs[:, :-2])
+
+
+if __name__ == '__main__':
+    unittest.main()
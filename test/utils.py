@@ -1,9 +1,11 @@
 import os
 from operator import itemgetter
-from typing import Dict
+from typing import Dict, List, Tuple
 
+import numpy as np
 import pandas as pd
 
+from benchmarks.common import random_actions
 from ml4trade.data_strategies import DataStrategy, PricesPlDataStrategy, ImgwSolarDataStrategy, \
     HouseholdEnergyConsumptionDataStrategy
 from ml4trade.domain.battery import Battery
@@ -16,6 +18,7 @@ from ml4trade.domain.units import MW
 from ml4trade.simulation_env import SimulationEnv
 
 prices_pl_path = os.path.join(os.path.dirname(__file__), 'mock_data/prices_pl.csv')
+weather_data_path = os.path.join(os.path.dirname(__file__), 'mock_data/s_t_02-03_2022.csv')
 _rendering_data_dir = os.path.join(os.path.dirname(__file__), 'mock_data/rendering_data')
 rendering_data_paths = [
     os.path.join(_rendering_data_dir, f'run_1/env_history.json'),
@@ -44,12 +47,13 @@ def setup_default_consumption_system(clock: SimulationClock = None, household_nu
         -> ConsumptionSystem:
     if clock is None:
         clock = setup_default_clock()
-    return ConsumptionSystem(HouseholdEnergyConsumptionDataStrategy(household_number, window_size), clock.view())
+    consumption_system = ConsumptionSystem(HouseholdEnergyConsumptionDataStrategy(household_number, window_size),
+                                           clock.view())
+    consumption_system.stream = consumption_system.ds.random_stream(np.random.default_rng())
+    return consumption_system
 
 
 def setup_default_data_strategies() -> Dict[str, DataStrategy]:
-    weather_data_path = os.path.join(os.path.dirname(__file__), 'mock_data/s_t_02-03_2022.csv')
-
     weather_df = pd.read_csv(weather_data_path, header=None, encoding='cp1250')
     prices_df = pd.read_csv(prices_pl_path, header=0)
 
@@ -84,6 +88,7 @@ def setup_default_simulation_env(
         battery_init_charge=MWh(0),
         battery_efficiency=1.0,
         start_tick=None,
+        **kwargs,
 ) -> SimulationEnv:
     if data_strategies is None:
         data_strategies = setup_default_data_strategies()
@@ -98,4 +103,16 @@ def setup_default_simulation_env(
         battery_init_charge=battery_init_charge,
         battery_efficiency=battery_efficiency,
         start_tick=start_tick,
+        **kwargs,
     )
+
+
+def run_episode(env, rng: np.random.Generator, seed: int = None) -> Tuple[list, List[Tuple[list, float, dict]]]:
+    # the reset observation and (observation, reward, info) of every step of an episode of random actions
+    obs, _ = env.reset(seed=seed)
+    steps = []
+    truncated = False
+    while not truncated:
+        step_obs, reward, _, truncated, info = env.step(random_actions(rng))
+        steps.append((step_obs.tolist(), reward, info))
+    return obs.tolist(), steps